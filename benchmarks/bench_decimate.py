@@ -0,0 +1,107 @@
+"""
+Benchmark of the Ramer-Douglas-Peucker decimation in psp.plotting.decimate.
+
+The first table times rdp alone. The second table compares a plot drawn with
+add_plot or add_trajectory without and with the tolerance: the number of
+vertices, the time to add the trajectory including the decimation and the
+time to save a PNG with the Agg backend, once with the creation of the
+artists and once more drawing only.
+
+Run from the root of the repository:
+
+    python -m benchmarks.bench_decimate
+"""
+import timeit
+import numpy as np
+from psp.plotting.decimate import rdp
+
+SIZES = (10_000, 100_000, 1_000_000)  # Number of samples of the trajectories
+TOLERANCE = 1e-3
+REPEAT = 3  # Number of renders, the fastest is reported
+ARROWS = 10  # Arrows of add_trajectory, one per sample is the default
+
+
+def trajectory(n: int, gaps: bool = False) -> np.ndarray:
+    """Function to create a spiralling impedance trajectory with noise"""
+    rng = np.random.default_rng(0)
+    t = np.linspace(0, 1, n)
+    Z = (10 - 8 * t) * np.exp(2j * np.pi * 5 * t) + 1e-4 * rng.standard_normal(n)
+    if gaps:
+        # A gap of 1 % of the samples every 10 % of the samples
+        for start in range(0, n, n // 10):
+            Z[start : start + n // 100] = np.nan
+    return Z
+
+
+def main():
+    print(f"{'samples':>10} {'gaps':>5} {'kept':>8} {'time [ms]':>10}")
+    for n in SIZES:
+        for gaps in (False, True):
+            Z = trajectory(n, gaps)
+            idx = rdp(Z.real, Z.imag, TOLERANCE)
+            repeat = timeit.repeat(
+                lambda: rdp(Z.real, Z.imag, TOLERANCE), number=1, repeat=5
+            )
+            print(f"{n:>10} {str(gaps):>5} {len(idx):>8} {min(repeat) * 1e3:>10.1f}")
+
+    print()
+    print(
+        f"{'method':>14} {'samples':>10} {'tolerance':>9} {'vertices':>9} "
+        f"{'add [ms]':>9} {'save [ms]':>9} {'redraw [ms]':>11}"
+    )
+    for method in ("add_plot", "add_trajectory"):
+        for n in SIZES:
+            Z = trajectory(n)
+            for tolerance in (None, TOLERANCE):
+                vertices, times = render(method, Z, tolerance)
+                print(
+                    f"{method:>14} {n:>10} {str(tolerance):>9} {vertices:>9} "
+                    f"{times[0] * 1e3:>9.1f} {times[1] * 1e3:>9.1f} "
+                    f"{times[2] * 1e3:>11.1f}"
+                )
+
+
+def render(method: str, Z: np.ndarray, tolerance: float) -> tuple[int, np.ndarray]:
+    """
+    Function to draw a trajectory on an RXplot and save it as PNG twice.
+
+    Returns
+    -------
+    tuple
+        The number of vertices drawn and the fastest times of adding the
+        trajectory (including the decimation), of the first save (creating
+        the artists and drawing) and of the second save (drawing only, e.g.
+        when an interactive plot is panned).
+
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from psp.plotting import RXplot
+
+    times = []
+    for _ in range(REPEAT):
+        plot = RXplot("Benchmark", headless=True)
+        start = timeit.default_timer()
+        if method == "add_plot":
+            plot.add_plot(Z.real, Z.imag, tolerance=tolerance)
+        else:
+            plot.add_trajectory(Z, n=ARROWS, tolerance=tolerance)
+        added = timeit.default_timer()
+        plot.to_bytes(format="png")
+        saved = timeit.default_timer()
+        plot.to_bytes(format="png")
+        times.append((added - start, saved - added, timeit.default_timer() - saved))
+
+        vertices = sum(
+            len(path.vertices)
+            for collection in plot._ax.collections
+            for path in collection.get_paths()
+        )
+        vertices += sum(len(line.get_xydata()) for line in plot._ax.lines)
+        plot.close()
+    return vertices, np.min(times, axis=0)
+
+
+if __name__ == "__main__":
+    main()
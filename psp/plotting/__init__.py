@@ -1,7 +1,35 @@
-from .derived_plot import RXplot, PhasorPlot, PolarPlot, TimeSeriesPlot
-from .complex_plot import ComplexPlot
-from .binary import BinaryPlot
+from importlib import import_module
+from typing import TYPE_CHECKING
 
 __version__ = "0.1.0"
 
-__all__ = ["RXplot", "PhasorPlot", "PolarPlot", "ComplexPlot", "TimeSeriesPlot","BinaryPlot"]
+__all__ = ["RXplot", "PhasorPlot", "PolarPlot", "ComplexPlot", "TimeSeriesPlot","BinaryPlot", "PQPlot"]
+
+# The plot classes are imported when first accessed, so importing the package
+# (e.g. for psp.plotting.binary.count_binary) does not load matplotlib.
+_lazy_attributes = {
+    "RXplot": ".derived_plot",
+    "PhasorPlot": ".derived_plot",
+    "PolarPlot": ".derived_plot",
+    "TimeSeriesPlot": ".derived_plot",
+    "PQPlot": ".derived_plot",
+    "ComplexPlot": ".complex_plot",
+    "BinaryPlot": ".binary",
+}
+
+if TYPE_CHECKING:
+    from .derived_plot import RXplot, PhasorPlot, PolarPlot, TimeSeriesPlot, PQPlot
+    from .complex_plot import ComplexPlot
+    from .binary import BinaryPlot
+
+
+def __getattr__(name):
+    if name in _lazy_attributes:
+        value = getattr(import_module(_lazy_attributes[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted([*globals(), *_lazy_attributes])
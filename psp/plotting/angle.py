@@ -1,10 +1,14 @@
 #!/usr/bin/python
-import matplotlib.pyplot as plt
+from __future__ import annotations
 import numpy as np
 from math import atan2
+from typing import TYPE_CHECKING
 
 from dataclasses import dataclass
 
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+
 ARROW_LENGTH = 0.025
 
 # Default properties
@@ -0,0 +1,256 @@
+from __future__ import annotations
+import copy
+import os
+import shutil
+from io import BytesIO
+from typing import Iterable, TYPE_CHECKING
+import numpy as np
+
+if TYPE_CHECKING:
+    from psp.plotting.complex_plot import ComplexPlot
+
+ANIMATION_FPS = 25  # Default frame rate of an animation
+ANIMATION_MAX_FRAMES = 1000  # Default maximum number of frames
+TASKS_PER_WORKER = 4  # Chunks of frames per worker process for load balancing
+
+
+def save_trajectory_animation(
+    plot: ComplexPlot,
+    path: str,
+    Z: Iterable[complex],
+    frames: int = None,
+    fps: float = ANIMATION_FPS,
+    workers: int = None,
+    marker: str = "o",
+    **kwargs,
+) -> list:
+    """
+    Function to save an animation of a trajectory growing over the static
+    content of a plot.
+
+    The static content is drawn once into a background image. Each frame
+    only draws the new segment of the trajectory on top of the previous frame
+    and the marker of the current point. The frames are split into chunks of
+    consecutive frames rendered in parallel processes.
+
+    The static content is drawn on a copy of the plot with limits including
+    the trajectory, so the plot itself is not changed.
+
+    Parameters
+    ----------
+    plot : ComplexPlot
+        Plot with the static content e.g. zones, limits and angles.
+    path : str
+        Output file. '.gif' writes an animated GIF with Pillow, '.mp4' an
+        MP4 video with ffmpeg, which must be installed, and other extensions
+        e.g. '.png' an image sequence. The path of an image sequence can have
+        a format field for the frame number e.g. 'frames/{:04d}.png',
+        otherwise '_{:04d}' is added to the name.
+    Z : Iterable[complex]
+        The samples of the trajectory.
+    frames : int, optional
+        Number of frames. The default is None resulting in one frame per
+        sample and at most 1000 frames.
+    fps : float, optional
+        Frames per second of the GIF or MP4. The default is 25.
+    workers : int, optional
+        Number of processes. The default is None resulting in the number of
+        CPUs. 1 renders in the calling process.
+    marker : str, optional
+        Marker of the current point. The default is "o".
+    **kwargs : N/A
+        Additional arguments for the Line2D of the trajectory e.g. color.
+
+    Returns
+    -------
+    list
+        The written files.
+
+    """
+    Z = np.asarray(Z, dtype=complex).ravel()
+    if len(Z) == 0:
+        raise ValueError("The trajectory has no samples")
+    if frames is None:
+        frames = min(len(Z), ANIMATION_MAX_FRAMES)
+    ends = np.unique(np.linspace(1, len(Z), frames).round().astype(int))
+
+    # The limits of the copy include the entire trajectory
+    static = copy.deepcopy(plot)
+    static._owns_fig = True  # The copied figure is only used by the copy
+    static.extent.update(Z.real, Z.imag)
+    try:
+        background, geometry = _static_layer(static)
+    finally:
+        static.close()
+
+    path = os.fspath(path)
+    name, suffix = os.path.splitext(path)
+    if suffix.lower() in (".gif", ".mp4"):
+        output = suffix.lower()
+    else:
+        output = path if "{" in path else f"{name}_{{:04d}}{suffix}"
+    if output == ".mp4" and shutil.which("ffmpeg") is None:
+        raise RuntimeError("ffmpeg is needed to write MP4 files")
+
+    kwargs.setdefault("color", "C0")
+    # A single palette for all frames of a GIF is fast to apply and does not
+    # flicker
+    palette = _palette(background, kwargs["color"]) if output == ".gif" else None
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunks = np.array_split(ends, min(workers * TASKS_PER_WORKER, len(ends)))
+    starts = np.cumsum([0] + [len(chunk) for chunk in chunks[:-1]])
+    tasks = [
+        {
+            "geometry": geometry,
+            "background": background,
+            "Z": Z[: chunk[-1]],
+            "ends": chunk,
+            "first": start,
+            "marker": marker,
+            "style": kwargs,
+            "output": output,
+            "palette": palette,
+        }
+        for chunk, start in zip(chunks, starts.tolist())
+    ]
+
+    if workers == 1 or len(tasks) == 1:
+        results = [_render_frames(task) for task in tasks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_render_frames, tasks))
+    images = [image for result in results for image in result]
+
+    if output == ".gif":
+        _write_gif(path, images, fps)
+    elif output == ".mp4":
+        _write_mp4(path, images, fps)
+    else:
+        return images
+    return [path]
+
+
+def _static_layer(plot: ComplexPlot) -> tuple[np.ndarray, dict]:
+    """Function to draw the static content and return it with the geometry"""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    plot._render()
+    fig, ax = plot.fig, plot._ax
+    canvas = FigureCanvasAgg(fig)
+    canvas.draw()
+    background = np.asarray(canvas.buffer_rgba()).copy()
+    bounds = ax.get_position().bounds  # After the aspect is applied
+    geometry = {
+        "figsize": tuple(fig.get_size_inches()),
+        "dpi": fig.dpi,
+        "bounds": bounds,
+        "xlim": ax.get_xlim(),
+        "ylim": ax.get_ylim(),
+    }
+    return background, geometry
+
+
+def _palette(background: np.ndarray, color) -> list:
+    """Function to find a palette for the background and the trajectory"""
+    from matplotlib.colors import to_rgb
+    from PIL import Image
+
+    rgb = background[..., :3]
+    band = np.empty((8, rgb.shape[1], 3), dtype=np.uint8)
+    band[:] = np.round(np.array(to_rgb(color)) * 255)
+    image = Image.fromarray(np.concatenate((rgb, band)), "RGB")
+    return image.quantize(256, method=Image.Quantize.FASTOCTREE).getpalette()
+
+
+def _render_frames(task: dict) -> list:
+    """
+    Function to render a chunk of consecutive frames. Runs in a worker
+    process, so only the background image and the geometry of the axes are
+    sent instead of the figure.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.lines import Line2D
+    from PIL import Image
+
+    geometry, Z, style = task["geometry"], task["Z"], task["style"]
+    output = task["output"]
+    fig = Figure(figsize=geometry["figsize"], dpi=geometry["dpi"])
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_axes(geometry["bounds"])
+    ax.set_xlim(geometry["xlim"])
+    ax.set_ylim(geometry["ylim"])
+    ax.set_axis_off()
+    line = Line2D([], [], animated=True, **style)
+    point = Line2D(
+        [], [], marker=task["marker"], color=style["color"], animated=True
+    )
+    ax.add_line(line)
+    ax.add_line(point)
+
+    canvas.draw()
+    pixels = np.asarray(canvas.get_renderer().buffer_rgba())
+    pixels[:] = task["background"]
+    if task["palette"] is not None:
+        palette = Image.new("P", (1, 1))
+        palette.putpalette(task["palette"])
+
+    images = []
+    drawn = 0  # Number of samples of the trajectory drawn
+    for i, end in enumerate(task["ends"]):
+        if end > drawn:
+            # Only the new segment, from the last drawn point
+            segment = Z[max(drawn - 1, 0) : end]
+            line.set_data(segment.real, segment.imag)
+            ax.draw_artist(line)
+            drawn = end
+        trail = canvas.copy_from_bbox(fig.bbox)
+        point.set_data(Z.real[end - 1 : end], Z.imag[end - 1 : end])
+        ax.draw_artist(point)
+
+        image = Image.fromarray(pixels, "RGBA").convert("RGB")
+        if output in (".gif", ".mp4"):
+            # Frames are sent back as PNG, with a palette for a GIF
+            if output == ".gif":
+                image = image.quantize(palette=palette, dither=Image.Dither.NONE)
+            buffer = BytesIO()
+            image.save(buffer, format="png", compress_level=1)
+            images.append(buffer.getvalue())
+        else:
+            filename = output.format(task["first"] + i)
+            image.save(filename)
+            images.append(filename)
+        canvas.restore_region(trail)
+    return images
+
+
+def _write_gif(path: str, images: list, fps: float):
+    from PIL import Image
+
+    frames = [Image.open(BytesIO(image)) for image in images]
+    frames[0].save(
+        path,
+        save_all=True,
+        append_images=frames[1:],
+        duration=1000 / fps,
+        loop=0,
+        optimize=False,  # The frames already share a palette
+    )
+
+
+def _write_mp4(path: str, images: list, fps: float):
+    import subprocess
+
+    # fmt: off
+    command = [
+        shutil.which("ffmpeg"), "-y", "-loglevel", "error",
+        "-f", "image2pipe", "-framerate", str(fps), "-c:v", "png", "-i", "-",
+        "-c:v", "libx264", "-pix_fmt", "yuv420p",
+        "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", path,
+    ]
+    # fmt: on
+    subprocess.run(command, input=b"".join(images), check=True)
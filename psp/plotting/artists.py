@@ -0,0 +1,78 @@
+from typing import Iterable
+import numpy as np
+from matplotlib.artist import Artist, allow_rasterization
+from matplotlib.text import Text
+
+
+class TextLayer(Artist):
+    """
+    An artist drawing many labels with a single Text object.
+
+    A separate ax.text artist for each label has to be created, laid out and
+    kept by the axes. The layer instead moves one Text object to each
+    position when drawn, so hundreds of labels cost one artist.
+
+    Attributes
+    ----------
+    x, y : np.ndarray
+        Position of each label in data coordinates.
+    texts : list
+        The labels.
+    """
+
+    def __init__(self, x: Iterable, y: Iterable, texts: Iterable, **kwargs):
+        """
+        Parameters
+        ----------
+        x, y : Iterable
+            Position of each label in data coordinates.
+        texts : Iterable
+            The labels.
+        **kwargs : N/A
+            Properties of the labels e.g. fontsize and color.
+        """
+        super().__init__()
+        self.set_clip_on(False)  # The labels are not clipped, like ax.text
+        self._text = Text(**kwargs)
+        self.set_data(x, y, texts)
+
+    def set_data(self, x: Iterable, y: Iterable, texts: Iterable = None):
+        """Method to change the positions and optionally the labels"""
+        self.x = np.asarray(x, dtype=float).ravel()
+        self.y = np.asarray(y, dtype=float).ravel()
+        if texts is not None:
+            self.texts = [str(s) for s in texts]
+        self.stale = True
+
+    def _labels(self):
+        """Generator moving the Text object to each label"""
+        text = self._text
+        text.set_figure(self.figure)
+        text.set_transform(self.get_transform())
+        for x, y, s in zip(self.x, self.y, self.texts):
+            text.set_position((x, y))
+            text.set_text(s)
+            yield text
+
+    @allow_rasterization
+    def draw(self, renderer):
+        if not self.get_visible():
+            return
+        for text in self._labels():
+            text.draw(renderer)
+        self.stale = False
+
+    def get_window_extent(self, renderer=None):
+        """Method to return the union of the extents of the labels"""
+        from matplotlib.transforms import Bbox
+
+        bboxes = []
+        if self.get_visible():
+            for text in self._labels():
+                bbox = text.get_window_extent(renderer)
+                if np.isfinite(bbox.bounds).all() and bbox.width and bbox.height:
+                    bboxes.append(bbox)
+        return Bbox.union(bboxes) if bboxes else Bbox([[0, 0], [0, 0]])
+
+    def get_tightbbox(self, renderer=None):
+        return self.get_window_extent(renderer)
@@ -0,0 +1,232 @@
+import os
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from itertools import batched
+from typing import Callable, Iterable, Iterator
+
+# Upper limit for the default number of jobs sent to a worker at a time
+MAX_CHUNKSIZE = 16
+
+
+@dataclass
+class PlotJob:
+    """
+    A class to describe a plot to be rendered by render_batch.
+
+    The plot is created with plot(*args, headless=True, **kwargs) in a worker
+    process after which the recorded method calls are applied in order.
+    Everything in the job has to be picklable, i.e. plot must be a class or a
+    module level function.
+
+    Attributes
+    ----------
+    plot : Callable
+        Plot class (e.g. RXplot) or factory function returning a plot.
+    args : tuple
+        Positional arguments for plot.
+    kwargs : dict
+        Keyword arguments for plot.
+    calls : list
+        List of (method name, args, kwargs) applied to the plot.
+    format : str
+        File format of the rendered plot. The default is 'png'.
+    path : str | None
+        If given the plot is saved to this path by the worker instead of
+        returning the rendered bytes.
+    savefig : dict
+        Additional arguments for matplotlib.figure.Figure.savefig.
+    name : str | None
+        Optional name to identify the job in the results.
+    """
+
+    plot: Callable
+    args: tuple = ()
+    kwargs: dict = field(default_factory=dict)
+    calls: list = field(default_factory=list)
+    format: str = "png"
+    path: str | None = None
+    savefig: dict = field(default_factory=dict)
+    name: str | None = None
+
+    def call(self, method: str, *args, **kwargs):
+        """
+        Method to record a method call on the plot e.g.
+        job.call("add_zone", zone, color="red").
+
+        Returns
+        -------
+        PlotJob
+            The job itself to allow chaining of calls.
+
+        """
+        self.calls.append((method, args, kwargs))
+        return self
+
+
+@dataclass
+class BatchResult:
+    """
+    A class with the result of a rendered PlotJob.
+
+    Attributes
+    ----------
+    index : int
+        Position of the job in the iterable given to render_batch.
+    name : str | None
+        Name of the job.
+    data : bytes | None
+        Rendered plot if the job has no path and succeeded.
+    path : str | None
+        Path of the saved plot if the job has a path and succeeded.
+    error : str | None
+        Traceback of the exception if the job failed.
+    """
+
+    index: int
+    name: str | None = None
+    data: bytes | None = None
+    path: str | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def render_job(job: PlotJob) -> bytes | None:
+    """
+    Function to create and render the plot of a single job in the current
+    process.
+
+    Returns
+    -------
+    bytes | None
+        The rendered plot or None if the job has a path.
+
+    """
+    with job.plot(*job.args, headless=True, **job.kwargs) as plot:
+        for method, args, kwargs in job.calls:
+            getattr(plot, method)(*args, **kwargs)
+
+        if job.path is not None:
+            plot.save(job.path, format=job.format, **job.savefig)
+            return None
+        return plot.to_bytes(format=job.format, **job.savefig)
+
+
+def _render_chunk(chunk: tuple) -> list[BatchResult]:
+    results = []
+    for index, job in chunk:
+        result = BatchResult(index=index, name=job.name, path=job.path)
+        try:
+            result.data = render_job(job)
+        except Exception:
+            result.path = None
+            result.error = traceback.format_exc()
+        results.append(result)
+    return results
+
+
+def _init_worker():
+    import matplotlib
+
+    # Factories used by the jobs may still use pyplot. No windows are needed.
+    matplotlib.use("Agg")
+
+
+def render_batch(
+    jobs: Iterable[PlotJob],
+    max_workers: int = None,
+    chunksize: int = None,
+    mp_context=None,
+) -> Iterator[BatchResult]:
+    """
+    Function to render many plots in parallel using a process pool.
+
+    Rendering with matplotlib is CPU bound and single threaded, so the jobs
+    are distributed to worker processes in chunks. The results are yielded
+    as soon as a chunk is finished, i.e. not necessarily in the order of the
+    jobs (use BatchResult.index). A failing job does not stop the batch; the
+    traceback is returned in BatchResult.error instead. If a worker process
+    dies, the jobs which were pending in the pool are returned as failed and
+    the remaining jobs are rendered in a new pool.
+
+    Parameters
+    ----------
+    jobs : Iterable[PlotJob]
+        The plots to render. The iterable is consumed lazily so only a
+        limited number of jobs are kept in memory at a time.
+    max_workers : int, optional
+        Number of worker processes. The default is None resulting in the
+        number of CPUs.
+    chunksize : int, optional
+        Number of jobs sent to a worker at a time. The default is None which
+        spreads sized iterables evenly over the workers (at most 16 jobs per
+        chunk) and sends generators one job at a time.
+    mp_context : multiprocessing context, optional
+        Context used to start the worker processes. The default is None.
+
+    Yields
+    ------
+    BatchResult
+        Result of each job.
+
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    if chunksize is None:
+        if hasattr(jobs, "__len__"):
+            chunksize = -(-len(jobs) // (max_workers * 4))
+            chunksize = max(1, min(MAX_CHUNKSIZE, chunksize))
+        else:
+            chunksize = 1
+
+    chunks = batched(enumerate(jobs), chunksize)
+    max_pending = max_workers * 2
+
+    def new_pool():
+        return ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=mp_context, initializer=_init_worker
+        )
+
+    executor = new_pool()
+    broken = False
+    pending = {}
+    try:
+        while True:
+            for chunk in chunks:
+                if broken:
+                    # The futures of the broken pool fail on their own, so
+                    # only the remaining chunks go to a new pool.
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    executor, broken = new_pool(), False
+                try:
+                    future = executor.submit(_render_chunk, chunk)
+                except BrokenProcessPool:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    executor = new_pool()
+                    future = executor.submit(_render_chunk, chunk)
+                pending[future] = chunk
+                if len(pending) >= max_pending:
+                    break
+
+            if not pending:
+                return
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = pending.pop(future)
+                try:
+                    results = future.result()
+                except Exception as exception:
+                    # The chunk could not be sent or the worker died
+                    broken |= isinstance(exception, BrokenProcessPool)
+                    error = traceback.format_exc()
+                    results = [
+                        BatchResult(index=index, name=job.name, error=error)
+                        for index, job in chunk
+                    ]
+                yield from results
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -1,18 +1,21 @@
 import numpy as np
 from psp.plotting.fakeax import FakeAx
-import matplotlib.pyplot as plt
+from psp.plotting.edges import find_edges
+from psp.plotting.status import StatusMatrix
+from psp.plotting.comtrade import Comtrade
+from psp.plotting.figure import FigureExport, create_figure
 
 default_kwargs = {"color": "Blue"}
 
 
-class BinaryPlot:
+class BinaryPlot(FigureExport):
     """A class for creating a binary plot from a comtrade file."""
 
-    def __init__(self, title: str, figsize: tuple = (8, 8)):
+    def __init__(self, title: str, figsize: tuple = (8, 8), headless: bool = False):
         self.title = title
         self.figsize = figsize
 
-        self.fig = plt.figure(figsize=self.figsize)
+        self.fig = create_figure(figsize=self.figsize, headless=headless)
         self._ax = self.fig.add_subplot(111)
         self.ax = FakeAx(self._ax)
         self.ax.set_title(self.title)
@@ -23,9 +26,54 @@ class BinaryPlot:
         record: object,
         changed_signal_only: bool = True,
         trigger_time_zero: bool = True,
+        colors: dict = None,
+        window: tuple = None,
         **kwargs,
     ):
-        binary_plot(self._ax, record, changed_signal_only, trigger_time_zero, **kwargs)
+        """
+        Method to add the binary status signals of a record to the plot.
+        All signals are drawn as a single collection of rectangles.
+
+        Parameters
+        ----------
+        record : object
+            Record with the attributes status, time, trigger_time and
+            status_channel_ids e.g. from a comtrade file, a Comtrade object
+            or a StatusMatrix.
+        changed_signal_only : bool, optional
+            Only plot signals that change during the record.
+            The default is True.
+        trigger_time_zero : bool, optional
+            Shift the time so the trigger time is zero. The default is True.
+        colors : dict, optional
+            Colors for specific signals given as {channel id: color}. Other
+            signals use the color given in kwargs. The default is None.
+        window : tuple, optional
+            Tuple (t0, t1) with the start and end time in seconds to plot.
+            The intervals are clipped to the window and changed_signal_only
+            only keeps signals that change within the window. If
+            trigger_time_zero is True the window is relative to the trigger.
+            The default is None resulting in the entire record.
+        **kwargs : N/A
+            Additional arguments for the underlying PolyCollection e.g. color,
+            alpha or height (of the bars).
+
+        Returns
+        -------
+        None.
+
+        """
+        binary_plot(
+            self._ax,
+            record,
+            changed_signal_only,
+            trigger_time_zero,
+            colors=colors,
+            window=window,
+            **kwargs,
+        )
+        if window is not None:
+            self.ax.set_xlim(window)
 
     def show(self):
         """
@@ -36,6 +84,7 @@ class BinaryPlot:
         None.
 
         """
+        import matplotlib.pyplot as plt
 
         self.ax.overwrite()
         plt.show()
@@ -46,94 +95,119 @@ class BinaryPlot:
         # self.fig.subplots_adjust(left=0.2, top=0.95, bottom=0.05)
 
 
-def _find_chunks(stream):
-    # Identify non-zero elements
-    non_zero = np.array(stream) != 0
-
-    # Identify positions where neighbors are zero
-    # Shifted arrays
-    left_zero = np.roll(np.array(stream) == 0, 1)
-    right_zero = np.roll(np.array(stream) == 0, -1)
-
-    # Set boundary conditions
-    left_zero[0] = True
-    right_zero[-1] = True
-
-    # Find non-zero elements with at least one zero neighbor
-    condition1 = non_zero & (left_zero | right_zero)
-
-    # (Special case) Find non-zero elements where both neighbors being zero
-    condition2 = non_zero & (left_zero & right_zero)
-
-    # Get the indices
-    indices1 = np.where(condition1)[0]
-
-    # Get the indices
-    indices2 = np.where(condition2)[0]
-
-    indices = np.sort(np.concatenate((indices1, indices2)))
+def _binary_collection(ax, names, edges, time, colors=None, height=0.8, **kwargs):
+    """
+    Function to draw the high intervals of all binary signals as a single
+    collection of rectangles. Signals without intervals are added as an
+    empty row.
+    """
+    from matplotlib.collections import PolyCollection
+    from matplotlib.colors import to_rgba
 
-    if indices.size > 0:
-        indices = np.split(indices, len(indices) / 2)
-    return indices
-
-
-def _binary_hbar(ax, name, stream, time, changed_signal_only=True, **kwargs):
     kwargs = {**default_kwargs, **kwargs}
-    # Constant signal zero
-    if not any(stream):  # ones only
-        if changed_signal_only:
-            return
-        else:
-            ax.barh(name, time[-1], left=0, alpha=0, **kwargs)  # invisible bar
-            return
-
-    # Constant signal one
-    if all(stream):  # ones only
-        if changed_signal_only:
-            return
+    color = kwargs.pop("color")
+    alpha = kwargs.pop("alpha", None)
+    colors = colors or {}
+
+    # The signal names are placed on a categorical y-axis like ax.barh with
+    # the first signal at the top
+    names = np.asarray(names)
+    ax.yaxis.update_units(names[::-1])
+    ypos = np.atleast_1d(ax.yaxis.convert_units(names))
+
+    # A high interval lasts until the first sample where the signal is low
+    counts = edges.counts
+    start = time[edges.rising]
+    end = time[np.minimum(edges.falling, len(time) - 1)]
+    y = np.repeat(ypos, counts)
+
+    facecolors = np.array([to_rgba(colors.get(name, color), alpha) for name in names])
+    facecolors = np.repeat(facecolors, counts, axis=0)
+
+    # Transparent rows for signals that are never high to keep them in view
+    empty = counts == 0
+    if empty.any():
+        start = np.concatenate([start, np.zeros(empty.sum())])
+        end = np.concatenate([end, np.zeros(empty.sum())])
+        y = np.concatenate([y, ypos[empty]])
+        facecolors = np.concatenate([facecolors, np.zeros((empty.sum(), 4))])
+
+    verts = np.empty((len(y), 4, 2))
+    verts[:, [0, 1], 0] = start[:, None]
+    verts[:, [2, 3], 0] = end[:, None]
+    verts[:, [0, 3], 1] = (y - height / 2)[:, None]
+    verts[:, [1, 2], 1] = (y + height / 2)[:, None]
+
+    collection = PolyCollection(verts, facecolors=facecolors, **kwargs)
+    ax.add_collection(collection)
+    ax.autoscale_view()
+    return collection
+
+
+def _find_record_edges(record, start: int = 0, stop: int = None):
+    """
+    Function to find the edges of a record or a StatusMatrix within a window
+    of samples. Only the samples within the window are read.
+    """
+    if isinstance(record, StatusMatrix):
+        return record.edges(start, stop)
+    if start == 0 and stop is None:
+        return find_edges(record.status)
+    return find_edges([np.asarray(s)[start:stop] for s in record.status])
+
+
+def binary_plot(
+    ax,
+    record,
+    changed_signal_only=True,
+    trigger_time_zero=True,
+    colors: dict = None,
+    window: tuple = None,
+    **kwargs,
+):
+    if isinstance(record, Comtrade):
+        # Only read the samples within the window from the file
+        offset = record.trigger_time if trigger_time_zero else 0.0
+        if window is not None:
+            record = record.get_status(window=(window[0] + offset, window[1] + offset))
         else:
-            ax.barh(name, time[-1], left=0, **kwargs)
-            return
+            record = record.get_status()
 
-    idx = _find_chunks(stream)
-    for i, j in idx:
-        start = time[i]
-        end = time[j - 1]
-        ax.barh(name, end - start, left=start, **kwargs)
+    if trigger_time_zero:
+        time = np.asarray(record.time) - record.trigger_time
+    else:
+        time = np.asarray(record.time)
+
+    if window is not None:
+        start = np.searchsorted(time, window[0], side="left")
+        stop = np.searchsorted(time, window[1], side="right")
+        if start >= stop:
+            return None
+        edges = _find_record_edges(record, start, stop)
+        time = time[start:stop]
+    else:
+        edges = _find_record_edges(record)
 
+    if changed_signal_only:
+        channels = np.flatnonzero(edges.changed)
+    else:
+        channels = np.arange(edges.n_channels)
 
-def binary_plot(ax, record, changed_signal_only=True, trigger_time_zero=True, **kwargs):
-    idx = reversed(range(len(record.status)))
+    if channels.size == 0:
+        return None
 
-    if trigger_time_zero:
-        time = np.array(record.time) - record.trigger_time
-    else:
-        time = record.time
-
-    for i in idx:
-        _binary_hbar(
-            ax=ax,
-            name=record.status_channel_ids[i],
-            stream=record.status[i],
-            time=time,
-            changed_signal_only=changed_signal_only,
-            **kwargs,
-        )
+    names = [record.status_channel_ids[i] for i in channels]
+    return _binary_collection(
+        ax, names, edges.take(channels), time, colors=colors, **kwargs
+    )
 
 
 def count_binary(record):
-    total = len(record.status)
-    changed = 0
-    contant_zero = 0
-    contant_one = 0
-    for s in record.status:
-        if not any(s):
-            contant_zero += 1
-        elif all(s):
-            contant_one += 1
-        else:
-            changed += 1
+    edges = _find_record_edges(record)
+    total = edges.n_channels
+    changed = int(edges.changed.sum())
+    contant_zero = int(edges.constant_zero.sum())
+    contant_one = int(edges.constant_one.sum())
     return total, changed, contant_zero, contant_one
 
 
@@ -141,13 +215,16 @@ def binary_start(rec, bin_id):
     """ Function to find the index for when a binary signal goes high (1)."""
     try:
         idx1 = rec.status_channel_ids.index(bin_id)
-        stream = rec.status[idx1]
-    except:
+    except ValueError:
         raise ValueError(f'There is not a binary status signal called: "{bin_id}"')
 
-    try:
-        idx2 = np.atleast_1d(stream).nonzero()[0][0]
-    except:
+    if isinstance(rec, StatusMatrix):
+        edges = rec.take([idx1]).edges()
+    else:
+        edges = find_edges(np.atleast_2d(rec.status[idx1]))
+
+    idx2 = edges.first_rising()[0]
+    if idx2 < 0:
         raise ValueError(f'The binary status signal called: "{bin_id}", is not activated at any time in the record.')
 
-    return idx2
\ No newline at end of file
+    return idx2
@@ -0,0 +1,294 @@
+import hashlib
+import os
+import types
+from pathlib import Path
+import numpy as np
+
+CACHE_VERSION = 2  # Increase when the rendering changes for the same inputs
+CACHE_MAX_BYTES = 256 * 2**20  # Default size bound of a RenderCache
+
+# Plot attributes with inputs which are not in the op log or on the axes
+PLOT_ATTRIBUTES = ("title", "waveforms", "opt_center_axis")
+# Properties of the artists drawn directly on the axes
+ARTIST_GETTERS = (
+    "get_paths",
+    "get_offsets",
+    "get_xydata",
+    "get_array",
+    "get_extent",
+    "get_text",
+    "get_position",
+    "get_sizes",
+    "get_facecolor",
+    "get_edgecolor",
+    "get_color",
+    "get_linewidth",
+    "get_linestyle",
+    "get_marker",
+    "get_markersize",
+    "get_fontsize",
+    "get_rotation",
+    "get_alpha",
+    "get_zorder",
+    "get_label",
+    "get_visible",
+    "get_cmap",
+    "get_clim",
+)
+# Data of artists without getters e.g. Quiver (U, V) and TextLayer
+ARTIST_ATTRIBUTES = ("U", "V", "x", "y", "texts")
+TITLE_LOCATIONS = ("left", "center", "right")
+
+
+class _Unhashable(Exception):
+    """Raised for inputs of a plot without a stable representation"""
+
+
+class RenderCache:
+    """
+    A class for a content-addressed cache of rendered plots on disk.
+
+    The key of a plot is a hash of everything that is drawn: the data recorded
+    by the plot, the FakeAx op log, the artists on the axes, the units, ticks
+    and labels of the axes, the figure size, the rcParams, the file format and
+    the savefig arguments. Plots with the same key are rendered to the same
+    bytes, so FigureExport.save returns the cached file instead of drawing
+    the figure. Plots with inputs that can not be hashed, e.g. a lambda or an
+    unknown object, have no key and are always drawn.
+
+    The least recently used files are removed when the size of the cache
+    exceeds max_bytes. Several processes can share the directory.
+
+    Attributes
+    ----------
+    directory : Path
+        Directory of the cached files.
+    max_bytes : int
+        Size bound of the cache in bytes.
+    hits : int
+        Number of renders returned from the cache.
+    misses : int
+        Number of renders not found in the cache.
+
+    Examples
+    --------
+    >>> from psp.plotting.figure import FigureExport
+    >>> FigureExport.render_cache = RenderCache("~/.cache/psp-plotting")
+    """
+
+    def __init__(self, directory, max_bytes: int = CACHE_MAX_BYTES):
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size = sum(f.stat().st_size for f in self._files())
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of the lookups returned from the cache"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def key(self, plot, format: str, **kwargs) -> str:
+        """
+        Method to compute the key of a plot.
+
+        Parameters
+        ----------
+        plot : FigureExport
+            The plot e.g. a ComplexPlot, BinaryPlot or CombineFigure.
+        format : str
+            File format e.g. 'png' or 'svg'.
+        **kwargs : N/A
+            The arguments for matplotlib.figure.Figure.savefig.
+
+        Returns
+        -------
+        str | None
+            Hexadecimal digest of the inputs of the plot or None if the
+            inputs can not be hashed and the plot must not be cached.
+
+        """
+        import matplotlib
+
+        h = hashlib.blake2b(digest_size=20)
+        try:
+            _feed(h, (CACHE_VERSION, matplotlib.__version__, format, kwargs))
+            _feed(h, sorted((k, repr(v)) for k, v in matplotlib.rcParams.items()))
+            _feed(h, (tuple(plot.fig.get_size_inches()), plot.fig.dpi))
+            _feed(h, _plot_state(plot))
+            for ax in plot.fig.axes:
+                for artists in (ax.collections, ax.lines, ax.patches, ax.texts):
+                    _feed(h, list(artists))
+                _feed(h, (list(ax.images), list(ax.artists)))
+        except _Unhashable:
+            return None
+        return h.hexdigest()
+
+    def get(self, key: str) -> bytes | None:
+        """Method to return the cached file of a key or None on a miss"""
+        path = self.directory / key
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        # The modification time is the last use for the LRU eviction
+        os.utime(path)
+        self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes):
+        """Method to add a rendered file and evict old files if needed"""
+        path = self.directory / key
+        tmp = path.with_name(f"{key}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)  # Other processes never read a partial file
+
+        self._size += len(data)
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def clear(self):
+        """Method to remove all cached files and reset the counters"""
+        for f in self._files():
+            f.unlink(missing_ok=True)
+        self._size = 0
+        self.hits = self.misses = 0
+
+    def _files(self) -> list[Path]:
+        return [f for f in self.directory.iterdir() if f.suffix != ".tmp"]
+
+    def _evict(self):
+        # Other processes may have added files, so the size is recounted
+        files = []
+        for f in self._files():
+            try:
+                stat = f.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, f))
+        files.sort()
+
+        self._size = sum(size for _, size, _ in files)
+        for _, size, f in files:
+            if self._size <= self.max_bytes:
+                break
+            f.unlink(missing_ok=True)
+            self._size -= size
+
+
+def _plot_state(plot) -> list:
+    """Function to return the inputs of a plot which are not artists"""
+    state = [type(plot).__module__, type(plot).__qualname__]
+    state += [getattr(plot, name, None) for name in PLOT_ATTRIBUTES]
+    scene = getattr(plot, "scene", None)
+    if scene is not None:
+        # The position in the color cycle is given by the flushed primitives
+        state.append((scene.primitives, scene._flushed))
+    ops = getattr(getattr(plot, "ax", None), "ops", None)
+    state.append(ops)
+    if hasattr(plot, "fig"):
+        state += [_axes_state(ax) for ax in plot.fig.axes]
+    # CombineFigure
+    state += [_plot_state(p) for p in getattr(plot, "plots", [])]
+    return state
+
+
+def _axes_state(ax) -> list:
+    """Function to return the units, ticks and labels of an axes"""
+    state = [ax.name, ax.axison, [ax.get_title(loc) for loc in TITLE_LOCATIONS]]
+    for axis in (ax.xaxis, ax.yaxis):
+        # The mapping of the categories to positions of a categorical axis
+        # (matplotlib.category.UnitData) e.g. the signals of a BinaryPlot
+        state.append(getattr(axis.units, "_mapping", axis.units))
+        state += [axis.get_scale(), axis.get_label_text(), axis.get_view_interval()]
+        for minor in (False, True):
+            locs = axis.get_ticklocs(minor=minor)
+            if minor:
+                labels = axis.get_minor_formatter().format_ticks(locs)
+            else:
+                labels = axis.get_major_formatter().format_ticks(locs)
+            state += [locs, labels]
+    return state
+
+
+def _feed(h, obj, seen: set = None):
+    """Function to add a stable representation of an object to a hash"""
+    seen = set() if seen is None else seen
+    if obj is None or isinstance(obj, (bool, int, float, complex, str)):
+        h.update(f"{type(obj).__name__}:{obj!r};".encode())
+    elif isinstance(obj, bytes):
+        h.update(obj)
+    elif isinstance(obj, np.ma.MaskedArray):
+        _feed(h, (obj.data, np.ma.getmaskarray(obj)), seen)
+    elif isinstance(obj, np.ndarray):
+        if obj.dtype == object:
+            _feed(h, (obj.shape, obj.tolist()), seen)
+        else:
+            h.update(f"{obj.dtype.str}{obj.shape}".encode())
+            h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, np.generic):
+        _feed(h, obj.item(), seen)
+    elif isinstance(obj, dict):
+        h.update(b"{")
+        for k, v in sorted(obj.items(), key=lambda item: repr(item[0])):
+            _feed(h, (k, v), seen)
+        h.update(b"}")
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"{type(obj).__name__}[".encode())
+        for item in obj:
+            _feed(h, item, seen)
+        h.update(b"]")
+    elif isinstance(obj, (set, frozenset)):
+        _feed(h, ("set", sorted(obj, key=repr)), seen)
+    elif id(obj) in seen:
+        h.update(b"<cycle>")
+    else:
+        seen.add(id(obj))
+        _feed_object(h, obj, seen)
+
+
+def _feed_object(h, obj, seen: set):
+    from matplotlib.artist import Artist
+    from matplotlib.colors import Colormap, Normalize
+    from matplotlib.path import Path as MplPath
+
+    name = f"{type(obj).__module__}.{type(obj).__qualname__}"
+    h.update(name.encode())
+    if isinstance(obj, MplPath):
+        _feed(h, (obj.vertices, obj.codes), seen)
+    elif isinstance(obj, Artist):
+        for getter in ARTIST_GETTERS:
+            if hasattr(obj, getter):
+                try:
+                    value = getattr(obj, getter)()
+                except (TypeError, ValueError, AttributeError):
+                    continue
+                _feed(h, (getter, value), seen)
+        for attribute in ARTIST_ATTRIBUTES:
+            if attribute in vars(obj):
+                _feed(h, (attribute, vars(obj)[attribute]), seen)
+        if getattr(obj, "norm", None) is not None:
+            _feed(h, ("norm", obj.norm), seen)
+    elif isinstance(obj, Colormap):
+        _feed(h, (obj.name, obj(np.linspace(0, 1, obj.N))), seen)
+    elif isinstance(obj, Normalize):
+        _feed(h, (obj.vmin, obj.vmax, obj.clip), seen)
+    elif hasattr(obj, "wkb"):
+        # shapely geometries
+        h.update(obj.wkb)
+    elif isinstance(obj, types.MethodType):
+        _feed(h, (obj.__func__, obj.__self__), seen)
+    elif callable(obj) and hasattr(obj, "__qualname__"):
+        if "<" in obj.__qualname__:
+            # Lambdas and local functions with the same name can differ
+            raise _Unhashable(obj)
+        h.update(f"{obj.__module__}.{obj.__qualname__}".encode())
+    elif hasattr(obj, "__dict__") and not name.startswith("matplotlib"):
+        _feed(h, vars(obj), seen)
+    else:
+        # The repr can be the same for objects with different content
+        raise _Unhashable(obj)
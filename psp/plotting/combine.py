@@ -1,8 +1,10 @@
-import matplotlib.pyplot as plt
+from psp.plotting.figure import FigureExport, create_figure
 
 
-class CombineFigure:
-    def __init__(self, nrows: int, ncols: int, figsize: tuple = (8, 8)):
+class CombineFigure(FigureExport):
+    def __init__(
+        self, nrows: int, ncols: int, figsize: tuple = (8, 8), headless: bool = False
+    ):
         """
         Constructs all the necessary attributes for the CombineFigure object.
 
@@ -14,6 +16,9 @@ class CombineFigure:
             Number of columns.
         figsize : tuple, optional
             Figure size of the matplotlib.pylot figure. The default is (8, 8).
+        headless : bool, optional
+            Create the figure without pyplot for rendering to files with
+            save/to_bytes. The default is False.
 
         Returns
         -------
@@ -23,8 +28,11 @@ class CombineFigure:
         self.nrows = nrows
         self.ncols = ncols
         self.figsize = figsize
-        self.fig = plt.figure(figsize=self.figsize, layout="constrained")
+        self.fig = create_figure(
+            figsize=self.figsize, headless=headless, layout="constrained"
+        )
         self.axes = []
+        self.plots = []
         self.i = 0
 
     def add_axis(self, projection=None):
@@ -33,6 +41,28 @@ class CombineFigure:
         self.axes.append(ax)
         return ax
 
+    def attach(self, plot):
+        """
+        Method to attach a plot created on one of the axes of the figure.
+        The deferred actions of attached plots are applied when the figure is
+        saved.
+
+        Parameters
+        ----------
+        plot : ComplexPlot | BinaryPlot
+            Plot created with an axes from add_axis.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.plots.append(plot)
+
+    def _render(self):
+        for plot in self.plots:
+            plot._render()
+
     def _maximize_window(self):
         """
         Method to maximize the figure.
@@ -42,6 +72,8 @@ class CombineFigure:
         None.
 
         """
+        import matplotlib.pyplot as plt
+
         figManager = plt.get_current_fig_manager()
         figManager.window.showMaximized()
 
@@ -59,6 +91,9 @@ class CombineFigure:
         None.
 
         """
+        import matplotlib.pyplot as plt
+
+        self._render()
         if maximize:
             self._maximize_window()
         plt.show()
@@ -1,21 +1,28 @@
-import matplotlib.pyplot as plt
+from __future__ import annotations
 from psp.plotting.plotfunc import (
     plot_quiver,
-    plot_textbox,
     plot_aux_line,
     add_point,
     nplot,
 )
 import psp.plotting.plotfunc as plotfunc
+from psp.plotting.decimate import rdp, zone_crossings
+from psp.plotting.zones import classify, ZoneClassification
 from psp.plotting.angle import plot_angle
 from abc import ABC, abstractmethod
 from math import cos, sin, pi
-from typing import Iterable, Callable
+from typing import Iterable, Callable, TYPE_CHECKING
 import numpy as np
-from shapely.geometry import Polygon
 from psp.plotting.fakeax import FakeAx
+from psp.plotting.extent import Extent
+from psp.plotting.scene import Scene
+from psp.plotting.figure import FigureExport, create_figure
 
-plt.ioff()  # to prevent figure window from showing until plt.show() is called.
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+    from shapely.geometry import Polygon
+
+SEQUENCE_NAMES = ("Zero sequence", "Positive sequence", "Negative sequence")
 
 # Concept
 # Specielle plots from RXplot, PhasorPlot og PolarPlot arver fra ComplexPlot
@@ -27,7 +34,7 @@ plt.ioff()  # to prevent figure window from showing until plt.show() is called.
 # først kaldt når ComplexPlot.Show() kaldes.
 
 
-class ComplexPlot(ABC):
+class ComplexPlot(FigureExport, ABC):
     """
     A class to represent a plot using complex numbers.
     This class utilize the matplotlib.pyplot module for plotting.
@@ -40,9 +47,14 @@ class ComplexPlot(ABC):
         Title of the plot.
     projection : str | None
         Parameter for the matplotlib.pyplot.figure.add_subplot function
-    coordinates : list
-        List of coordinates to be considered for setting the x and y limits of
-        the plot.
+    extent : Extent
+        Running extent of the data to be considered for setting the x and y
+        limits of the plot.
+    zones : list
+        List of the zones (shapely polygons) added to the plot.
+    scene : Scene
+        The recorded lines, phasors, points and texts, which are merged into
+        a few artists when the plot is shown or saved.
     ax : plt.Axes
         List of coordinates to be considered for setting the x and y limits of
         the plot.
@@ -60,6 +72,7 @@ class ComplexPlot(ABC):
         ax: plt.Axes = None,
         figsize: tuple = (8, 8),
         projection: str = None,
+        headless: bool = False,
     ):
         """
         Constructs all the necessary attributes for the abstract class
@@ -81,6 +94,9 @@ class ComplexPlot(ABC):
             Options: {None, 'aitoff', 'hammer', 'lambert', 'mollweide',
              'polar', 'rectilinear', str}
             The default is None resulting in a rectilinear projection.
+        headless : bool, optional
+            Create the figure without pyplot for rendering to files with
+            save/to_bytes. The default is False.
 
         Returns
         -------
@@ -89,12 +105,16 @@ class ComplexPlot(ABC):
         """
         self.title = title
         self.projection = projection
-        self.coordinates = []
+        self.extent = Extent()
+        self.scene = Scene()
+        self.zones = []
 
         if ax:
             self._ax = ax
+            self.fig = ax.figure
+            self._owns_fig = False
         else:
-            self.fig = plt.figure(figsize=figsize)
+            self.fig = create_figure(figsize=figsize, headless=headless)
             self._ax = self.fig.add_subplot(111, projection=self.projection)
         self.ax = FakeAx(self._ax)
         self.ax.set_title(self.title)
@@ -141,7 +161,7 @@ class ComplexPlot(ABC):
 
         """
         plot_quiver(
-            ax=self.ax,
+            ax=self.scene,
             phasor=value,
             ref=ref,
             color=color,
@@ -151,7 +171,59 @@ class ComplexPlot(ABC):
             **kwargs,
         )
 
-        self.coordinates.append((value.real, value.imag))
+        self.extent.update(value.real, value.imag)
+
+    def add_phasors(
+        self,
+        values: Iterable[complex],
+        refs: Iterable = None,
+        names: Iterable[str] = None,
+        colors=None,
+        polar: bool = False,
+        **kwargs,
+    ):
+        """
+        This functions adds many phasors to the plot as a single quiver with
+        the names drawn by a single text layer.
+
+        Parameters
+        ----------
+        values : Iterable[complex]
+            Values of the phasors.
+        refs : Iterable, optional
+            Beginning of each phasor as complex values or (x, y) tuples.
+            The default is None resulting in (0,0).
+        names : Iterable[str], optional
+            Name of each phasor. Empty names are not plotted.
+            The default is None.
+        colors : optional
+            A color or a color for each phasor. The default is None.
+        polar : bool, optional
+            Option for plotting on a axes with polar projection.
+            The default is False, which is equal to a cartesian axes.
+        **kwargs : N/A
+            Additional arguments can be added for the underlying ax.quiver
+            object.
+
+        Returns
+        -------
+        None.
+
+        """
+        values = np.asarray(values, dtype=complex).ravel()
+        x0, y0, u, v = plotfunc.quiver_coordinates(values, refs, polar)
+        kwargs.setdefault("alpha", 0.7)
+        self.scene.quiver(
+            x0, y0, u, v, color=colors, angles="xy", scale_units="xy", scale=1, **kwargs
+        )
+        if names is not None:
+            names = np.asarray(names, dtype=object).ravel()
+            labeled = names != ""
+            self.scene.text(
+                u[labeled], v[labeled], names[labeled], fontsize=plotfunc.TEXT_FONTSIZE
+            )
+
+        self.extent.update(values.real, values.imag)
 
     def add_textbox(self, x: float, y: float, s: str, box: dict = {}, **kwargs):
         """
@@ -177,9 +249,11 @@ class ComplexPlot(ABC):
         None.
 
         """
-        plot_textbox(self.ax, x=x, y=y, s=s, box=box, **kwargs)
+        if box:
+            kwargs["bbox"] = box
+        self.scene.text(x, y, s, fontsize=plotfunc.TEXT_FONTSIZE, alpha=1, **kwargs)
 
-        self.coordinates.append((x, y))
+        self.extent.update(x, y)
 
     def add_point(self, value: complex | tuple, **kwargs):
         """
@@ -199,9 +273,12 @@ class ComplexPlot(ABC):
         None.
 
         """
-        add_point(self.ax, value=value, **kwargs)
+        add_point(self.scene, value=value, **kwargs)
 
-        self.coordinates.append((value.real, value.imag))
+        if isinstance(value, tuple):
+            self.extent.update(*value)
+        else:
+            self.extent.update(value.real, value.imag)
 
     def add_line(self, arange: Iterable, afunc: Callable, **kwargs):
         """
@@ -224,14 +301,13 @@ class ComplexPlot(ABC):
         """
         x = arange
         y = list(map(afunc, arange))
-        nplot(self.ax, x=x, y=y, **kwargs)
+        nplot(self.scene, x=x, y=y, **kwargs)
 
-        for p in zip(x, y):
-            self.coordinates.append(p)
+        self.extent.update(x, y)
 
     def add_limit(self, magnitude, angle, x0=0, y0=0, text="", deg=True, polar=False):
         plot_aux_line(
-            self.ax,
+            self.scene,
             x0=x0,
             y0=y0,
             magnitude=magnitude,
@@ -241,16 +317,43 @@ class ComplexPlot(ABC):
             polar=polar,
         )
 
-        self.coordinates.append((x0, y0))
         x1 = x0 + magnitude * cos(angle / 180 * pi)
-        y1 = x0 + magnitude * sin(angle / 180 * pi)
-        self.coordinates.append((x1, y1))
+        y1 = y0 + magnitude * sin(angle / 180 * pi)
+        self.extent.update([x0, x1], [y0, y1])
+
+    def add_plot(
+        self, x: Iterable, y: Iterable, tolerance: float = None, **kwargs
+    ):
+        """
+        Method to add a line to the plot.
+
+        Parameters
+        ----------
+        x : Iterable
+            x-coordinates of the line.
+        y : Iterable
+            y-coordinates of the line.
+        tolerance : float, optional
+            If given, the line is decimated with the Ramer-Douglas-Peucker
+            algorithm so the drawn line deviates at most this distance (in
+            data units) from the original. The default is None.
+        **kwargs : N/A
+            Additional arguments can be added for the underlying ax.plot
+            object.
 
-    def add_plot(self, x: Iterable, y: Iterable, **kwargs):
-        nplot(self.ax, x=x, y=y, **kwargs)
+        Returns
+        -------
+        None.
+
+        """
+        self.extent.update(x, y)
+
+        if tolerance is not None:
+            x, y = np.asarray(x), np.asarray(y)
+            idx = rdp(x, y, tolerance)
+            x, y = x[idx], y[idx]
 
-        for p in zip(x, y):
-            self.coordinates.append(p)
+        nplot(self.scene, x=x, y=y, **kwargs)
 
     def add_angle(
         self,
@@ -262,7 +365,9 @@ class ComplexPlot(ABC):
         arrow_start: bool = False,
         arrow_end: bool = True,
     ):
-        plot_angle(self.ax, r, phi_start, phi_end, text, scale, arrow_start, arrow_end)
+        plot_angle(
+            self.scene, r, phi_start, phi_end, text, scale, arrow_start, arrow_end
+        )
 
     def add_impedance_trace(
         self, imp: Iterable[complex], start: complex = 0 + 0j, **kwargs
@@ -312,22 +417,183 @@ class ComplexPlot(ABC):
         self.add_plot(real, imag, **kwargs)
 
     def add_trajectory(
-        self, Z: Iterable[complex], n: int = None, arrow: bool = True, **kwargs
+        self,
+        Z: Iterable[complex],
+        n: int = None,
+        arrow: bool = True,
+        tolerance: float = None,
+        **kwargs,
     ):
-        nplot(self.ax, Z.real, Z.imag, **kwargs)
+        """
+        Method to add a trajectory of complex values e.g. an impedance locus.
+
+        Parameters
+        ----------
+        Z : Iterable[complex]
+            Array of complex values.
+        n : int, optional
+            Number of arrows along the trajectory. The default is None.
+        arrow : bool, optional
+            Add arrows showing the direction. The default is True.
+        tolerance : float, optional
+            If given, the trajectory is decimated with the
+            Ramer-Douglas-Peucker algorithm so the drawn line deviates at most
+            this distance (in data units) from the original. The samples where
+            the trajectory enters or leaves one of the zones of the plot are
+            always kept. The default is None.
+        **kwargs : N/A
+            Additional arguments can be added for the underlying ax.plot
+            object.
+
+        Returns
+        -------
+        None.
+
+        """
+        Z = np.asarray(Z)
+        self.extent.update(Z.real, Z.imag)
+
+        if tolerance is not None:
+            keep = zone_crossings(Z.real, Z.imag, self.zones)
+            Z = Z[rdp(Z.real, Z.imag, tolerance, keep)]
+
+        nplot(self.scene, Z.real, Z.imag, **kwargs)
         if arrow:
-            plotfunc.arrow(self._ax, Z.real, Z.imag, n)
+            plotfunc.arrow(self.scene, Z.real, Z.imag, n)
+
+    def add_sequence(
+        self,
+        phases: Iterable,
+        components: Iterable[int] = (1, 2, 0),
+        names: Iterable[str] = None,
+        n: int = None,
+        arrow: bool = False,
+        tolerance: float = None,
+        **kwargs,
+    ):
+        """
+        Method to add the trajectories of the symmetrical components of
+        three-phase samples e.g. the phasors of a record.
+
+        Parameters
+        ----------
+        phases : Iterable
+            Complex phase quantities with the shape (N, 3).
+        components : Iterable[int], optional
+            The components to plot where 0 is the zero, 1 the positive and 2
+            the negative sequence. The default is (1, 2, 0).
+        names : Iterable[str], optional
+            Label of each plotted component. The default is None resulting in
+            "Zero sequence", "Positive sequence" and "Negative sequence".
+        n : int, optional
+            Number of arrows along each trajectory. The default is None.
+        arrow : bool, optional
+            Add arrows showing the direction. The default is False.
+        tolerance : float, optional
+            If given, the trajectories are decimated with the
+            Ramer-Douglas-Peucker algorithm. The default is None.
+        **kwargs : N/A
+            Additional arguments can be added for the underlying ax.plot
+            object.
+
+        Returns
+        -------
+        None.
+
+        """
+        sequence = plotfunc.fortescue(phases)
+        if names is None:
+            names = [SEQUENCE_NAMES[c] for c in components]
+
+        for c, name in zip(components, names):
+            self.add_trajectory(
+                sequence[..., c],
+                n=n,
+                arrow=arrow,
+                tolerance=tolerance,
+                label=name,
+                **kwargs,
+            )
+
+    def add_zone_trajectory(
+        self,
+        Z: Iterable[complex],
+        t: Iterable = None,
+        zones: Iterable = None,
+        colors: list = None,
+        outside_color: str = "lightgrey",
+        tolerance: float = None,
+        **kwargs,
+    ) -> ZoneClassification:
+        """
+        Method to add a trajectory colored by the zone containing each sample.
+
+        Parameters
+        ----------
+        Z : Iterable[complex]
+            Array of complex values.
+        t : Iterable, optional
+            Time of each sample used for the entry and exit times of the
+            returned classification. The default is None.
+        zones : Iterable, optional
+            Iterable of shapely polygons in order of priority. A sample inside
+            several zones gets the color of the first one. The default is None
+            resulting in the zones of the plot.
+        colors : list, optional
+            Color of each zone. The default is None resulting in the colors of
+            the property cycle.
+        outside_color : str, optional
+            Color of the samples outside all zones. The default is "lightgrey".
+        tolerance : float, optional
+            If given, the trajectory is decimated with the
+            Ramer-Douglas-Peucker algorithm. The samples where the zone
+            changes are always kept. The default is None.
+        **kwargs : N/A
+            Additional arguments can be added for the underlying
+            LineCollection object e.g. linewidths or linestyles.
+
+        Returns
+        -------
+        ZoneClassification
+            Membership of each sample and the entry and exit of each zone.
 
-        for p in zip(Z.real, Z.imag):
-            self.coordinates.append(p)
+        """
+        Z = np.asarray(Z)
+        zones = self.zones if zones is None else list(zones)
+        result = classify(Z, zones, t)
+        if result.zone.size == 0:
+            return result
+        self.extent.update(Z.real, Z.imag)
+
+        if colors is None:
+            colors = [f"C{i % 10}" for i in range(len(zones))]
+        colors = [*colors, outside_color]
+
+        zone = result.zone
+        change = np.flatnonzero(zone[1:] != zone[:-1])
+        if tolerance is not None:
+            keep = np.concatenate((change, change + 1))
+            idx = rdp(Z.real, Z.imag, tolerance, keep)
+            Z, zone = Z[idx], zone[idx]
+            change = np.flatnonzero(zone[1:] != zone[:-1])
+
+        # A line for each run of samples in the same zone. Each line ends at
+        # the first sample of the next run, so the trajectory is continuous.
+        starts = np.concatenate(([0], change + 1))
+        ends = np.append(change + 1, len(Z) - 1)
+        xy = np.column_stack((Z.real, Z.imag))
+        segments = [xy[i : j + 1] for i, j in zip(starts, ends)]
+
+        self.scene.lines(segments, colors=[colors[i] for i in zone[starts]], **kwargs)
+        return result
 
     def add_zone(self, zone: Polygon, **kwargs):
-        nplot(self.ax, *zone.exterior.xy, **kwargs)
+        nplot(self.scene, *zone.exterior.xy, **kwargs)
+        self.zones.append(zone)
 
-        for p in zip(*zone.exterior.xy):
-            self.coordinates.append(p)
+        self.extent.update(*zone.exterior.xy)
 
-    def _get_rmax(self, scale: float = 1.1):
+    def _get_rmax(self, scale: float = 1.1, percentile: float = None):
         """
         Method to return 110% of the maximum x and y values use for the plot.
         This value can be used to set the x and y plot limit for the plot
@@ -339,12 +605,12 @@ class ComplexPlot(ABC):
             Maximum x/y value used in the plot times 110% (default).
         scale
             Set the scale that x/y value is multiplied with. The default is 1.1.
+        percentile
+            Use the given percentile (0-100) of the absolute x/y values
+            instead of the maximum. The default is None.
 
         """
-        xmax = max(map(abs, [x for x, y in self.coordinates]))
-        ymax = max(map(abs, [y for x, y in self.coordinates]))
-
-        return max(xmax, ymax) * scale
+        return self.extent.absmax("xy", percentile) * scale
 
     def _get_xmax(self, scale: float = 1.1):
         """
@@ -360,9 +626,7 @@ class ComplexPlot(ABC):
             Set the scale that x value is multiplied with. The default is 1.1.
 
         """
-        xmax = max(map(abs, [x for x, y in self.coordinates]))
-
-        return xmax * scale
+        return self.extent.absmax("x") * scale
 
     def _get_ymax(self, scale: float = 1.1):
         """
@@ -378,9 +642,7 @@ class ComplexPlot(ABC):
             Set the scale that x value is multiplied with. The default is 1.1.
 
         """
-        ymax = max(map(abs, [y for x, y in self.coordinates]))
-
-        return ymax * scale
+        return self.extent.absmax("y") * scale
 
     def show(self, post_actions = True):
         """
@@ -391,12 +653,20 @@ class ComplexPlot(ABC):
         None.
 
         """
+        import matplotlib.pyplot as plt
+
         if post_actions:
             self._post_actions()
 
+        self.scene.flush(self._ax)
         self.ax.overwrite()
         plt.show()
 
+    def _render(self):
+        self._post_actions()
+        self.scene.flush(self._ax)
+        self.ax.overwrite()
+
     ##########################################################################
     @abstractmethod
     def _layout(self):
@@ -0,0 +1,393 @@
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+from psp.plotting.status import StatusMatrix
+
+# Data type of the analog values for each binary file type
+ANALOG_DTYPES = {"BINARY": "<i2", "BINARY32": "<i4", "FLOAT32": "<f4"}
+
+
+class Comtrade:
+    """
+    A class to read COMTRADE records (IEEE C37.111) without parsing the data
+    file up front.
+
+    Binary data files are memory-mapped with a structured dtype, so opening a
+    record only reads the configuration file. Channels and time windows are
+    read when requested, and raw analog channels are zero-copy views into the
+    file. ASCII data files are parsed on first access.
+
+    The object has the attributes used by BinaryPlot.add_binary (time,
+    trigger_time and status_channel_ids) and can be passed directly to it.
+
+    Attributes
+    ----------
+    station_name : str
+        Name of the substation.
+    rec_dev_id : str
+        Identification of the recording device.
+    rev_year : str
+        Revision year of the COMTRADE standard.
+    analog_channel_ids : list
+        Name of each analog channel.
+    analog_units : list
+        Unit of each analog channel.
+    status_channel_ids : list
+        Name of each status channel.
+    frequency : float
+        Nominal line frequency.
+    sample_rates : list
+        List of (sample rate, last sample number) tuples.
+    start : datetime | None
+        Time of the first sample.
+    trigger : datetime | None
+        Time of the trigger.
+    file_type : str
+        Format of the data file e.g. 'BINARY' or 'ASCII'.
+    timemult : float
+        Multiplication factor for the time stamps.
+    """
+
+    def __init__(self, cfg_path, dat_path=None):
+        """
+        Constructs all the necessary attributes for the Comtrade object.
+
+        Parameters
+        ----------
+        cfg_path : str | path-like
+            Path to the configuration (.cfg) file.
+        dat_path : str | path-like, optional
+            Path to the data (.dat) file. The default is None resulting in
+            the .cfg path with the suffix .dat.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.cfg_path = Path(cfg_path)
+        if dat_path is None:
+            suffix = ".DAT" if self.cfg_path.suffix.isupper() else ".dat"
+            dat_path = self.cfg_path.with_suffix(suffix)
+        self.dat_path = Path(dat_path)
+        self._data = None
+
+        self._read_cfg()
+
+    def _read_cfg(self):
+        with open(self.cfg_path, encoding="latin-1") as f:
+            lines = [line.strip() for line in f]
+        rows = iter([cell.strip() for cell in line.split(",")] for line in lines)
+
+        header = next(rows)
+        self.station_name = header[0]
+        self.rec_dev_id = header[1] if len(header) > 1 else ""
+        self.rev_year = header[2] if len(header) > 2 else "1991"
+
+        counts = next(rows)
+        n_analog = int(counts[1].rstrip("Aa"))
+        n_status = int(counts[2].rstrip("Dd"))
+
+        self.analog_channel_ids = []
+        self.analog_units = []
+        a, b = [], []
+        for _ in range(n_analog):
+            row = next(rows)
+            self.analog_channel_ids.append(row[1])
+            self.analog_units.append(row[4])
+            a.append(float(row[5]))
+            b.append(float(row[6]))
+        self._a = np.array(a)
+        self._b = np.array(b)
+
+        self.status_channel_ids = [next(rows)[1] for _ in range(n_status)]
+
+        self.frequency = float(next(rows)[0])
+        n_rates = int(next(rows)[0])
+        self.sample_rates = [
+            (float(row[0]), int(row[1]))
+            for row in (next(rows) for _ in range(max(n_rates, 1)))
+        ]
+        if n_rates == 0:
+            self.sample_rates = [(0.0, self.sample_rates[0][1])]
+
+        self.start = _parse_datetime(next(rows))
+        self.trigger = _parse_datetime(next(rows))
+        self.file_type = next(rows, ["ASCII"])[0].upper()
+        timemult = next(rows, ["1"])[0]
+        self.timemult = float(timemult) if timemult else 1.0
+
+    ##########################################################################
+    # data file
+    ##########################################################################
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Structured data type of a sample in a binary data file"""
+        return np.dtype(
+            [
+                ("sample", "<u4"),
+                ("timestamp", "<u4"),
+                ("analog", ANALOG_DTYPES[self.file_type], (self.n_analog,)),
+                ("status", "<u2", (-(-self.n_status // 16),)),
+            ]
+        )
+
+    @property
+    def data(self) -> np.ndarray:
+        """The data file as a structured memmap (binary) or array (ASCII)"""
+        if self._data is None:
+            if self.file_type == "ASCII":
+                self._data = np.loadtxt(
+                    self.dat_path, delimiter=",", ndmin=2, encoding="latin-1"
+                )
+            else:
+                n = self.dat_path.stat().st_size // self.dtype.itemsize
+                if self.sample_rates[-1][1] > 0:
+                    n = min(n, self.sample_rates[-1][1])
+                self._data = np.memmap(self.dat_path, self.dtype, mode="r", shape=(n,))
+        return self._data
+
+    def close(self):
+        """Method to release the data file"""
+        self._data = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    ##########################################################################
+    # time
+    ##########################################################################
+
+    @property
+    def n_analog(self) -> int:
+        return len(self.analog_channel_ids)
+
+    @property
+    def n_status(self) -> int:
+        return len(self.status_channel_ids)
+
+    @property
+    def n_samples(self) -> int:
+        return len(self.data)
+
+    @property
+    def trigger_time(self) -> float:
+        """Time of the trigger relative to the first sample in seconds"""
+        if self.start is None or self.trigger is None:
+            return 0.0
+        return (self.trigger - self.start).total_seconds()
+
+    @property
+    def time(self) -> np.ndarray:
+        """Time of each sample relative to the first sample in seconds"""
+        return self.get_time()
+
+    def window_slice(self, window: tuple = None) -> slice:
+        """
+        Method to find the samples within a time window.
+
+        Parameters
+        ----------
+        window : tuple, optional
+            Tuple (t0, t1) with the start and end time in seconds relative to
+            the first sample. The default is None resulting in all samples.
+
+        Returns
+        -------
+        slice
+            Slice of the samples within the window.
+
+        """
+        if window is None:
+            return slice(0, self.n_samples)
+
+        t0, t1 = window
+        if len(self.sample_rates) == 1 and self.sample_rates[0][0] > 0:
+            # Constant sample rate. No need to read the time stamps.
+            rate = self.sample_rates[0][0]
+            start = int(np.ceil(round(t0 * rate, 9)))
+            stop = int(np.floor(round(t1 * rate, 9))) + 1
+        else:
+            time = self.get_time()
+            start = np.searchsorted(time, t0, side="left")
+            stop = np.searchsorted(time, t1, side="right")
+        return slice(min(max(start, 0), self.n_samples), min(max(stop, 0), self.n_samples))
+
+    def get_time(self, window: tuple = None) -> np.ndarray:
+        """
+        Method to return the time of the samples within a time window.
+
+        Parameters
+        ----------
+        window : tuple, optional
+            Tuple (t0, t1) with the start and end time in seconds.
+            The default is None resulting in all samples.
+
+        Returns
+        -------
+        np.ndarray
+            Time in seconds relative to the first sample.
+
+        """
+        sl = self.window_slice(window)
+        if self.sample_rates[0][0] <= 0:
+            # No sample rates. Use the time stamps (in microseconds).
+            if self.file_type == "ASCII":
+                timestamp = self.data[sl, 1]
+            else:
+                timestamp = self.data["timestamp"][sl]
+            return timestamp * (self.timemult * 1e-6)
+
+        rates = np.array([rate for rate, _ in self.sample_rates])
+        ends = np.array([end for _, end in self.sample_rates])
+        starts = np.concatenate(([0], ends[:-1]))
+        offsets = np.concatenate(([0], np.cumsum((ends - starts)[:-1] / rates[:-1])))
+
+        samples = np.arange(sl.start, sl.stop)
+        segment = np.minimum(np.searchsorted(ends, samples, side="right"), len(ends) - 1)
+        return offsets[segment] + (samples - starts[segment]) / rates[segment]
+
+    ##########################################################################
+    # channels
+    ##########################################################################
+
+    def _analog_index(self, channel: int | str) -> int:
+        if isinstance(channel, str):
+            return self.analog_channel_ids.index(channel)
+        return channel
+
+    def _status_index(self, channel: int | str) -> int:
+        if isinstance(channel, str):
+            return self.status_channel_ids.index(channel)
+        return channel
+
+    def get_analog(
+        self, channel: int | str, window: tuple = None, raw: bool = False
+    ) -> np.ndarray:
+        """
+        Method to read an analog channel.
+
+        Parameters
+        ----------
+        channel : int | str
+            Index or name of the channel.
+        window : tuple, optional
+            Tuple (t0, t1) with the start and end time in seconds.
+            The default is None resulting in all samples.
+        raw : bool, optional
+            Return the unscaled values as a zero-copy view of the data file.
+            The default is False resulting in the values scaled with the
+            channel multiplier and offset.
+
+        Returns
+        -------
+        np.ndarray
+            Values of the channel.
+
+        """
+        i = self._analog_index(channel)
+        sl = self.window_slice(window)
+        if self.file_type == "ASCII":
+            values = self.data[sl, 2 + i]
+        else:
+            values = self.data["analog"][sl, i]
+
+        if raw:
+            return values
+        return values * self._a[i] + self._b[i]
+
+    def get_analogs(self, channels: list = None, samples: slice = None) -> np.ndarray:
+        """
+        Method to read several analog channels at once.
+
+        Parameters
+        ----------
+        channels : list, optional
+            Index or name of the channels. The default is None resulting in
+            all channels.
+        samples : slice, optional
+            The samples to read e.g. from window_slice. The default is None
+            resulting in all samples.
+
+        Returns
+        -------
+        np.ndarray
+            Scaled values with the shape (samples, channels).
+
+        """
+        if channels is None:
+            idx = np.arange(self.n_analog)
+        else:
+            idx = np.array([self._analog_index(c) for c in channels], dtype=int)
+        if samples is None:
+            samples = slice(0, self.n_samples)
+
+        if self.file_type == "ASCII":
+            values = self.data[samples][:, 2 + idx]
+        else:
+            values = self.data["analog"][samples][:, idx]
+        return values * self._a[idx] + self._b[idx]
+
+    def get_status(self, channels: list = None, window: tuple = None) -> StatusMatrix:
+        """
+        Method to read status channels as a bit-packed StatusMatrix.
+
+        Parameters
+        ----------
+        channels : list, optional
+            Index or name of the channels. The default is None resulting in
+            all channels.
+        window : tuple, optional
+            Tuple (t0, t1) with the start and end time in seconds.
+            The default is None resulting in all samples.
+
+        Returns
+        -------
+        StatusMatrix
+            The status channels. The time of the matrix is relative to the
+            first sample of the record.
+
+        """
+        if channels is None:
+            idx = np.arange(self.n_status)
+        else:
+            idx = np.array([self._status_index(c) for c in channels], dtype=int)
+        sl = self.window_slice(window)
+
+        if self.file_type == "ASCII":
+            status = self.data[sl, 2 + self.n_analog + idx].T
+        else:
+            # Each sample has the status channels packed in 16 bit words
+            words = self.data["status"][sl][:, idx // 16]
+            status = ((words >> (idx % 16).astype(np.uint16)) & 1).T
+
+        return StatusMatrix.from_array(
+            status,
+            [self.status_channel_ids[i] for i in idx],
+            self.get_time(window),
+            self.trigger_time,
+        )
+
+
+def _parse_datetime(row: list) -> datetime | None:
+    """Function to parse a date and time from a COMTRADE configuration file"""
+    if len(row) < 2 or not row[0]:
+        return None
+    date, time = row[0], row[1]
+    if "." in time:
+        # Fractions of seconds can have up to 9 digits
+        time, fraction = time.split(".")
+        time = f"{time}.{fraction[:6]:0<6}"
+    else:
+        time = f"{time}.000000"
+
+    for fmt in ("%d/%m/%Y", "%m/%d/%y"):
+        try:
+            return datetime.strptime(f"{date} {time}", f"{fmt} %H:%M:%S.%f")
+        except ValueError:
+            continue
+    return None
@@ -0,0 +1,142 @@
+from typing import Iterable
+import numpy as np
+
+
+# Below this number of segments they are refined one at a time
+BATCH_SEGMENTS = 32
+
+
+def _distance(x, y, a, b, p):
+    """Function to calculate the distance from points p to the segments a-b"""
+    dx, dy = x[b] - x[a], y[b] - y[a]
+    px, py = x[p] - x[a], y[p] - y[a]
+    # The projection is clamped to the segment, so a curve going back and
+    # forth along the segment is not dropped. Closed segments (a = b) use
+    # the distance to the point.
+    length2 = dx * dx + dy * dy
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t = np.clip((px * dx + py * dy) / length2, 0, 1)
+    t = np.where(length2 > 0, t, 0)
+    return np.hypot(px - t * dx, py - t * dy)
+
+
+def rdp(x: Iterable, y: Iterable, tolerance: float, keep: Iterable = None) -> np.ndarray:
+    """
+    Function to decimate a curve with the Ramer-Douglas-Peucker algorithm.
+
+    Once the curve is split into many segments, all segments are refined in a
+    single vectorized pass, so the number of Python iterations is given by
+    the depth of the refinement rather than by the number of points kept.
+
+    Points with NaN coordinates are gaps in the curve. Each run of finite
+    points is decimated separately, and the ends of each gap are kept so the
+    gaps remain in the decimated curve.
+
+    Parameters
+    ----------
+    x : Iterable
+        x-coordinates of the curve.
+    y : Iterable
+        y-coordinates of the curve.
+    tolerance : float
+        Maximum distance in data units between the original curve and the
+        decimated curve.
+    keep : Iterable, optional
+        Index of points which must be kept e.g. where the curve enters a zone.
+        The first and last point are always kept. The default is None.
+
+    Returns
+    -------
+    np.ndarray
+        Sorted index of the points to keep.
+
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n <= 2:
+        return np.arange(n)
+
+    kept = np.zeros(n, dtype=bool)
+    kept[[0, -1]] = True
+    if keep is not None:
+        kept[np.asarray(keep, dtype=np.intp)] = True
+
+    # Keep the ends of each run of finite points and of each gap, so no
+    # segment spans a gap
+    finite = np.isfinite(x) & np.isfinite(y)
+    change = np.flatnonzero(finite[1:] != finite[:-1])
+    kept[change] = True
+    kept[change + 1] = True
+
+    idx = np.flatnonzero(kept)
+    a, b = idx[:-1], idx[1:]
+    within = finite[a] & finite[b]
+    a, b = a[within], b[within]
+
+    while True:
+        inner = b - a > 1
+        a, b = a[inner], b[inner]
+        if a.size == 0:
+            break
+
+        if a.size < BATCH_SEGMENTS:
+            split, k = [], []
+            for i, j in zip(a, b):
+                d = _distance(x, y, i, j, np.arange(i + 1, j))
+                m = np.argmax(d)
+                split.append(d[m] > tolerance)
+                k.append(i + 1 + m)
+            split, k = np.array(split), np.array(k)
+        else:
+            counts = b - a - 1
+            offsets = np.concatenate(([0], np.cumsum(counts)))
+            points = np.arange(offsets[-1]) + np.repeat(a + 1 - offsets[:-1], counts)
+            d = _distance(x, y, np.repeat(a, counts), np.repeat(b, counts), points)
+            dmax = np.maximum.reduceat(d, offsets[:-1])
+
+            # First point with the maximum distance in each segment
+            group = np.repeat(np.arange(a.size), counts)
+            first = np.flatnonzero(d == dmax[group])
+            first = first[np.diff(group[first], prepend=-1) != 0]
+            split, k = dmax > tolerance, points[first]
+
+        k = k[split]
+        kept[k] = True
+        a, b = np.concatenate((a[split], k)), np.concatenate((k, b[split]))
+
+    return np.flatnonzero(kept)
+
+
+def zone_crossings(x: Iterable, y: Iterable, zones: Iterable) -> np.ndarray:
+    """
+    Function to find the points where a curve enters or leaves a zone.
+
+    Parameters
+    ----------
+    x : Iterable
+        x-coordinates of the curve.
+    y : Iterable
+        y-coordinates of the curve.
+    zones : Iterable
+        Iterable of shapely polygons.
+
+    Returns
+    -------
+    np.ndarray
+        Sorted index of the points just before and after each crossing.
+
+    """
+    import shapely
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    idx = []
+    for zone in zones:
+        inside = shapely.contains_xy(zone, x, y)
+        change = np.flatnonzero(inside[1:] != inside[:-1])
+        idx.extend([change, change + 1])
+
+    if not idx:
+        return np.empty(0, dtype=np.intp)
+    return np.unique(np.concatenate(idx))
@@ -1,17 +1,187 @@
+from __future__ import annotations
 from psp.plotting.complex_plot import ComplexPlot
-from psp.plotting.plotfunc import plot_quiver, center_axis
-import matplotlib.pyplot as plt
+from psp.plotting.animation import save_trajectory_animation, ANIMATION_FPS
+from psp.plotting.plotfunc import center_axis
+from psp.plotting.comtrade import Comtrade
+from psp.plotting.envelope import EnvelopePyramid
+from psp.plotting.extent import Extent
+from psp.plotting.pq_plot import zone_samples, map_PQ
+from psp.plotting.sweep import SweepResult
+from psp.plotting.zones import Overlaps
+from typing import Iterable, TYPE_CHECKING
+import numpy as np
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection, PolyCollection
+    from matplotlib.image import AxesImage
+    from matplotlib.lines import Line2D
+    from shapely.geometry import Polygon
 
 
 class RXplot(ComplexPlot):
     """A class for creating a complex plot."""
 
-    def __init__(self, title: str, ax: plt.Axes = None,  figsize: tuple = (8, 8)):
-        super().__init__(title, ax=ax, figsize=figsize)
+    def __init__(
+        self,
+        title: str,
+        ax: plt.Axes = None,
+        figsize: tuple = (8, 8),
+        headless: bool = False,
+    ):
+        super().__init__(title, ax=ax, figsize=figsize, headless=headless)
 
-    def autoscale(self):
-        self.ax.set_xlim([- self._get_rmax(), self._get_rmax()])
-        self.ax.set_ylim([- self._get_rmax(), self._get_rmax()])
+    def add_reach(
+        self,
+        result: SweepResult,
+        mode: str = "heatmap",
+        zone: int = None,
+        bins: int = 400,
+        colors: list = None,
+        **kwargs,
+    ) -> AxesImage:
+        """
+        Method to add the result of a fault sweep as a single image.
+
+        Parameters
+        ----------
+        result : SweepResult
+            Result of FaultSweep.evaluate.
+        mode : str, optional
+            "heatmap" for the fraction of the faults in each pixel detected by
+            the zone. "scatter" for the first zone detecting any fault in each
+            pixel. The default is "heatmap".
+        zone : int, optional
+            Index of the zone for the heatmap. The default is None resulting
+            in any zone.
+        bins : int, optional
+            Number of pixels along each axis. The default is 400.
+        colors : list, optional
+            Color of each zone followed by the color for no operation in the
+            scatter mode. The default is None resulting in the colors of the
+            property cycle and red.
+        **kwargs : N/A
+            Additional arguments can be added for the underlying ax.imshow
+            object e.g. cmap for the heatmap.
+
+        Returns
+        -------
+        AxesImage
+            The image.
+
+        """
+        from matplotlib.image import AxesImage
+
+        image, extent = result.raster(mode, zone, bins)
+        self.extent.update(extent[:2], extent[2:])
+
+        if mode == "scatter":
+            from matplotlib.colors import ListedColormap
+
+            if colors is None:
+                colors = [f"C{i % 10}" for i in range(result.n_zones)] + ["red"]
+            kwargs.setdefault("cmap", ListedColormap(colors))
+            kwargs.setdefault("vmin", -0.5)
+            kwargs.setdefault("vmax", result.n_zones + 0.5)
+        else:
+            kwargs.setdefault("cmap", "RdYlGn")
+            kwargs.setdefault("vmin", 0)
+            kwargs.setdefault("vmax", 1)
+
+        kwargs.setdefault("interpolation", "nearest")
+        kwargs.setdefault("zorder", 0)
+        vmin, vmax = kwargs.pop("vmin"), kwargs.pop("vmax")
+        artist = AxesImage(self._ax, extent=extent, origin="lower", **kwargs)
+        artist.set_data(image)
+        artist.set_clim(vmin, vmax)
+        self.ax.add_image(artist)
+        return artist
+
+    def add_overlaps(self, overlaps: Overlaps, **kwargs) -> PolyCollection:
+        """
+        Method to highlight the overlap regions of zones as a single
+        collection.
+
+        Parameters
+        ----------
+        overlaps : Overlaps
+            Overlapping zones e.g. from ZoneRegistry.overlaps.
+        **kwargs : N/A
+            Additional arguments can be added for the underlying
+            PolyCollection object.
+
+        Returns
+        -------
+        PolyCollection
+            A polygon for each part of the overlap regions.
+
+        """
+        import shapely
+        from matplotlib.collections import PolyCollection
+
+        parts = shapely.get_parts(overlaps.geometry)
+        parts = parts[shapely.get_type_id(parts) == shapely.GeometryType.POLYGON]
+        xy, index = shapely.get_coordinates(
+            shapely.get_exterior_ring(parts), return_index=True
+        )
+        polygons = np.split(xy, np.flatnonzero(np.diff(index)) + 1) if len(xy) else []
+        if len(xy):
+            self.extent.update(xy[:, 0], xy[:, 1])
+
+        kwargs.setdefault("facecolor", "red")
+        kwargs.setdefault("edgecolor", "darkred")
+        kwargs.setdefault("alpha", 0.4)
+        collection = PolyCollection(polygons, **kwargs)
+        self.ax.add_collection(collection)
+        return collection
+
+    def save_animation(
+        self,
+        path: str,
+        Z: Iterable[complex],
+        frames: int = None,
+        fps: float = ANIMATION_FPS,
+        workers: int = None,
+        **kwargs,
+    ) -> list:
+        """
+        Method to save an animation of an impedance trajectory entering the
+        zones. The zones, limits, angles and axes of the plot are drawn once
+        and each frame only adds the new part of the trajectory and the
+        current point. See save_trajectory_animation.
+
+        Parameters
+        ----------
+        path : str
+            Output file: '.gif' (Pillow), '.mp4' (needs ffmpeg) or an image
+            sequence e.g. 'frames/{:04d}.png'.
+        Z : Iterable[complex]
+            The impedance samples.
+        frames : int, optional
+            Number of frames. The default is None resulting in one frame per
+            sample and at most 1000 frames.
+        fps : float, optional
+            Frames per second. The default is 25.
+        workers : int, optional
+            Number of processes rendering frames. The default is None
+            resulting in the number of CPUs.
+        **kwargs : N/A
+            Additional arguments for the line of the trajectory.
+
+        Returns
+        -------
+        list
+            The written files.
+
+        """
+        return save_trajectory_animation(
+            self, path, Z, frames=frames, fps=fps, workers=workers, **kwargs
+        )
+
+    def autoscale(self, percentile: float = None):
+        rmax = self._get_rmax(percentile=percentile)
+        self.ax.set_xlim([-rmax, rmax])
+        self.ax.set_ylim([-rmax, rmax])
 
     def _post_actions(self):
         self.ax.legend()
@@ -26,8 +196,16 @@ class RXplot(ComplexPlot):
 class PolarPlot(ComplexPlot):
     """A class for creating a phasor plot using a polar projection."""
 
-    def __init__(self, title: str, ax: plt.Axes = None, figsize: tuple = (8, 8)):
-        super().__init__(title=title, ax=ax, figsize=figsize, projection="polar")
+    def __init__(
+        self,
+        title: str,
+        ax: plt.Axes = None,
+        figsize: tuple = (8, 8),
+        headless: bool = False,
+    ):
+        super().__init__(
+            title=title, ax=ax, figsize=figsize, projection="polar", headless=headless
+        )
 
     def add_phasor(
         self,
@@ -37,20 +215,20 @@ class PolarPlot(ComplexPlot):
         color: str = None,
         **kwargs,
     ):
-        plot_quiver(
-            ax=self._ax,
-            phasor=value,
-            ref=ref,
-            color=color,
-            text=name,
-            polar=True,
-            alpha=0.7,
-            **kwargs,
-        )
-        self.coordinates.append((value.real, value.imag))
+        super().add_phasor(value, ref, name, color, polar=True, **kwargs)
 
-    def autoscale(self):
-        self.ax.set_rlim(0, self._get_rmax())
+    def add_phasors(
+        self,
+        values: Iterable[complex],
+        refs: Iterable = None,
+        names: Iterable[str] = None,
+        colors=None,
+        **kwargs,
+    ):
+        super().add_phasors(values, refs, names, colors, polar=True, **kwargs)
+
+    def autoscale(self, percentile: float = None):
+        self.ax.set_rlim(0, self._get_rmax(percentile=percentile))
 
     def _post_actions(self):
         self.ax.legend()
@@ -66,13 +244,20 @@ class PhasorPlot(ComplexPlot):
     The plot will have a centered x and y axis.
     """
 
-    def __init__(self, title: str, ax: plt.Axes = None, figsize: tuple = (8, 8)):
-        super().__init__(title=title, ax=ax, figsize=figsize)
+    def __init__(
+        self,
+        title: str,
+        ax: plt.Axes = None,
+        figsize: tuple = (8, 8),
+        headless: bool = False,
+    ):
         self.opt_center_axis = True
+        super().__init__(title=title, ax=ax, figsize=figsize, headless=headless)
 
-    def autoscale(self):
-        self.ax.set_xlim([-self._get_rmax(), self._get_rmax()])
-        self.ax.set_ylim([-self._get_rmax(), self._get_rmax()])
+    def autoscale(self, percentile: float = None):
+        rmax = self._get_rmax(percentile=percentile)
+        self.ax.set_xlim([-rmax, rmax])
+        self.ax.set_ylim([-rmax, rmax])
 
     def _post_actions(self):
         self.ax.legend()
@@ -81,19 +266,300 @@ class PhasorPlot(ComplexPlot):
     def _layout(self):
 
         self.ax.set_aspect("equal", "box")
-        self.grid(color="lightgrey", linestyle="-")
+        self.ax.grid(color="lightgrey", linestyle="-")
 
-        self.set_xlabel("Re", fontweight="bold")
-        self.set_ylabel("Im", fontweight="bold", rotation=0)
+        self.ax.set_xlabel("Re", fontweight="bold")
+        self.ax.set_ylabel("Im", fontweight="bold", rotation=0)
 
         if self.opt_center_axis:
-            center_axis(ax)
+            center_axis(self._ax)
+
+class PQPlot(ComplexPlot):
+    """
+    A class for creating a PQ plot with distance zones mapped from the RX
+    plane, e.g. for load encroachment studies.
+
+    The zones of each relay are drawn as a single LineCollection. The mapped
+    zones are cached by (polygon, Un), so changing the voltage with
+    set_voltage only maps the new voltages and updates the collections.
+    """
+
+    def __init__(
+        self,
+        title: str,
+        ax: plt.Axes = None,
+        figsize: tuple = (8, 8),
+        n: int = 1000,
+        rel_tol: float = 0.02,
+        headless: bool = False,
+    ):
+        """
+        Parameters
+        ----------
+        n : int, optional
+            Number of equally spaced samples along the exterior of each zone
+            before the adaptive refinement. The default is 1000.
+        rel_tol : float, optional
+            Maximum step between two samples relative to their distance to the
+            origin. The default is 0.02.
+
+        See ComplexPlot for the other parameters.
+        """
+        self.n = n
+        self.rel_tol = rel_tol
+        self.relays = {}
+        self._samples = {}
+        self._mapped = {}
+        super().__init__(title, ax=ax, figsize=figsize, headless=headless)
+
+    def add_zones(
+        self,
+        zones: Polygon | Iterable[Polygon],
+        Un: float | Iterable,
+        relay: str = None,
+        **kwargs,
+    ) -> LineCollection:
+        """
+        Method to map the zones of a relay to the PQ plane and add them to
+        the plot as a single LineCollection.
+
+        Parameters
+        ----------
+        zones : Polygon | Iterable[Polygon]
+            The zones of the relay in the RX plane (Ohm).
+        Un : float | Iterable
+            Voltage (V) or an array of voltages to map the zones for.
+        relay : str, optional
+            Name of the relay used for the legend. Adding zones to an
+            existing relay replaces its zones. The default is None resulting
+            in "Relay <number>".
+        **kwargs : N/A
+            Additional arguments for the LineCollection e.g. color.
+
+        Returns
+        -------
+        LineCollection
+            The collection with a line for each zone and voltage.
+
+        """
+        from matplotlib.collections import LineCollection
+
+        if relay is None:
+            relay = f"Relay {len(self.relays) + 1}"
+        zones = [zones] if hasattr(zones, "exterior") else list(zones)
+        Un = np.atleast_1d(np.asarray(Un, dtype=float))
+
+        segments = self._map(zones, Un)
+        if relay in self.relays:
+            collection = self.relays[relay][2]
+            collection.set_segments(segments)
+            collection.set(**kwargs)
+        else:
+            kwargs.setdefault("label", relay)
+            kwargs.setdefault("color", f"C{len(self.relays) % 10}")
+            collection = LineCollection(segments, **kwargs)
+            self.ax.add_collection(collection)
+        self.relays[relay] = (zones, Un, collection)
+        return collection
+
+    def set_voltage(self, Un: float | Iterable, relay: str = None):
+        """
+        Method to change the voltage of the mapped zones. Only voltages not
+        mapped before are calculated and the existing collections are
+        updated in place.
+
+        Parameters
+        ----------
+        Un : float | Iterable
+            Voltage (V) or an array of voltages.
+        relay : str, optional
+            Name of the relay to change. The default is None resulting in all
+            relays.
+
+        Returns
+        -------
+        None.
+
+        """
+        Un = np.atleast_1d(np.asarray(Un, dtype=float))
+        names = list(self.relays) if relay is None else [relay]
+        zones = [zone for name in names for zone in self.relays[name][0]]
+        segments = self._map(zones, Un)
+
+        start = 0
+        for name in names:
+            relay_zones, _, collection = self.relays[name]
+            stop = start + len(relay_zones) * len(Un)
+            collection.set_segments(segments[start:stop])
+            self.relays[name] = (relay_zones, Un, collection)
+            start = stop
+
+    def _map(self, zones: list, Un: np.ndarray) -> list[np.ndarray]:
+        """
+        Method to return the mapped (P, Q) coordinates of each zone at each
+        voltage. The missing mappings are calculated in one batched pass.
+        """
+        new = list({zone: None for zone in zones if zone not in self._samples})
+        if new:
+            self._samples.update(zip(new, zone_samples(new, self.n, self.rel_tol)))
+
+        missing = list(
+            {zone: None for zone in zones for u in Un if (zone, u) not in self._mapped}
+        )
+        if missing:
+            S = map_PQ([self._samples[zone] for zone in missing], Un)
+            for zone, s in zip(missing, S):
+                for u, row in zip(Un, s):
+                    self._mapped[(zone, u)] = np.column_stack((row.real, row.imag))
+
+        return [self._mapped[(zone, u)] for zone in zones for u in Un]
+
+    def autoscale(self, percentile: float = None):
+        # Edges close to the origin are mapped far away, so only the mapped
+        # vertices of the zones are considered.
+        extent = Extent()
+        for zones, Un, _ in self.relays.values():
+            for zone in zones:
+                vertices = np.array([complex(x, y) for x, y in zone.exterior.coords])
+                S = map_PQ([vertices[vertices != 0]], Un)[0]
+                extent.update(S.real, S.imag)
+
+        rmax = self._get_rmax(percentile=percentile)
+        if extent.count:
+            rmax = max(rmax, extent.absmax("xy", percentile) * 1.1)
+        self.ax.set_xlim([-rmax, rmax])
+        self.ax.set_ylim([-rmax, rmax])
+
+    def _post_actions(self):
+        self.ax.legend()
+        self.autoscale()
+
+    def _layout(self):
+        self.ax.set_xlabel(r"$P\;[MW]$")
+        self.ax.set_ylabel(r"$Q\;[Mvar]$")
+        self.ax.grid(True)
+
 
 class TimeSeriesPlot(ComplexPlot):
     """A class for creating a time series plot."""
 
-    def __init__(self, title: str, ax: plt.Axes = None, figsize: tuple = (8, 8)):
-        super().__init__(title, ax=ax, figsize=figsize)
+    def __init__(
+        self,
+        title: str,
+        ax: plt.Axes = None,
+        figsize: tuple = (8, 8),
+        headless: bool = False,
+    ):
+        self.waveforms = []
+        self._xlim_callback = None
+        super().__init__(title, ax=ax, figsize=figsize, headless=headless)
+
+    def add_waveform(self, x: Iterable, y: Iterable, **kwargs) -> Line2D | None:
+        """
+        Method to add a long waveform drawn as a min/max envelope.
+
+        The samples are stored once in an EnvelopePyramid. The line only has
+        about two points per pixel of the axes, and it is recomputed from the
+        pyramid when the x limits change. Zooming in therefore shows more
+        detail down to the samples, and peaks are never hidden.
+
+        Parameters
+        ----------
+        x : Iterable
+            Sorted x-values (time) of the samples.
+        y : Iterable
+            Values of the samples.
+        **kwargs : N/A
+            Additional arguments can be added for the underlying Line2D
+            object.
+
+        Returns
+        -------
+        Line2D | None
+            The line of the envelope or None if there are no samples.
+
+        """
+        from matplotlib.lines import Line2D
+
+        pyramid = EnvelopePyramid(x, y)
+        if len(pyramid.x) == 0:
+            return None
+
+        kwargs.setdefault("color", f"C{len(self.waveforms) % 10}")
+        line = Line2D(
+            *pyramid.query(pyramid.x[0], pyramid.x[-1], self._pixel_width()),
+            **kwargs,
+        )
+        self.ax.add_line(line)
+        self.waveforms.append((pyramid, line))
+
+        if self._xlim_callback is None:
+            self._xlim_callback = self._ax.callbacks.connect(
+                "xlim_changed", self._update_waveforms
+            )
+        return line
+
+    def _pixel_width(self) -> int:
+        return max(int(self._ax.bbox.width), 1)
+
+    def _update_waveforms(self, ax):
+        x0, x1 = sorted(ax.get_xlim())
+        n = self._pixel_width()
+        for pyramid, line in self.waveforms:
+            line.set_data(*pyramid.query(x0, x1, n))
+
+    def add_analog(
+        self,
+        record: Comtrade,
+        channel: int | str,
+        window: tuple = None,
+        trigger_time_zero: bool = True,
+        envelope: bool = False,
+        **kwargs,
+    ):
+        """
+        Method to add an analog channel of a COMTRADE record to the plot.
+        Only the samples within the window are read from the record.
+
+        Parameters
+        ----------
+        record : Comtrade
+            The record to read the channel from.
+        channel : int | str
+            Index or name of the channel.
+        window : tuple, optional
+            Tuple (t0, t1) with the start and end time in seconds to plot.
+            The default is None resulting in the entire record.
+        trigger_time_zero : bool, optional
+            Shift the time so the trigger time is zero. This also applies to
+            the window. The default is True.
+        envelope : bool, optional
+            Draw the channel as a min/max envelope with add_waveform.
+            The default is False.
+        **kwargs : N/A
+            Additional arguments can be added for the underlying ax.plot
+            object.
+
+        Returns
+        -------
+        None.
+
+        """
+        offset = record.trigger_time if trigger_time_zero else 0.0
+        if window is not None:
+            window = (window[0] + offset, window[1] + offset)
+
+        time = record.get_time(window) - offset
+        values = record.get_analog(channel, window)
+
+        if isinstance(channel, str):
+            kwargs.setdefault("label", channel)
+        else:
+            kwargs.setdefault("label", record.analog_channel_ids[channel])
+        if envelope:
+            self.add_waveform(time, values, **kwargs)
+        else:
+            self.add_plot(time, values, **kwargs)
 
     def autoscale(self):
         self.ax.autoscale()
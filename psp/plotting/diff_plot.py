@@ -1,15 +1,18 @@
 from psp.plotting.complex_plot import ComplexPlot
 from psp.plotting.fakeax import FakeAx
+from psp.plotting.extent import Extent
+from psp.plotting.figure import FigureExport, create_figure
+from psp.plotting.scene import Scene
 from abc import ABC
-import matplotlib.pyplot as plt
 
 
-class DiffBiasPlot(ABC):
-    def __init__(self, title: str, figsize: tuple = (8, 8)):
+class DiffBiasPlot(FigureExport, ABC):
+    def __init__(self, title: str, figsize: tuple = (8, 8), headless: bool = False):
         self.title = title
-        self.coordinates = []
+        self.extent = Extent()
+        self.scene = Scene()
 
-        self.fig = plt.figure(figsize=figsize)
+        self.fig = create_figure(figsize=figsize, headless=headless)
         self._ax = self.fig.add_subplot(111)
         self._ax.set_title(self.title)
         self.ax = FakeAx(self._ax)
@@ -20,4 +23,8 @@ class DiffBiasPlot(ABC):
     _get_xmax = ComplexPlot._get_xmax
     _get_ymax = ComplexPlot._get_ymax
     show = ComplexPlot.show
+    _render = ComplexPlot._render
     _layout = ComplexPlot._layout
+
+    def _post_actions(self):
+        pass
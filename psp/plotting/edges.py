@@ -0,0 +1,186 @@
+from dataclasses import dataclass
+from functools import cached_property
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Edges:
+    """
+    A class with the rising and falling edges of a set of binary signals.
+
+    The edges are stored in a compressed sparse row (CSR) layout. The edges of
+    channel i are rising[offsets[i]:offsets[i + 1]] and
+    falling[offsets[i]:offsets[i + 1]], where each pair of rising and falling
+    edge is an interval where the signal is high (1).
+
+    Attributes
+    ----------
+    offsets : np.ndarray
+        Start of the edges of each channel. Has n_channels + 1 elements.
+    rising : np.ndarray
+        Index of the first high sample of each interval.
+    falling : np.ndarray
+        Index of the first low sample after each interval. Equal to n_samples
+        if the signal is high at the end of the record.
+    n_samples : int
+        Number of samples of the signals.
+    """
+
+    offsets: np.ndarray
+    rising: np.ndarray
+    falling: np.ndarray
+    n_samples: int
+
+    @property
+    def n_channels(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def counts(self) -> np.ndarray:
+        """Number of high intervals of each channel"""
+        return np.diff(self.offsets)
+
+    @property
+    def constant_zero(self) -> np.ndarray:
+        """Mask of the channels which are never high"""
+        return self.counts == 0
+
+    @property
+    def constant_one(self) -> np.ndarray:
+        """Mask of the channels which are high in the entire record"""
+        if len(self.rising) == 0:
+            return np.zeros(self.n_channels, dtype=bool)
+        first = np.minimum(self.offsets[:-1], len(self.rising) - 1)
+        return (
+            (self.counts == 1)
+            & (self.rising[first] == 0)
+            & (self.falling[first] == self.n_samples)
+        )
+
+    @property
+    def changed(self) -> np.ndarray:
+        """Mask of the channels which change during the record"""
+        return ~(self.constant_zero | self.constant_one)
+
+    def first_rising(self) -> np.ndarray:
+        """
+        Method to return the index of the first high sample of each channel.
+
+        Returns
+        -------
+        np.ndarray
+            Index of the first high sample or -1 for channels that are never
+            high.
+
+        """
+        first = np.full(self.n_channels, -1)
+        high = ~self.constant_zero
+        first[high] = self.rising[self.offsets[:-1][high]]
+        return first
+
+    def channel(self, i: int) -> tuple[np.ndarray, np.ndarray]:
+        """Method to return the rising and falling edges of channel i"""
+        sl = slice(self.offsets[i], self.offsets[i + 1])
+        return self.rising[sl], self.falling[sl]
+
+    def take(self, channels) -> "Edges":
+        """
+        Method to return the edges of a subset of the channels.
+
+        Parameters
+        ----------
+        channels : array_like
+            Index of the channels to keep in the given order.
+
+        Returns
+        -------
+        Edges
+            Edges of the selected channels.
+
+        """
+        channels = np.asarray(channels, dtype=np.intp)
+        starts = self.offsets[channels]
+        counts = self.offsets[channels + 1] - starts
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        idx = np.arange(offsets[-1]) + np.repeat(starts - offsets[:-1], counts)
+        return Edges(offsets, self.rising[idx], self.falling[idx], self.n_samples)
+
+    @cached_property
+    def _keys(self) -> tuple[np.ndarray, np.ndarray]:
+        # The edges are sorted by channel and then by sample, so a key of
+        # channel * (n_samples + 1) + sample is sorted for the whole array.
+        channel = np.repeat(np.arange(self.n_channels), self.counts)
+        base = channel * (self.n_samples + 1)
+        return base + self.rising, base + self.falling
+
+    def clip(self, start: int, stop: int) -> "Edges":
+        """
+        Method to return the edges within a window of samples.
+
+        The intervals overlapping the window are found with a binary search
+        for every channel, so the cost scales with the number of intervals
+        within the window rather than with the length of the record.
+
+        Parameters
+        ----------
+        start : int
+            Index of the first sample in the window.
+        stop : int
+            Index after the last sample in the window.
+
+        Returns
+        -------
+        Edges
+            Edges of the intervals clipped to the window. The sample indices
+            are relative to the start of the window.
+
+        """
+        start, stop = int(start), max(int(stop), int(start))
+        rising_keys, falling_keys = self._keys
+        base = np.arange(self.n_channels) * (self.n_samples + 1)
+
+        # Intervals ending after the start and beginning before the stop
+        first = np.searchsorted(falling_keys, base + start, side="right")
+        last = np.searchsorted(rising_keys, base + stop, side="left")
+        counts = np.maximum(last - first, 0) if stop > start else np.zeros_like(first)
+
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        idx = np.arange(offsets[-1]) + np.repeat(first - offsets[:-1], counts)
+        rising = np.maximum(self.rising[idx], start) - start
+        falling = np.minimum(self.falling[idx], stop) - start
+        return Edges(offsets, rising, falling, stop - start)
+
+
+def find_edges(status) -> Edges:
+    """
+    Function to find the edges of all binary signals in a single pass.
+
+    Parameters
+    ----------
+    status : array_like
+        Binary signals with the shape (channels, samples) e.g. record.status.
+        Any non-zero value is considered high.
+
+    Returns
+    -------
+    Edges
+        Rising and falling edges of all channels.
+
+    """
+    status = np.asarray(status)
+    if status.size == 0 and status.ndim < 2:
+        # A record without status channels
+        status = status.reshape(0, 0)
+    if status.ndim != 2:
+        raise ValueError("The status signals must have the shape (channels, samples)")
+    n_channels, n_samples = status.shape
+
+    # Pad with a low sample at both ends, so every channel has an even number
+    # of changes which are alternately rising and falling edges.
+    padded = np.zeros((n_channels, n_samples + 2), dtype=bool)
+    np.not_equal(status, 0, out=padded[:, 1:-1])
+    rows, cols = np.nonzero(padded[:, 1:] != padded[:, :-1])
+
+    counts = np.bincount(rows[::2], minlength=n_channels)
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+    return Edges(offsets, cols[::2], cols[1::2], n_samples)
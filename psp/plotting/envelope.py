@@ -0,0 +1,80 @@
+from typing import Iterable
+import numpy as np
+
+PYRAMID_FACTOR = 4  # Number of blocks merged into one on the next level
+PYRAMID_MIN_BLOCKS = 256  # No further levels below this number of blocks
+
+
+class EnvelopePyramid:
+    """
+    A class with min/max envelopes of a signal at multiple resolutions.
+
+    Level l holds the minimum and maximum of blocks of factor**l samples.
+    A query picks the coarsest level which still has a block per pixel, so
+    the number of points drawn is given by the width of the axes and not by
+    the number of samples, and the peaks are kept at any zoom level.
+
+    Attributes
+    ----------
+    x : np.ndarray
+        Sorted x-values (time) of the samples.
+    y : np.ndarray
+        Values of the samples.
+    factor : int
+        Block size ratio between two levels.
+    levels : list
+        Tuple (min, max) for each level. Level 0 is the samples.
+    """
+
+    def __init__(self, x: Iterable, y: Iterable, factor: int = PYRAMID_FACTOR):
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.factor = factor
+
+        self.levels = [(self.y, self.y)]
+        mins, maxs = self.y, self.y
+        while len(mins) > PYRAMID_MIN_BLOCKS * factor:
+            # fmin/fmax ignore nan values used for gaps in the data
+            starts = np.arange(0, len(mins), factor)
+            mins = np.fmin.reduceat(mins, starts)
+            maxs = np.fmax.reduceat(maxs, starts)
+            self.levels.append((mins, maxs))
+
+    def query(self, x0: float, x1: float, n: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Method to return the envelope between x0 and x1 for n pixels.
+
+        Parameters
+        ----------
+        x0, x1 : float
+            The visible range of x.
+        n : int
+            Number of pixels of the range.
+
+        Returns
+        -------
+        tuple
+            Tuple (x, y) to draw as a line. The samples are returned if there
+            are less than factor samples per pixel. Otherwise each block is a
+            vertical line from its minimum to its maximum.
+
+        """
+        # One sample outside the range on each side, so the line is continued
+        i0 = max(np.searchsorted(self.x, x0, side="left") - 1, 0)
+        i1 = min(np.searchsorted(self.x, x1, side="right") + 1, len(self.x))
+        count = i1 - i0
+
+        level, size = 0, 1
+        while level + 1 < len(self.levels) and size * self.factor * n <= count:
+            level += 1
+            size *= self.factor
+        if level == 0:
+            return self.x[i0:i1], self.y[i0:i1]
+
+        j0, j1 = i0 // size, -(-i1 // size)
+        mins, maxs = self.levels[level]
+        x = np.repeat(self.x[j0 * size : j1 * size : size], 2)
+        y = np.empty(len(x))
+        y[0::2] = mins[j0:j1]
+        y[1::2] = maxs[j0:j1]
+        return x, y
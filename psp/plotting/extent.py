@@ -0,0 +1,153 @@
+import numpy as np
+
+# Quantiles stored per chunk of data. The grid is denser in the upper tail as
+# this is where robust plot limits are taken from.
+SKETCH_QUANTILES = np.union1d(
+    np.linspace(0, 1, 33),
+    [0.9, 0.95, 0.98, 0.99, 0.995, 0.998, 0.999, 0.9995, 0.9999],
+)
+# Probability mass represented by each of the stored quantiles
+SKETCH_WEIGHTS = np.diff(SKETCH_QUANTILES, prepend=0, append=1)
+SKETCH_WEIGHTS = (SKETCH_WEIGHTS[:-1] + SKETCH_WEIGHTS[1:]) / 2
+MAX_SKETCHES = 64  # Sketches are merged into one when this number is exceeded
+
+
+class Extent:
+    """
+    A class to keep track of the extent of the data added to a plot.
+
+    The running minimum, maximum and absolute maximum of each axis are updated
+    with vectorized reductions every time data is added, so looking up the
+    extent is O(1) regardless of the number of points plotted. For robust
+    limits a small quantile sketch of the absolute values is stored for every
+    chunk of data instead of the raw points.
+
+    Attributes
+    ----------
+    count : int
+        Number of points added.
+    xmin, xmax, ymin, ymax : float
+        Minimum and maximum of the x and y values.
+    xabs, yabs : float
+        Maximum absolute x and y value.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.xmin = np.inf
+        self.xmax = -np.inf
+        self.ymin = np.inf
+        self.ymax = -np.inf
+        self.xabs = 0.0
+        self.yabs = 0.0
+        self._sketches = []
+
+    def update(self, x, y):
+        """
+        Add points to the extent.
+
+        Parameters
+        ----------
+        x : float | Iterable
+            x-coordinate(s) of the points.
+        y : float | Iterable
+            y-coordinate(s) of the points.
+
+        Returns
+        -------
+        None.
+
+        """
+        x = np.asarray(x, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        if x.size == 0:
+            return
+
+        # fmin/fmax ignore nan values used for gaps in the data
+        self.xmin = min(self.xmin, np.fmin.reduce(x))
+        self.xmax = max(self.xmax, np.fmax.reduce(x))
+        self.ymin = min(self.ymin, np.fmin.reduce(y))
+        self.ymax = max(self.ymax, np.fmax.reduce(y))
+        self.xabs = max(self.xabs, -self.xmin, self.xmax)
+        self.yabs = max(self.yabs, -self.ymin, self.ymax)
+        self.count += x.size
+
+        self._sketches.append(_sketch(np.abs(x), np.abs(y)))
+        if len(self._sketches) > MAX_SKETCHES:
+            self._sketches = [_merge(self._sketches)]
+
+    def absmax(self, axis: str = "xy", percentile: float = None) -> float:
+        """
+        Method to return the maximum absolute value of the data.
+
+        Parameters
+        ----------
+        axis : str, optional
+            Either "x", "y" or "xy" for the maximum of both axes.
+            The default is "xy".
+        percentile : float, optional
+            If given, the percentile (0-100) of the absolute values is returned
+            instead of the maximum. This is useful to ignore a few outliers
+            when scaling a plot. The value is estimated from the stored
+            quantile sketches. The default is None.
+
+        Returns
+        -------
+        float
+            Maximum (or percentile) of the absolute values. 0.0 if no data
+            has been added.
+
+        """
+        if self.count == 0:
+            return 0.0
+
+        if percentile is None:
+            values = {"x": self.xabs, "y": self.yabs}
+            return float(max(values[a] for a in axis))
+
+        weights, qx, qy = _merge(self._sketches)
+        values = {"x": qx, "y": qy}
+        return float(
+            max(_weighted_percentile(values[a], weights, percentile) for a in axis)
+        )
+
+
+def _sketch(x: np.ndarray, y: np.ndarray) -> tuple:
+    """Function to summarize a chunk of absolute values by its quantiles"""
+    if x.size <= SKETCH_QUANTILES.size:
+        return np.ones(x.size), x, y
+    return (
+        x.size * SKETCH_WEIGHTS,
+        np.nanquantile(x, SKETCH_QUANTILES),
+        np.nanquantile(y, SKETCH_QUANTILES),
+    )
+
+
+def _merge(sketches: list) -> tuple:
+    """Function to merge a list of quantile sketches into a single sketch"""
+    if len(sketches) == 1:
+        return sketches[0]
+
+    weights = np.concatenate([s[0] for s in sketches])
+    qx = np.concatenate([s[1] for s in sketches])
+    qy = np.concatenate([s[2] for s in sketches])
+
+    q = SKETCH_QUANTILES * 100
+    return (
+        weights.sum() * SKETCH_WEIGHTS,
+        _weighted_percentile(qx, weights, q),
+        _weighted_percentile(qy, weights, q),
+    )
+
+
+def _weighted_percentile(values: np.ndarray, weights: np.ndarray, q):
+    """Function to calculate the percentile(s) q (0-100) of weighted values"""
+    keep = ~np.isnan(values)
+    values, weights = values[keep], weights[keep]
+    if values.size == 0:
+        return np.zeros_like(np.asarray(q, dtype=float))
+    order = np.argsort(values)
+    values = values[order]
+    cum = np.cumsum(weights[order])
+    idx = np.searchsorted(cum, np.asarray(q) / 100 * cum[-1])
+    return values[np.minimum(idx, values.size - 1)]
@@ -1,32 +1,171 @@
-from functools import partial
+import json
+from typing import Iterable, NamedTuple
+import numpy as np
+
+# Setters where the last call fully determines the state, so a pending call
+# is replaced by a later call with the same name and the same arguments after
+# the first e.g. set_title("a", loc="left") by set_title("b", loc="left").
+COALESCE = {
+    "set_title",
+    "set_xlabel",
+    "set_ylabel",
+    "set_aspect",
+    "set_xscale",
+    "set_yscale",
+    "set_facecolor",
+    "set_rlabel_position",
+}
+# Limit setters are only replaced by calls setting both limits
+COALESCE_LIMITS = {"set_xlim", "set_ylim", "set_rlim"}
+
+
+class Op(NamedTuple):
+    """A recorded call of a plt.Axes method"""
+
+    name: str
+    args: tuple
+    kwargs: dict
 
 
 class FakeAx:
-    """A class to collect attributes set on a plt.Axes object in order to overwrite at a later stage."""
+    """
+    A class to collect attributes set on a plt.Axes object in order to overwrite at a later stage.
+
+    The calls are kept in a single log of Op tuples, which can be pickled or
+    dumped to JSON (see dumps) when the arguments allow it, and replayed on a
+    fresh axes in another process with replay. The log is applied
+    incrementally, so each call is only applied once to the axes of the plot.
+
+    Attributes
+    ----------
+    axes : plt.Axes
+        The axes the calls are applied to by overwrite.
+    ops : list
+        The recorded calls in order.
+    """
 
     def __init__(self, axes):
-        self.actions = []
-        self.historic = []
         self.axes = axes
+        self.ops = []
+        self._cursor = 0  # Index of the first op not applied to the axes
 
     def __getattr__(self, name):
-        def method(*args, **kwargs):
-            try:
-                getattr(self.axes, name)
-            except AttributeError:
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        if not hasattr(self.axes, name):
+
+            def method(*args, **kwargs):
                 print(f"Method *{name}* do not exist in matplotlib.Axes")
                 return method
-            func = partial(getattr(self.axes, name), *args, **kwargs)
-            self.actions.append(func)
-            self.historic.append((name, args, kwargs))
 
+            return method
+
+        def method(*args, **kwargs):
+            self._record(Op(name, args, kwargs))
+
+        # The recorder is cached, so __getattr__ is only called once per name
+        self.__dict__[name] = method
         return method
 
+    def __getstate__(self) -> dict:
+        # The cached recorders are bound to this object, so a copy or a
+        # pickled FakeAx creates its own
+        return {"axes": self.axes, "ops": self.ops, "_cursor": self._cursor}
+
+    def _record(self, op: Op):
+        if _coalesces(op):
+            for i in range(len(self.ops) - 1, self._cursor - 1, -1):
+                if _replaces(op, self.ops[i]):
+                    del self.ops[i]
+                    break
+        self.ops.append(op)
+
     def overwrite(self):
-        for action in self.actions:
-            action()
+        # Ops are only applied once, so the plot can be shown or saved
+        # several times without adding the artists again.
+        start, self._cursor = self._cursor, len(self.ops)
+        replay(self.axes, self.ops[start:])
 
     def copy(self, ax):
-        for name, args, kwargs in self.historic:
-            func = getattr(ax, name)
-            func(*args, **kwargs)
\ No newline at end of file
+        """Method to apply all recorded calls to another axes"""
+        replay(ax, self.ops)
+
+    def dumps(self, start: int = 0) -> str:
+        """
+        Method to dump the log to JSON.
+
+        NumPy arrays, NumPy scalars and complex numbers are supported, other
+        objects e.g. artists raise a TypeError.
+
+        Parameters
+        ----------
+        start : int, optional
+            Index of the first op. The default is 0.
+
+        Returns
+        -------
+        str
+            JSON string, which can be loaded with loads.
+
+        """
+        ops = [[op.name, list(op.args), op.kwargs] for op in self.ops[start:]]
+        return json.dumps(ops, default=_encode)
+
+
+def _coalesces(op: Op) -> bool:
+    if op.name in COALESCE:
+        return True
+    if op.name in COALESCE_LIMITS and not op.kwargs:
+        return len(op.args) == 2 or (len(op.args) == 1 and np.size(op.args[0]) == 2)
+    return False
+
+
+def _replaces(op: Op, pending: Op) -> bool:
+    """Function to check if an op makes a pending op redundant"""
+    if op.name != pending.name:
+        return False
+    if op.name in COALESCE_LIMITS:
+        return True
+    return _equal(op.args[1:], pending.args[1:]) and _equal(op.kwargs, pending.kwargs)
+
+
+def _equal(a, b) -> bool:
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):
+        # e.g. arrays, which are never considered equal
+        return False
+
+
+def _encode(obj):
+    if isinstance(obj, np.ndarray):
+        return {"__ndarray__": obj.tolist(), "dtype": obj.dtype.str}
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, complex):
+        return {"__complex__": [obj.real, obj.imag]}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _decode(obj: dict):
+    if "__ndarray__" in obj:
+        return np.array(obj["__ndarray__"], dtype=obj["dtype"])
+    if "__complex__" in obj:
+        return complex(*obj["__complex__"])
+    return obj
+
+
+def loads(s: str) -> list[Op]:
+    """Function to load a log dumped with FakeAx.dumps"""
+    ops = json.loads(s, object_hook=_decode)
+    return [Op(name, tuple(args), kwargs) for name, args, kwargs in ops]
+
+
+def replay(ax, ops: Iterable[Op]):
+    """
+    Function to apply recorded calls to an axes, e.g. a fresh axes in a
+    worker process which received the log instead of the figure.
+    """
+    for name, args, kwargs in ops:
+        getattr(ax, name)(*args, **kwargs)
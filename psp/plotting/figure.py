@@ -0,0 +1,168 @@
+from __future__ import annotations
+import os
+import sys
+from io import BytesIO
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+    from psp.plotting.cache import RenderCache
+
+
+def create_figure(figsize: tuple = (8, 8), headless: bool = False, **kwargs) -> Figure:
+    """
+    Function to create a figure either with pyplot or as a standalone figure.
+
+    Parameters
+    ----------
+    figsize : tuple, optional
+        Tuple with the figure size in inches. The default is (8, 8).
+    headless : bool, optional
+        If True the figure is created as a matplotlib.figure.Figure with an
+        Agg canvas. The figure is not registered in pyplot's global figure
+        manager and is freed as soon as it is no longer referenced.
+        The default is False.
+    **kwargs : N/A
+        Additional arguments for the figure.
+
+    Returns
+    -------
+    Figure
+        The created figure.
+
+    """
+    if headless:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        fig = Figure(figsize=figsize, **kwargs)
+        FigureCanvasAgg(fig)
+        return fig
+
+    import matplotlib.pyplot as plt
+
+    plt.ioff()  # to prevent figure window from showing until plt.show() is called.
+    return plt.figure(figsize=figsize, **kwargs)
+
+
+class FigureExport:
+    """
+    A mixin class with methods to export and close the figure of a plot.
+
+    The class using the mixin must have a fig attribute and can overwrite
+    _render to apply all deferred actions before the figure is saved.
+
+    Attributes
+    ----------
+    render_cache : RenderCache | None
+        Cache of rendered files used by save and to_bytes. Set it on
+        FigureExport to use it for all plots or on a single plot.
+        The default is None.
+    """
+
+    render_cache: RenderCache = None
+    _owns_fig = True  # False for plots created on the axes of another figure
+
+    def _render(self):
+        self.ax.overwrite()
+
+    def save(self, path, format: str = None, **kwargs):
+        """
+        Method to save the plot to a file.
+
+        With a render_cache the file of an identical plot is copied from the
+        cache without drawing the figure.
+
+        Parameters
+        ----------
+        path : str | path-like | file-like
+            Path or file object to write the plot to.
+        format : str, optional
+            File format e.g. 'png', 'pdf' or 'svg'. The default is None where
+            the format is deduced from the path.
+        **kwargs : N/A
+            Additional arguments for matplotlib.figure.Figure.savefig.
+
+        Returns
+        -------
+        None.
+
+        """
+        cache = self.render_cache
+        if cache is not None:
+            format = _file_format(path, format)
+            key = cache.key(self, format, **kwargs)
+        if cache is None or key is None:
+            self._render()
+            self.fig.savefig(path, format=format, **kwargs)
+            return
+
+        data = cache.get(key)
+        if data is None:
+            buffer = BytesIO()
+            self._render()
+            self.fig.savefig(buffer, format=format, **kwargs)
+            data = buffer.getvalue()
+            cache.put(key, data)
+
+        if isinstance(path, (str, os.PathLike)):
+            with open(path, "wb") as f:
+                f.write(data)
+        else:
+            path.write(data)
+
+    def to_bytes(self, format: str = "png", **kwargs) -> bytes:
+        """
+        Method to render the plot and return the content of the file.
+
+        Parameters
+        ----------
+        format : str, optional
+            File format e.g. 'png', 'pdf' or 'svg'. The default is 'png'.
+        **kwargs : N/A
+            Additional arguments for matplotlib.figure.Figure.savefig.
+
+        Returns
+        -------
+        bytes
+            The rendered file.
+
+        """
+        buffer = BytesIO()
+        self.save(buffer, format=format, **kwargs)
+        return buffer.getvalue()
+
+    def close(self):
+        """
+        Method to close the figure and free the memory used by it.
+
+        A plot created on an existing axes, e.g. of a CombineFigure, does not
+        close the shared figure, which is closed by its owner.
+
+        Returns
+        -------
+        None.
+
+        """
+        if not self._owns_fig:
+            return
+        # Only figures created by pyplot are registered in its figure manager
+        plt = sys.modules.get("matplotlib.pyplot")
+        if plt is not None:
+            plt.close(self.fig)
+        self.fig.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _file_format(path, format: str = None) -> str:
+    """Function to find the file format like matplotlib.figure.Figure.savefig"""
+    from matplotlib import rcParams
+
+    if format is None and isinstance(path, (str, os.PathLike)):
+        format = os.path.splitext(os.fspath(path))[1][1:] or None
+    return (format or rcParams["savefig.format"]).lower()
@@ -0,0 +1,334 @@
+from __future__ import annotations
+import time
+from typing import Iterable, Iterator, TYPE_CHECKING
+import numpy as np
+from psp.plotting.plotfunc import quiver_coordinates, TEXT_FONTSIZE
+
+if TYPE_CHECKING:
+    from psp.plotting.complex_plot import ComplexPlot
+    from matplotlib.lines import Line2D
+
+LIVE_TAIL = 500  # Default number of samples in the tail of a trajectory
+LIVE_FPS = 50  # Default frame rate of replay
+
+
+class RingBuffer:
+    """
+    A class for the last size values of a stream.
+
+    The values are written twice, at i and i + size, so the last size values
+    are always a contiguous view of the storage and no copy or roll is needed
+    when they are drawn. The memory is fixed regardless of the stream length.
+
+    Attributes
+    ----------
+    size : int
+        Number of values kept.
+    count : int
+        Number of values appended in total.
+    """
+
+    def __init__(self, size: int, dtype=complex):
+        self.size = size
+        self.count = 0
+        self._data = np.full(2 * size, np.nan, dtype=dtype)
+
+    def __len__(self):
+        return min(self.count, self.size)
+
+    def extend(self, values: Iterable):
+        """Method to append one or more values"""
+        values = np.asarray(values, dtype=self._data.dtype).ravel()
+        total = len(values)
+        values = values[-self.size :]  # Older values would be overwritten
+        i = (self.count + total - len(values) + np.arange(len(values))) % self.size
+        self._data[i] = values
+        self._data[i + self.size] = values
+        self.count += total
+
+    def view(self) -> np.ndarray:
+        """Method to return the last values, oldest first, without a copy"""
+        end = self.count % self.size + self.size
+        return self._data[end - len(self) : end]
+
+
+class LivePlot:
+    """
+    A class to update phasors and trajectories of a plot live.
+
+    The static content of the plot, e.g. zones and axes, is drawn once and
+    kept as a background image. The live artists are animated artists updated
+    in place with set_UVC and set_data, and each frame only draws them on top
+    of the background (blitting). The trajectories keep a tail of the last
+    samples in ring buffers, so the memory does not grow with the stream.
+
+    Attributes
+    ----------
+    plot : ComplexPlot
+        The plot with the static content e.g. an RXplot with zones.
+    frames : int
+        Number of frames drawn.
+
+    Examples
+    --------
+    >>> plot = RXplot("Live", headless=True)
+    >>> plot.add_zone(zone)
+    >>> live = LivePlot(plot, rmax=50)
+    >>> live.add_trajectory("Z AN", color="red")
+    >>> for t, Z in replay(time, impedances):
+    ...     live.update(trajectories={"Z AN": Z})
+    """
+
+    def __init__(self, plot: ComplexPlot, rmax: float = None):
+        """
+        Parameters
+        ----------
+        plot : ComplexPlot
+            The plot with the static content.
+        rmax : float, optional
+            Expected maximum magnitude of the live values, which is included
+            in the limits of the plot. The default is None.
+        """
+        self.plot = plot
+        self.frames = 0
+        self._polar = plot.projection == "polar"
+        self._quiver = None
+        self._labels = None
+        self._refs = None
+        self._trajectories = {}
+        self._background = None
+        self._start = None
+
+        if rmax is not None:
+            plot.extent.update([-rmax, rmax], [-rmax, rmax])
+        canvas = plot.fig.canvas
+        self._draw_callback = canvas.mpl_connect("draw_event", self._on_draw)
+
+    @property
+    def fps(self) -> float:
+        """Average frame rate since the first frame"""
+        if self.frames < 2:
+            return 0.0
+        return (self.frames - 1) / (time.perf_counter() - self._start)
+
+    def add_phasors(
+        self,
+        n: int,
+        refs: Iterable = None,
+        names: Iterable[str] = None,
+        colors=None,
+        **kwargs,
+    ):
+        """
+        Method to add the live phasors. All phasors are one Quiver.
+
+        Parameters
+        ----------
+        n : int
+            Number of phasors.
+        refs : Iterable, optional
+            Beginning of each phasor as complex values or (x, y) tuples.
+            The default is None resulting in (0, 0).
+        names : Iterable[str], optional
+            Names shown at the tip of each phasor. The default is None.
+        colors : optional
+            A color or a color for each phasor. The default is None.
+        **kwargs : N/A
+            Additional arguments for the underlying ax.quiver object.
+
+        Returns
+        -------
+        None.
+
+        """
+        ax = self.plot._ax
+        self._refs = refs
+        x0, y0, u, v = quiver_coordinates(np.zeros(n), refs, self._polar)
+        kwargs.setdefault("alpha", 0.7)
+        self._quiver = ax.quiver(
+            x0,
+            y0,
+            u,
+            v,
+            color=colors,
+            angles="xy",
+            scale_units="xy",
+            scale=1,
+            animated=True,
+            **kwargs,
+        )
+        if names is not None:
+            from psp.plotting.artists import TextLayer
+
+            self._labels = TextLayer(u, v, names, fontsize=TEXT_FONTSIZE)
+            self._labels.set_animated(True)
+            ax.add_artist(self._labels)
+        self._background = None
+
+    def add_trajectory(
+        self, name: str, tail: int = LIVE_TAIL, color: str = None, **kwargs
+    ) -> Line2D:
+        """
+        Method to add a live trajectory with a marker at the latest value.
+
+        Parameters
+        ----------
+        name : str
+            Name of the trajectory used in update. Also the legend label.
+        tail : int, optional
+            Number of samples drawn behind the marker. The default is 500.
+        color : str, optional
+            Color of the tail and the marker. The default is None resulting
+            in the next color of the color cycle.
+        **kwargs : N/A
+            Additional arguments for the line of the tail.
+
+        Returns
+        -------
+        Line2D
+            The line of the tail.
+
+        """
+        from matplotlib.lines import Line2D
+
+        ax = self.plot._ax
+        if color is None:
+            color = f"C{len(self._trajectories) % 10}"
+        line = Line2D([], [], color=color, label=name, animated=True, **kwargs)
+        marker = Line2D([], [], color=color, marker="o", animated=True)
+        ax.add_line(line)
+        ax.add_line(marker)
+        self._trajectories[name] = (RingBuffer(tail), line, marker)
+        self._background = None
+        return line
+
+    def update(self, phasors: Iterable[complex] = None, trajectories: dict = None):
+        """
+        Method to update the live artists and draw a frame.
+
+        Parameters
+        ----------
+        phasors : Iterable[complex], optional
+            The latest value of each phasor. The default is None.
+        trajectories : dict, optional
+            New samples for the trajectories as {name: complex value(s)}.
+            The default is None.
+
+        Returns
+        -------
+        None.
+
+        """
+        if phasors is not None:
+            _, _, u, v = quiver_coordinates(phasors, self._refs, self._polar)
+            self._quiver.set_UVC(u, v)
+            if self._labels is not None:
+                self._labels.set_data(u, v)
+
+        for name, values in (trajectories or {}).items():
+            buffer, line, marker = self._trajectories[name]
+            buffer.extend(values)
+            Z = buffer.view()
+            if self._polar:
+                Z = np.angle(Z) + 1j * np.abs(Z)
+            line.set_data(Z.real, Z.imag)
+            marker.set_data(Z.real[-1:], Z.imag[-1:])
+
+        self._blit()
+
+    def show(self):
+        """Method to show the plot in a non-blocking window"""
+        import matplotlib.pyplot as plt
+
+        self._draw_background()
+        plt.show(block=False)
+        plt.pause(0.001)
+
+    def close(self):
+        """Method to stop the updates of the background and close the plot"""
+        self.plot.fig.canvas.mpl_disconnect(self._draw_callback)
+        self.plot.close()
+
+    def _artists(self) -> list:
+        artists = [self._quiver, self._labels]
+        for _, line, marker in self._trajectories.values():
+            artists += [line, marker]
+        return [a for a in artists if a is not None]
+
+    def _draw_background(self):
+        # The deferred static content of the plot is applied once, and the
+        # draw_event of the full draw stores the background.
+        self.plot._render()
+        self.plot.fig.canvas.draw()
+
+    def _on_draw(self, event):
+        canvas = self.plot.fig.canvas
+        self._background = canvas.copy_from_bbox(self.plot.fig.bbox)
+        for artist in self._artists():
+            self.plot._ax.draw_artist(artist)
+
+    def _blit(self):
+        if self._background is None:
+            self._draw_background()
+
+        canvas = self.plot.fig.canvas
+        canvas.restore_region(self._background)
+        for artist in self._artists():
+            self.plot._ax.draw_artist(artist)
+        canvas.blit(self.plot.fig.bbox)
+        canvas.flush_events()
+
+        if self._start is None:
+            self._start = time.perf_counter()
+        self.frames += 1
+
+
+def replay(
+    times: Iterable[float],
+    values: Iterable,
+    fps: float = LIVE_FPS,
+    speed: float = 1.0,
+    realtime: bool = True,
+) -> Iterator[tuple[float, np.ndarray]]:
+    """
+    Generator to replay recorded samples as a live stream, e.g. phasors from
+    record_phasors or impedances from loop_impedances.
+
+    Parameters
+    ----------
+    times : Iterable[float]
+        Sorted time of the samples in seconds.
+    values : Iterable
+        Samples with the time along the first axis.
+    fps : float, optional
+        Number of frames per second of stream time. The default is 50.
+    speed : float, optional
+        Replay speed relative to the recording. The default is 1.
+    realtime : bool, optional
+        Wait until the time of each frame. Without waiting the frames are
+        yielded as fast as they are consumed. The default is True.
+
+    Yields
+    ------
+    tuple
+        Tuple (t, samples) with the time of the frame and the samples since
+        the previous frame. Frames without new samples are skipped.
+
+    """
+    times = np.asarray(times, dtype=float)
+    if len(times) == 0:
+        return
+    frames = np.arange(times[0], times[-1] + 1 / fps, 1 / fps)
+    ends = np.searchsorted(times, frames, side="right")
+
+    start = time.perf_counter()
+    i = 0
+    for t, end in zip(frames, ends):
+        if end == i:
+            continue
+        if realtime:
+            delay = (t - times[0]) / speed - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+        yield t, values[i:end]
+        i = end
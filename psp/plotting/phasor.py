@@ -0,0 +1,209 @@
+from typing import Iterable, Iterator
+import numpy as np
+from psp.plotting.comtrade import Comtrade
+from psp.plotting.plotfunc import phase_to_line
+
+CHUNK_SAMPLES = 65536  # Samples read and filtered at a time
+LOOPS = ("AN", "BN", "CN", "AB", "BC", "CA")
+
+
+def _window(samples_per_cycle: int, half_cycle: bool) -> int:
+    if half_cycle:
+        if samples_per_cycle % 2:
+            raise ValueError(
+                "A half cycle DFT needs an even number of samples per cycle"
+            )
+        return samples_per_cycle // 2
+    return samples_per_cycle
+
+
+def dft(
+    x: Iterable, samples_per_cycle: int, half_cycle: bool = False, start: int = 0
+) -> np.ndarray:
+    """
+    Function to estimate the fundamental phasor of each window of samples
+    with a sliding full or half cycle DFT.
+
+    The DFT is calculated recursively as the difference of a cumulative sum,
+    so the cost does not depend on the length of the window. The reference of
+    the phasors is the absolute sample index, so a steady sinusoid gives a
+    constant phasor.
+
+    Parameters
+    ----------
+    x : Iterable
+        Samples with the shape (samples,) or (samples, channels).
+    samples_per_cycle : int
+        Number of samples per cycle of the fundamental frequency.
+    half_cycle : bool, optional
+        Use a window of half a cycle. This is faster but sensitive to
+        DC offset. The default is False.
+    start : int, optional
+        Absolute index of the first sample, used for the reference of the
+        phasors when a record is processed in chunks. The default is 0.
+
+    Returns
+    -------
+    np.ndarray
+        RMS phasors with the shape (samples - window + 1,) or
+        (samples - window + 1, channels). Phasor k is calculated from the
+        window ending at sample k + window - 1.
+
+    """
+    x = np.asarray(x, dtype=float)
+    N = samples_per_cycle
+    W = _window(N, half_cycle)
+    n = len(x)
+    if n < W:
+        return np.empty((0, *x.shape[1:]), dtype=complex)
+
+    rotation = np.exp(-2j * np.pi * ((start + np.arange(n)) % N) / N)
+    y = x * rotation.reshape(-1, *[1] * (x.ndim - 1))
+
+    cumulative = np.empty((n + 1, *x.shape[1:]), dtype=complex)
+    cumulative[0] = 0
+    np.cumsum(y, axis=0, out=cumulative[1:])
+
+    # Difference of the cumulative sum in place of a temporary array
+    phasors = cumulative[W:]
+    phasors -= cumulative[: n + 1 - W]
+    phasors *= np.sqrt(2) / W
+    return phasors
+
+
+def stream_phasors(
+    chunks: Iterable[np.ndarray],
+    samples_per_cycle: int,
+    half_cycle: bool = False,
+    step: int = 1,
+) -> Iterator[np.ndarray]:
+    """
+    Generator of phasors from consecutive chunks of samples.
+
+    The last window - 1 samples of a chunk are kept for the next chunk, so
+    the memory is bounded by the size of the chunks.
+
+    Parameters
+    ----------
+    chunks : Iterable[np.ndarray]
+        Consecutive samples with the shape (samples,) or (samples, channels).
+    samples_per_cycle : int
+        Number of samples per cycle of the fundamental frequency.
+    half_cycle : bool, optional
+        Use a window of half a cycle. The default is False.
+    step : int, optional
+        Only return the phasor of every step'th window. The default is 1.
+
+    Yields
+    ------
+    np.ndarray
+        Phasors of the windows ending within the chunk. See dft.
+
+    """
+    W = _window(samples_per_cycle, half_cycle)
+    carry = None
+    start = 0  # Absolute index of the first buffered sample
+    for chunk in chunks:
+        buffer = chunk if carry is None else np.concatenate((carry, chunk))
+        if len(buffer) < W:
+            carry = buffer
+            continue
+
+        phasors = dft(buffer, samples_per_cycle, half_cycle, start)
+        first = -start % step
+        yield phasors[first::step]
+
+        carry = buffer[len(buffer) - (W - 1) :]
+        start += len(buffer) - (W - 1)
+
+
+def record_phasors(
+    record: Comtrade,
+    channels: list = None,
+    window: tuple = None,
+    half_cycle: bool = False,
+    step: int = 1,
+    chunk: int = CHUNK_SAMPLES,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Function to estimate the phasors of analog channels of a COMTRADE record.
+
+    The record is read and filtered in chunks and needs a single, constant
+    sample rate.
+
+    Parameters
+    ----------
+    record : Comtrade
+        The record.
+    channels : list, optional
+        Index or name of the channels. The default is None resulting in all
+        analog channels.
+    window : tuple, optional
+        Tuple (t0, t1) with the start and end time in seconds relative to
+        the first sample. The default is None resulting in the entire record.
+    half_cycle : bool, optional
+        Use a window of half a cycle. The default is False.
+    step : int, optional
+        Only return the phasor of every step'th sample. The default is 1.
+    chunk : int, optional
+        Number of samples read at a time. The default is 65536.
+
+    Returns
+    -------
+    tuple
+        Tuple (time, phasors) with the time of the last sample of each window
+        and the phasors with the shape (windows, channels).
+
+    """
+    rate = record.sample_rates[0][0]
+    if len(record.sample_rates) != 1 or rate <= 0:
+        raise ValueError("Phasors need a record with a single constant sample rate")
+    samples_per_cycle = int(round(rate / record.frequency))
+    W = _window(samples_per_cycle, half_cycle)
+
+    sl = record.window_slice(window)
+    chunks = (
+        record.get_analogs(channels, slice(i, min(i + chunk, sl.stop)))
+        for i in range(sl.start, sl.stop, chunk)
+    )
+    parts = list(stream_phasors(chunks, samples_per_cycle, half_cycle, step))
+    n_channels = record.n_analog if channels is None else len(channels)
+    phasors = np.concatenate(parts) if parts else np.empty((0, n_channels), complex)
+
+    ends = np.arange(sl.start + W - 1, sl.stop, step)
+    time = (ends / rate)[: len(phasors)]
+    return time, phasors
+
+
+def loop_impedances(V: Iterable, I: Iterable, k0: complex = 0.0) -> np.ndarray:
+    """
+    Function to calculate the impedances of the six fault loops.
+
+    The phase-earth loops are Z = V / (I + k0 * IN) with the residual current
+    IN = IA + IB + IC, and the phase-phase loops are Z = (V1 - V2) / (I1 - I2).
+
+    Parameters
+    ----------
+    V : Iterable
+        Phase voltage phasors with the shape (N, 3).
+    I : Iterable
+        Phase current phasors with the shape (N, 3).
+    k0 : complex, optional
+        Residual compensation factor (Z0 - Z1) / (3 * Z1). The default is 0.
+
+    Returns
+    -------
+    np.ndarray
+        Impedances with the shape (N, 6) in the order of LOOPS
+        (AN, BN, CN, AB, BC, CA).
+
+    """
+    V = np.asarray(V, dtype=complex)
+    I = np.asarray(I, dtype=complex)
+    Z = np.empty((*V.shape[:-1], 6), dtype=complex)
+
+    residual = I.sum(axis=-1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        np.divide(V, I + k0 * residual, out=Z[..., :3])
+        np.divide(phase_to_line(V), phase_to_line(I), out=Z[..., 3:])
+    return Z
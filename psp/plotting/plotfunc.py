@@ -1,10 +1,24 @@
+from __future__ import annotations
 from cmath import cos, sin
 from math import atan2, radians
-import matplotlib.pyplot as plt
-from matplotlib.patches import FancyArrowPatch
-from typing import Iterable
+from typing import Iterable, TYPE_CHECKING
 import numpy as np
 
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+
+# Fortescue operator and transformation matrices
+A_OPERATOR = np.exp(2j * np.pi / 3)
+SEQUENCE_TO_PHASE = np.array(
+    [
+        [1, 1, 1],
+        [1, A_OPERATOR**2, A_OPERATOR],
+        [1, A_OPERATOR, A_OPERATOR**2],
+    ]
+)
+PHASE_TO_SEQUENCE = SEQUENCE_TO_PHASE.conj() / 3
+LINE_TO_PHASE = np.array([[0, -1, -2], [0, 2, 1], [0, -1, 1]]) / 3
+
 # Styling
 ALPHA_BASE = 0.5  # For quiver
 TEXT_FONTSIZE = 10
@@ -45,10 +59,66 @@ def plot_quiver(
         *coor, color=color, angles="xy", scale_units="xy", scale=1, **kwargs
     )
     if text:
-        plot_textbox(ax=ax, x=quiver.U + dx, y=quiver.V + dy, s=text)
+        plot_textbox(ax=ax, x=coor[2] + dx, y=coor[3] + dy, s=text)
     return quiver
 
 
+def quiver_coordinates(
+    phasors: Iterable[complex], refs: Iterable = None, polar: bool = True
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Function to return the quiver coordinates (X, Y, U, V) of phasors. The
+    refs are complex values or (x, y) tuples and default to (0, 0).
+    """
+    phasors = np.asarray(phasors, dtype=complex).ravel()
+    if refs is None:
+        x0 = y0 = np.zeros(len(phasors))
+    else:
+        refs = np.asarray(refs)
+        if np.iscomplexobj(refs):
+            x0, y0 = refs.real.ravel(), refs.imag.ravel()
+        else:
+            x0, y0 = refs.reshape(-1, 2).T
+
+    if polar:
+        return x0, y0, np.angle(phasors), np.abs(phasors)
+    return x0, y0, phasors.real, phasors.imag
+
+
+def plot_quivers(
+    ax: plt.Axes,
+    phasors: Iterable[complex],
+    refs: Iterable = None,
+    colors=None,
+    texts: Iterable[str] = None,
+    dx: float = 0,
+    dy: float = 0,
+    polar: bool = True,
+    **kwargs,
+):
+    """
+    Function to plot many phasors as a single quiver and their labels as a
+    single TextLayer. Returns the quiver and the text layer (None without
+    labels).
+    """
+    from psp.plotting.artists import TextLayer
+
+    x0, y0, u, v = quiver_coordinates(phasors, refs, polar)
+    quiver = ax.quiver(
+        x0, y0, u, v, color=colors, angles="xy", scale_units="xy", scale=1, **kwargs
+    )
+
+    layer = None
+    if texts is not None:
+        texts = np.asarray(texts, dtype=object).ravel()
+        labeled = texts != ""
+        layer = TextLayer(
+            u[labeled] + dx, v[labeled] + dy, texts[labeled], fontsize=TEXT_FONTSIZE
+        )
+        ax.add_artist(layer)
+    return quiver, layer
+
+
 # def plot_quiver(ax : plt.Axes, phasor : complex, color : str, text : str, dx : float = 0, dy : float = 0, polar : bool = True, **kwargs):
 #     if polar:
 #         u = atan2(phasor.imag,phasor.real)
@@ -116,27 +186,138 @@ def add_point(ax: plt.Axes, value: complex | tuple, **kwargs):
     return point
 
 
-def get_centroid(A: complex, B: complex, C: complex):
-    x = (A.real + B.real + C.real) / 3
-    y = (A.imag + B.imag + C.imag) / 3
-    return complex(x, y)
+def get_centroid(A, B=None, C=None):
+    """
+    Function to return the centroid of three phasors.
+
+    Parameters
+    ----------
+    A, B, C : complex | np.ndarray
+        The three phasors as scalars or (N,) arrays, or only A as an (N, 3)
+        array.
+
+    Returns
+    -------
+    complex | np.ndarray
+        The centroid of each set of phasors.
+
+    """
+    if B is None:
+        return np.mean(_three_phase(A), axis=-1)
+    return (A + B + C) / 3
+
+
+def phase_to_line(xA, xB=None, xC=None):
+    """
+    Function to convert phase quantities to line quantities (AB, BC, CA).
+
+    Parameters
+    ----------
+    xA, xB, xC : complex | np.ndarray
+        The phase quantities as scalars or (N,) arrays, or only xA as an
+        (N, 3) array.
+
+    Returns
+    -------
+    tuple | np.ndarray
+        Tuple (xAB, xBC, xCA), or an (N, 3) array for an (N, 3) input.
 
+    """
+    if xB is None:
+        x = _three_phase(xA)
+        out = np.empty_like(x)
+        np.subtract(x[..., :2], x[..., 1:], out=out[..., :2])
+        np.subtract(x[..., 2], x[..., 0], out=out[..., 2])
+        return out
+    return xA - xB, xB - xC, xC - xA
 
-def phase_to_line(xA: complex, xB: complex, xC: complex):
-    xAL = xA - xB
-    xBL = xB - xC
-    xCL = xC - xA
-    return xAL, xBL, xCL
 
+def line_to_phase(xAL, xBL=None, xCL=None):
+    """
+    Function to convert line quantities (AB, BC, CA) to phase quantities
+    assuming no zero sequence.
 
-def line_to_phase(xAL: complex, xBL: complex, xCL: complex):
+    Parameters
+    ----------
+    xAL, xBL, xCL : complex | np.ndarray
+        The line quantities as scalars or (N,) arrays, or only xAL as an
+        (N, 3) array.
+
+    Returns
+    -------
+    tuple | np.ndarray
+        Tuple (xA, xB, xC), or an (N, 3) array for an (N, 3) input.
+
+    """
+    if xBL is None:
+        return _three_phase(xAL) @ LINE_TO_PHASE.T
     xA = -(1 / 3) * xBL - (2 / 3) * xCL
     xB = (2 / 3) * xBL + (1 / 3) * xCL
     xC = -(1 / 3) * xBL + (1 / 3) * xCL
     return xA, xB, xC
 
 
-def arrow(ax: plt.Axes, x: Iterable, y: Iterable, n: int = None):
+def fortescue(xA, xB=None, xC=None):
+    """
+    Function to calculate the symmetrical components of phase quantities.
+
+    Parameters
+    ----------
+    xA, xB, xC : complex | np.ndarray
+        The phase quantities as scalars or (N,) arrays, or only xA as an
+        (N, 3) array.
+
+    Returns
+    -------
+    tuple | np.ndarray
+        Tuple (x0, x1, x2) with the zero, positive and negative sequence, or
+        an (N, 3) array for an (N, 3) input.
+
+    """
+    if xB is None:
+        return _three_phase(xA) @ PHASE_TO_SEQUENCE.T
+    x = np.stack(np.broadcast_arrays(xA, xB, xC), axis=-1) @ PHASE_TO_SEQUENCE.T
+    return x[..., 0], x[..., 1], x[..., 2]
+
+
+def inverse_fortescue(x0, x1=None, x2=None):
+    """
+    Function to calculate phase quantities from symmetrical components.
+
+    Parameters
+    ----------
+    x0, x1, x2 : complex | np.ndarray
+        The zero, positive and negative sequence as scalars or (N,) arrays,
+        or only x0 as an (N, 3) array.
+
+    Returns
+    -------
+    tuple | np.ndarray
+        Tuple (xA, xB, xC), or an (N, 3) array for an (N, 3) input.
+
+    """
+    if x1 is None:
+        return _three_phase(x0) @ SEQUENCE_TO_PHASE.T
+    x = np.stack(np.broadcast_arrays(x0, x1, x2), axis=-1) @ SEQUENCE_TO_PHASE.T
+    return x[..., 0], x[..., 1], x[..., 2]
+
+
+def _three_phase(x) -> np.ndarray:
+    x = np.asarray(x, dtype=complex)
+    if x.shape[-1:] != (3,):
+        raise ValueError("The phase quantities must have the shape (N, 3)")
+    return x
+
+
+def arrow(
+    ax: plt.Axes,
+    x: Iterable,
+    y: Iterable,
+    n: int = None,
+    color: str = "black",
+    size: float = 0.15,
+    **kwargs,
+):
     """
     Add evenly spaced arrows along a curve on a matplotlib Axes.
 
@@ -150,12 +331,25 @@ def arrow(ax: plt.Axes, x: Iterable, y: Iterable, n: int = None):
         Sequence of y-coordinates of the curve.
     n : int, optional
         Number of arrows to draw. If None, an arrow is drawn for every x point.
+    color : str, optional
+        Color of the arrows. The default is "black".
+    size : float, optional
+        Length of the arrows in inches. The default is 0.15.
+    **kwargs : N/A
+        Additional arguments for the underlying ax.quiver object.
+
+    Returns
+    -------
+    matplotlib.quiver.Quiver
+        A single artist with all the arrows.
 
     Notes
     -----
-    - Arrows are placed at approximately equal index intervals,
-      not necessarily equal arc-length.
-    - The arrows use a fixed arrow style ('->') and a mutation scale of 15.
+    - Arrows are placed at equal arc-length distances along the curve
+      pointing in the direction of the curve. Gaps in the curve (nan) are
+      skipped.
+    - All arrows are drawn with a single call to ax.quiver, so the cost is
+      independent of the number of samples in the curve.
 
     Examples
     --------
@@ -164,19 +358,50 @@ def arrow(ax: plt.Axes, x: Iterable, y: Iterable, n: int = None):
     >>> x = np.cos(t)
     >>> y = np.sin(t)
     >>> line = ax.plot(x, y)
-    >>> arrow(ax, x, y, n=5)
+    >>> arrows = arrow(ax, x, y, n=5)
     >>> plt.show() #doctest: +SKIP
     """
-    if n:
-        d = len(x) // (n + 1)
-    else:
-        d = 1
-    ind = np.arange(d, len(x), d)
-    for i in ind:
-        ar = FancyArrowPatch(
-            (x[i - 1], y[i - 1]), (x[i], y[i]), arrowstyle="->", mutation_scale=15
-        )
-        ax.add_patch(ar)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    dx = np.diff(x)
+    dy = np.diff(y)
+    length = np.hypot(dx, dy)
+    # Segments in a gap of the curve (nan) do not add to the arc length
+    length[~np.isfinite(length)] = 0
+    distance = np.concatenate(([0], np.cumsum(length)))
+    if len(x) < 2 or distance[-1] == 0:
+        return None
+
+    n = n or len(x) - 1
+    target = distance[-1] * np.arange(1, n + 1) / (n + 1)
+
+    # Segment of each arrow. Segments with zero length, including the gaps,
+    # are never selected.
+    i = np.clip(np.searchsorted(distance, target, side="right"), 1, len(x) - 1) - 1
+    frac = (target - distance[i]) / length[i]
+
+    # Thin shaft and long head, so the arrows are drawn as arrowheads
+    width = size / 15
+    kwargs = {
+        "units": "inches",
+        "width": width,
+        "headwidth": 0.6 * size / width,
+        "headlength": size / width,
+        "headaxislength": 0.9 * size / width,
+        **kwargs,
+    }
+    return ax.quiver(
+        x[i] + frac * dx[i],
+        y[i] + frac * dy[i],
+        dx[i] / length[i],
+        dy[i] / length[i],
+        color=color,
+        angles="xy",
+        scale_units="inches",
+        scale=1 / size,
+        pivot="mid",
+        **kwargs,
+    )
 
 
 def center_axis(ax: plt.Axes):
@@ -196,7 +421,7 @@ def center_axis(ax: plt.Axes):
     ax.spines["bottom"].set_alpha(0.8)
 
     # Remove duplicate zero in the ticks
-    locs, labels = plt.yticks()  # get current ticks
+    locs = ax.get_yticks()  # get current ticks
     locs = [n for n in locs if n != 0.0]  # remove 0.0
     ax.set_yticks(locs)
 
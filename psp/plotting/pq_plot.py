@@ -1,23 +1,133 @@
-from numpy import linspace
-from shapely.geometry import LineString
-
-
-def transfer_PQ(polygon, Un):
-    t = linspace(0, 1.0, 1000)
-    linestring = LineString(polygon.exterior.coords)
-    out = list(map(lambda x: linestring.interpolate(x, normalized=True).coords, t))
-
-    x2 = []
-    y2 = []
-    for p in out:
-        if 0 in list(*p):
-            continue
-        xp = P(Un, *p) / 1e6
-        xq = Q(Un, *p) / 1e6
-        x2.append(xp)
-        y2.append(xq)
-
-    return x2, y2
+import numpy as np
+
+MAX_REFINEMENTS = 12  # Maximum number of times a segment is split in two
+
+
+def zone_samples(polygons, n: int = 1000, rel_tol: float = 0.02) -> list[np.ndarray]:
+    """
+    Function to sample the exterior of zones as complex impedances.
+
+    Each exterior is sampled at n equally spaced points plus all vertices of
+    the polygon. Segments are then split until the step between two samples
+    is less than rel_tol times the distance to the origin, which densifies the
+    samples where the mapping to the PQ plane (1/|Z|^2) changes quickly. All
+    zones are sampled and refined together.
+
+    Parameters
+    ----------
+    polygons : Iterable
+        The zones as shapely polygons in the RX plane.
+    n : int, optional
+        Number of equally spaced samples before the refinement.
+        The default is 1000.
+    rel_tol : float, optional
+        Maximum step between two samples relative to their distance to the
+        origin. The default is 0.02.
+
+    Returns
+    -------
+    list[np.ndarray]
+        Complex samples of each zone. The origin is left out.
+
+    """
+    import shapely
+
+    rings = np.array([shapely.LineString(p.exterior.coords) for p in polygons])
+    if rings.size == 0:
+        return []
+
+    distance, zone = [], []
+    for i, polygon in enumerate(polygons):
+        coords = np.asarray(polygon.exterior.coords)[:, :2]
+        vertices = np.cumsum(np.hypot(*np.diff(coords, axis=0).T))
+        d = np.union1d(np.linspace(0, rings[i].length, n), np.append(0, vertices))
+        distance.append(d)
+        zone.append(np.full(d.size, i))
+    distance = np.concatenate(distance)
+    zone = np.concatenate(zone)
+
+    z = _interpolate(rings[zone], distance)
+    for _ in range(MAX_REFINEMENTS):
+        step = np.abs(np.diff(z))
+        radius = np.minimum(np.abs(z[:-1]), np.abs(z[1:]))
+        split = np.flatnonzero((step > rel_tol * radius) & (zone[1:] == zone[:-1]))
+        if split.size == 0:
+            break
+        middle = (distance[split] + distance[split + 1]) / 2
+        z = np.insert(z, split + 1, _interpolate(rings[zone[split]], middle))
+        distance = np.insert(distance, split + 1, middle)
+        zone = np.insert(zone, split + 1, zone[split])
+
+    # The origin can not be mapped to the PQ plane
+    keep = z != 0
+    z, zone = z[keep], zone[keep]
+    return np.split(z, np.cumsum(np.bincount(zone, minlength=rings.size))[:-1])
+
+
+def _interpolate(rings, distance: np.ndarray) -> np.ndarray:
+    """Function to return the points at the distances along rings as complex"""
+    import shapely
+
+    xy = shapely.get_coordinates(shapely.line_interpolate_point(rings, distance))
+    return xy[:, 0] + 1j * xy[:, 1]
+
+
+def map_PQ(samples: list[np.ndarray], Un) -> list[np.ndarray]:
+    """
+    Function to map complex impedances (Ohm) to the PQ plane (MVA) as
+    S = |U|^2 / conj(Z) for one or more voltages in a single pass.
+
+    Parameters
+    ----------
+    samples : list[np.ndarray]
+        Complex impedances of each zone e.g. from zone_samples.
+    Un : float | Iterable
+        Voltage (V) or an array of voltages.
+
+    Returns
+    -------
+    list[np.ndarray]
+        Complex power of each zone with the shape (samples,) for a single
+        voltage and (voltages, samples) for an array of voltages.
+
+    """
+    if not samples:
+        return []
+    w = 1 / np.conj(np.concatenate(samples))
+    u2 = np.abs(np.asarray(Un, dtype=complex)) ** 2 / 1e6
+    S = np.multiply.outer(u2, w)
+    return np.split(S, np.cumsum([len(z) for z in samples])[:-1], axis=-1)
+
+
+def transfer_PQ(polygon, Un, n: int = 1000, rel_tol: float = 0.02):
+    """
+    Function to map the exterior of a zone from the RX plane to the PQ plane.
+
+    A point Z = R + jX is mapped to S = P + jQ = |U|^2 / conj(Z).
+
+    Parameters
+    ----------
+    polygon : shapely.Polygon
+        The zone in the RX plane (Ohm).
+    Un : float | Iterable
+        Voltage (V) or an array of voltages to map the zone for.
+    n : int, optional
+        Number of equally spaced samples along the exterior before the
+        adaptive refinement. The vertices of the polygon are always included.
+        The default is 1000.
+    rel_tol : float, optional
+        Maximum step between two samples relative to their distance to the
+        origin. The default is 0.02.
+
+    Returns
+    -------
+    tuple
+        Tuple (P, Q) in MW and Mvar. The arrays have the shape (samples,) for
+        a single voltage and (voltages, samples) for an array of voltages.
+
+    """
+    S = map_PQ(zone_samples([polygon], n, rel_tol), Un)[0]
+    return S.real, S.imag
 
 
 def P(U, Z):
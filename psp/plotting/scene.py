@@ -0,0 +1,368 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Iterable, Iterator, TYPE_CHECKING
+import numpy as np
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+
+# Line2D properties which can be merged into a LineCollection or a scatter
+LINE_STYLE = {"linestyle", "linewidth", "alpha", "label", "zorder"}
+POINT_STYLE = {"marker", "markersize", "alpha", "label", "zorder"}
+ALIASES = {"c": "color", "ls": "linestyle", "lw": "linewidth", "ms": "markersize"}
+# LineCollection arguments with the name of the merged style
+COLLECTION_ALIASES = {
+    **ALIASES,
+    "linestyles": "linestyle",
+    "dashes": "linestyle",
+    "linewidths": "linewidth",
+}
+NO_LINE = (None, "None", "none", "", " ")
+
+
+@dataclass
+class Primitive:
+    """
+    A plot primitive recorded by a Scene.
+
+    Attributes
+    ----------
+    kind : str
+        "plot", "lines", "quiver" or "text".
+    data : tuple
+        plot and lines: a list of (n, 2) arrays with the coordinates of each
+        line.
+        quiver: the arrays (X, Y, U, V).
+        text: the arrays (x, y) and a list of the strings.
+    colors : list | None
+        A color for each line or arrow. None uses the color of the style.
+    style : dict
+        Keyword arguments for the matplotlib function.
+    fmt : str | None
+        Format string of a plot e.g. "--k".
+    """
+
+    kind: str
+    data: tuple
+    colors: list = None
+    style: dict = None
+    fmt: str = None
+
+
+class Scene:
+    """
+    A class to record plot primitives and create the artists later.
+
+    The recording methods mirror plot, quiver and text of plt.Axes, so the
+    functions of plotfunc and angle can draw on a Scene. Nothing is created
+    in matplotlib until the scene is rendered, where primitives of the same
+    kind and style are merged into a single artist: lines into a
+    LineCollection, markers into a PathCollection (scatter), arrows into a
+    Quiver and texts into a TextLayer. Primitives with a label are never
+    merged, so each keeps its own legend entry. Lines without a color take
+    the next color of the property cycle of the axes, which is shared with
+    ax.plot, so the colors are the same as if the lines were drawn directly.
+
+    Attributes
+    ----------
+    primitives : list
+        The recorded primitives in order.
+    """
+
+    def __init__(self):
+        self.primitives = []
+        self._flushed = 0
+
+    def __len__(self):
+        return len(self.primitives)
+
+    ##########################################################################
+    # recording
+    ##########################################################################
+
+    def plot(self, x: Iterable, y: Iterable, fmt: str = None, **kwargs) -> list:
+        """Method to record a line like plt.Axes.plot"""
+        xy = np.column_stack(
+            (np.asarray(x, dtype=float).ravel(), np.asarray(y, dtype=float).ravel())
+        )
+        return [self._add(Primitive("plot", [xy], None, kwargs, fmt))]
+
+    def lines(self, segments: list, colors: list = None, **kwargs) -> Primitive:
+        """
+        Method to record several lines with the same style, which are drawn
+        as a LineCollection. The keyword arguments are the arguments of a
+        LineCollection e.g. linewidths.
+        """
+        segments = [np.asarray(s, dtype=float).reshape(-1, 2) for s in segments]
+        return self._add(Primitive("lines", segments, colors, kwargs))
+
+    def quiver(self, X, Y, U, V, color=None, **kwargs) -> Primitive:
+        """Method to record arrows like plt.Axes.quiver"""
+        X, Y, U, V = [np.asarray(a, dtype=float).ravel() for a in (X, Y, U, V)]
+        X, Y, U, V = np.broadcast_arrays(X, Y, U, V)
+        colors = None
+        if _per_item(color):
+            colors = list(color)
+        elif color is not None:
+            kwargs["color"] = color
+        return self._add(Primitive("quiver", (X, Y, U, V), colors, kwargs))
+
+    def text(self, x, y, s, **kwargs) -> Primitive:
+        """Method to record one or more texts like plt.Axes.text"""
+        x = np.asarray(x, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        s = [s] if isinstance(s, str) else [str(t) for t in s]
+        return self._add(Primitive("text", (x, y, s), None, kwargs))
+
+    def _add(self, primitive: Primitive) -> Primitive:
+        self.primitives.append(primitive)
+        return primitive
+
+    ##########################################################################
+    # rendering
+    ##########################################################################
+
+    def flush(self, ax: plt.Axes) -> list:
+        """Method to render the primitives recorded since the last flush"""
+        artists = self.render(ax, self._flushed)
+        self._flushed = len(self.primitives)
+        return artists
+
+    def render(self, ax: plt.Axes, start: int = 0) -> list:
+        """
+        Method to create the artists of the primitives on an axes.
+
+        The scene is not changed, so it can be rendered on several axes.
+
+        Parameters
+        ----------
+        ax : plt.Axes
+            The axes to draw on.
+        start : int, optional
+            Index of the first primitive to render. The default is 0.
+
+        Returns
+        -------
+        list
+            The created artists.
+
+        """
+        colors = _next_colors(ax)
+
+        groups = {}
+        artists = []
+        for primitive in self.primitives[start:]:
+            if primitive.kind == "plot":
+                artists.extend(_group_plot(ax, primitive, groups, colors))
+            elif primitive.kind == "lines":
+                artists.extend(_group_lines(ax, primitive, groups, colors))
+            elif primitive.kind == "quiver":
+                quiver_colors = primitive.colors
+                if quiver_colors is None:
+                    n = len(primitive.data[0])
+                    quiver_colors = [primitive.style.get("color", "k")] * n
+                style = {k: v for k, v in primitive.style.items() if k != "color"}
+                _append(groups, ("quiver", style), primitive.data, quiver_colors)
+            else:
+                _append(groups, ("text", primitive.style), primitive.data, None)
+
+        for (kind, _), (style, data, colors) in groups.items():
+            artists.append(_materialize(ax, kind, style, data, colors))
+        return artists
+
+
+def _freeze(value):
+    """Function to return a hashable version of a style value"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, np.ndarray):
+        return (value.dtype.str, value.shape, value.tobytes())
+    try:
+        hash(value)
+    except TypeError:
+        # Values which can not be compared are never merged
+        return object()
+    return value
+
+
+def _per_item(color) -> bool:
+    """Function to check if a color argument has a color for each item"""
+    if color is None or isinstance(color, str):
+        return False
+    # A single RGB(A) tuple has numbers, a list of colors has strings or tuples
+    return not isinstance(color[0], (int, float, np.number))
+
+
+def _append(groups: dict, key: tuple, data, colors):
+    kind, style = key
+    label = "" if style.get("label") is None else str(style["label"])
+    if label and not label.startswith("_"):
+        # A group of its own, as the legend has an entry for each artist
+        frozen = object()
+    else:
+        frozen = _freeze(style)
+    entry = groups.setdefault((kind, frozen), (style, [], []))
+    entry[1].append(data)
+    if colors is not None:
+        entry[2].extend(colors)
+
+
+def _next_colors(ax: plt.Axes) -> Iterator[str]:
+    """Generator of the next colors of the property cycle of an axes"""
+    while True:
+        # An empty line takes the next color of the axes like any ax.plot
+        (line,) = ax.plot([], [])
+        line.remove()
+        yield line.get_color()
+
+
+def _parse_fmt(fmt: str) -> dict:
+    """
+    Function to parse a format string of plt.Axes.plot e.g. "--k" or "C1o".
+
+    Returns
+    -------
+    dict
+        The linestyle, marker and color given by the format string.
+
+    """
+    from matplotlib import rcParams
+    from matplotlib.colors import BASE_COLORS, is_color_like
+    from matplotlib.lines import lineMarkers, lineStyles
+
+    # A color only e.g. "red" or "0.5", but "1" is the tri_down marker
+    if is_color_like(fmt) and not fmt.isdigit():
+        return {"color": fmt}
+
+    style = {}
+    i = 0
+    while i < len(fmt):
+        if fmt[i : i + 2] in lineStyles:
+            name, value, i = "linestyle", fmt[i : i + 2], i + 2
+        elif fmt[i] in lineStyles:
+            name, value, i = "linestyle", fmt[i], i + 1
+        elif fmt[i] in lineMarkers:
+            name, value, i = "marker", fmt[i], i + 1
+        elif fmt[i] in BASE_COLORS:
+            name, value, i = "color", fmt[i], i + 1
+        elif fmt[i] == "C" and fmt[i + 1 : i + 2].isdigit():
+            digits = len(fmt[i + 1 :]) - len(fmt[i + 1 :].lstrip("0123456789"))
+            name, value, i = "color", fmt[i : i + 1 + digits], i + 1 + digits
+        else:
+            raise ValueError(f"Unrecognized character {fmt[i]} in format {fmt!r}")
+        if name in style:
+            raise ValueError(f"Illegal format string {fmt!r}; two {name} symbols")
+        style[name] = value
+
+    if "linestyle" not in style and "marker" not in style:
+        style["linestyle"] = rcParams["lines.linestyle"]
+    style.setdefault("linestyle", "None")
+    style.setdefault("marker", "None")
+    return style
+
+
+def _group_plot(
+    ax: plt.Axes, primitive: Primitive, groups: dict, cycle_colors
+) -> list:
+    """Function to add a plot primitive to a group or draw it as Line2D"""
+    style = {ALIASES.get(k, k): v for k, v in primitive.style.items()}
+    if primitive.fmt:
+        for name, value in _parse_fmt(primitive.fmt).items():
+            style.setdefault(name, value)
+
+    # Lines without a color get the next color of the property cycle like
+    # ax.plot
+    colors = primitive.colors
+    if colors is None:
+        color = style.pop("color", None)
+        if color is None:
+            color = next(cycle_colors)
+        colors = [color] * len(primitive.data)
+    else:
+        style.pop("color", None)
+
+    marker = style.get("marker")
+    linestyle = style.get("linestyle")
+    if ax.name == "polar":
+        # Lines on a polar axes are not merged, as Line2D is interpolated
+        # along the angle while a LineCollection is not.
+        pass
+    elif marker in NO_LINE and set(style) <= LINE_STYLE | {"marker"}:
+        style.pop("marker", None)
+        _append(groups, ("line", style), primitive.data, colors)
+        return []
+    points = marker not in NO_LINE and linestyle in NO_LINE[1:]
+    if points and set(style) <= POINT_STYLE | {"linestyle"}:
+        style.pop("linestyle")
+        _append(groups, ("points", style), primitive.data, colors)
+        return []
+
+    # Anything else is drawn as separate lines
+    artists = []
+    for xy, color in zip(primitive.data, colors):
+        artists.extend(ax.plot(xy[:, 0], xy[:, 1], color=color, **style))
+    return artists
+
+
+def _group_lines(
+    ax: plt.Axes, primitive: Primitive, groups: dict, cycle_colors
+) -> list:
+    """Function to add a lines primitive to a group or draw a LineCollection"""
+    from matplotlib.collections import LineCollection
+
+    style = {COLLECTION_ALIASES.get(k, k): v for k, v in primitive.style.items()}
+    colors = primitive.colors
+    if colors is None:
+        color = style.pop("color", None)
+        if color is None:
+            color = next(cycle_colors)
+        colors = [color] * len(primitive.data)
+    else:
+        style.pop("color", None)
+
+    if set(style) <= LINE_STYLE:
+        _append(groups, ("line", style), primitive.data, colors)
+        return []
+
+    # Other arguments of a LineCollection e.g. capstyle or path_effects
+    kwargs = {
+        k: v
+        for k, v in primitive.style.items()
+        if COLLECTION_ALIASES.get(k, k) != "color"
+    }
+    collection = LineCollection(primitive.data, colors=colors, **kwargs)
+    return [ax.add_collection(collection)]
+
+
+def _materialize(ax: plt.Axes, kind: str, style: dict, data: list, colors: list):
+    """Function to create a single artist for a group of primitives"""
+    if kind == "line":
+        from matplotlib.collections import LineCollection
+
+        segments = [xy for lines in data for xy in lines]
+        return ax.add_collection(LineCollection(segments, colors=colors, **style))
+
+    if kind == "points":
+        from matplotlib import rcParams
+
+        xy = np.concatenate([xy for points in data for xy in points])
+        counts = [len(xy) for points in data for xy in points]
+        style = dict(style)
+        size = style.pop("markersize", rcParams["lines.markersize"])
+        style.setdefault("zorder", 2)
+        colors = [color for color, n in zip(colors, counts) for _ in range(n)]
+        return ax.scatter(xy[:, 0], xy[:, 1], s=size**2, color=colors, **style)
+
+    if kind == "quiver":
+        X, Y, U, V = [np.concatenate(a) for a in zip(*data)]
+        return ax.quiver(X, Y, U, V, color=colors, **style)
+
+    from psp.plotting.artists import TextLayer
+
+    x, y = np.concatenate([d[0] for d in data]), np.concatenate([d[1] for d in data])
+    texts = [s for d in data for s in d[2]]
+    layer = TextLayer(x, y, texts, **style)
+    ax.add_artist(layer)
+    return layer
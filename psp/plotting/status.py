@@ -0,0 +1,195 @@
+import numpy as np
+from psp.plotting.edges import Edges
+
+CHUNK_CHANNELS = 64  # Channels packed at a time when converting an array
+
+
+class StatusMatrix:
+    """
+    A class to store binary status signals with 1 bit per sample.
+
+    The signals are packed with np.packbits along the samples, so a record
+    with 512 channels of 48000 samples takes 3 MB. The class has the same
+    attributes as a comtrade record used by BinaryPlot.add_binary,
+    count_binary and binary_start and can be used in place of the record.
+
+    Attributes
+    ----------
+    packed : np.ndarray
+        Packed signals with the shape (channels, ceil(samples / 8)).
+    n_samples : int
+        Number of samples of each signal.
+    status_channel_ids : list
+        Name of each signal.
+    time : np.ndarray
+        Time of each sample.
+    trigger_time : float
+        Trigger time of the record.
+    """
+
+    def __init__(
+        self,
+        packed: np.ndarray,
+        n_samples: int,
+        status_channel_ids: list = None,
+        time=None,
+        trigger_time: float = 0.0,
+    ):
+        self.packed = packed
+        self.n_samples = n_samples
+        if status_channel_ids is None:
+            status_channel_ids = [str(i) for i in range(len(packed))]
+        self.status_channel_ids = list(status_channel_ids)
+        self.time = np.arange(n_samples) if time is None else np.asarray(time)
+        self.trigger_time = trigger_time
+
+    @classmethod
+    def from_array(
+        cls, status, status_channel_ids: list = None, time=None, trigger_time=0.0
+    ):
+        """
+        Method to create a StatusMatrix from unpacked signals.
+
+        Parameters
+        ----------
+        status : array_like
+            Binary signals with the shape (channels, samples), either as an
+            array or as a sequence of sequences (e.g. record.status). Any
+            non-zero value is considered high.
+        status_channel_ids : list, optional
+            Name of each signal. The default is None resulting in the index.
+        time : array_like, optional
+            Time of each sample. The default is None resulting in the sample
+            index.
+        trigger_time : float, optional
+            Trigger time of the record. The default is 0.0.
+
+        Returns
+        -------
+        StatusMatrix
+
+        """
+        if isinstance(status, np.ndarray):
+            n_channels, n_samples = status.shape
+            rows = (
+                status[i : i + CHUNK_CHANNELS]
+                for i in range(0, n_channels, CHUNK_CHANNELS)
+            )
+        else:
+            # Convert one channel at a time to avoid a full size int array
+            n_channels, n_samples = len(status), len(status[0]) if status else 0
+            rows = (np.asarray(s)[None, :] for s in status)
+
+        packed = np.empty((n_channels, -(-n_samples // 8)), dtype=np.uint8)
+        i = 0
+        for block in rows:
+            packed[i : i + len(block)] = np.packbits(block != 0, axis=1)
+            i += len(block)
+
+        return cls(packed, n_samples, status_channel_ids, time, trigger_time)
+
+    @classmethod
+    def from_record(cls, record):
+        """Method to create a StatusMatrix from a comtrade record"""
+        return cls.from_array(
+            record.status,
+            record.status_channel_ids,
+            record.time,
+            record.trigger_time,
+        )
+
+    @property
+    def status(self):
+        """Unpacked signals with the shape (channels, samples)"""
+        return np.unpackbits(self.packed, axis=1, count=self.n_samples)
+
+    @property
+    def n_channels(self) -> int:
+        return len(self.packed)
+
+    def __len__(self):
+        return self.n_channels
+
+    def channel(self, i: int) -> np.ndarray:
+        """Method to return the unpacked signal of channel i"""
+        return np.unpackbits(self.packed[i], count=self.n_samples)
+
+    def take(self, channels) -> "StatusMatrix":
+        """Method to return a StatusMatrix with a subset of the channels"""
+        channels = np.asarray(channels, dtype=np.intp)
+        return StatusMatrix(
+            self.packed[channels],
+            self.n_samples,
+            [self.status_channel_ids[i] for i in channels],
+            self.time,
+            self.trigger_time,
+        )
+
+    def any(self) -> np.ndarray:
+        """Mask of the channels which are high in at least one sample"""
+        # The padding bits of the last byte are zero
+        return self.packed.any(axis=1)
+
+    def all(self) -> np.ndarray:
+        """Mask of the channels which are high in all samples"""
+        full, rest = divmod(self.n_samples, 8)
+        result = (self.packed[:, :full] == 0xFF).all(axis=1)
+        if rest:
+            mask = (0xFF << (8 - rest)) & 0xFF
+            result &= self.packed[:, full] == mask
+        return result
+
+    def edges(self, start: int = 0, stop: int = None) -> Edges:
+        """
+        Method to find the rising and falling edges of all channels. Only the
+        bytes within the window which contain an edge are unpacked.
+
+        Parameters
+        ----------
+        start : int, optional
+            Index of the first sample in the window. The default is 0.
+        stop : int, optional
+            Index after the last sample in the window. The default is None
+            resulting in the end of the signals.
+
+        Returns
+        -------
+        Edges
+            Rising and falling edges of all channels. The sample indices are
+            relative to the start of the window.
+
+        """
+        stop = self.n_samples if stop is None else min(int(stop), self.n_samples)
+        start = min(max(int(start), 0), stop)
+        first, last = start // 8, -(-stop // 8)
+        n_channels, n_bytes = len(self.packed), last - first
+
+        # An extra low byte gives a falling edge for signals high at the end
+        packed = np.zeros((n_channels, n_bytes + 1), dtype=np.uint8)
+        packed[:, :n_bytes] = self.packed[:, first:last]
+        if stop % 8 and n_bytes:
+            # The samples after the window are low
+            packed[:, n_bytes - 1] &= (0xFF << (8 - stop % 8)) & 0xFF
+
+        # Last bit of the previous byte. The signals are low before the start.
+        previous = np.zeros_like(packed)
+        previous[:, 1:] = packed[:, :-1] & 1
+
+        # A byte without any edge has all bits equal to the previous bit
+        rows, cols = np.nonzero(packed != previous * 0xFF)
+
+        bits = np.empty((len(rows), 9), dtype=np.uint8)
+        bits[:, 0] = previous[rows, cols]
+        bits[:, 1:] = np.unpackbits(packed[rows, cols][:, None], axis=1)
+        idx, bit = np.nonzero(bits[:, 1:] != bits[:, :-1])
+
+        samples = cols[idx] * 8 + bit
+        channels = rows[idx]
+
+        counts = np.bincount(channels[::2], minlength=n_channels)
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        edges = Edges(offsets, samples[::2], samples[1::2], stop - first * 8)
+        if start % 8:
+            # The window starts within the first byte
+            edges = edges.clip(start % 8, stop - first * 8)
+        return edges
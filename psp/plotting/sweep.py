@@ -0,0 +1,235 @@
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+import numpy as np
+from psp.plotting.zones import classify
+
+CHUNK_FAULTS = 65536  # Fault impedances computed and classified at a time
+
+
+@dataclass(frozen=True)
+class FaultSweep:
+    """
+    A class for a grid of faults on a line seen from the local relay.
+
+    The apparent impedance of a fault at the distance m (pu) with the fault
+    resistance Rf is
+
+        Z = m * ZL + Rf * (1 + I_remote / I_local)
+
+    where the current ratio is given by the source impedances Zs = SIR * ZL
+    and Zr = remote_SIR * ZL as (Zs + m * ZL) / (Zr + (1 - m) * ZL). Without a
+    remote source the ratio is zero, so SIR can only be given together with
+    remote_SIR.
+
+    The grid has the shape (len(m), len(Rf), len(SIR)) and is computed in
+    chunks, so the impedances of the full grid are never kept in memory.
+
+    Attributes
+    ----------
+    ZL : complex
+        Impedance of the line (Ohm).
+    m : np.ndarray
+        Distances to the fault in pu of the line.
+    Rf : np.ndarray
+        Fault resistances (Ohm).
+    SIR : np.ndarray
+        Source impedance ratios of the local source. Requires remote_SIR.
+        The default is 1.
+    remote_SIR : float | None
+        Source impedance ratio of the remote source. The default is None
+        resulting in no remote infeed.
+    """
+
+    ZL: complex
+    m: np.ndarray
+    Rf: np.ndarray
+    SIR: np.ndarray = (1.0,)
+    remote_SIR: float = None
+
+    def __post_init__(self):
+        for name in ("m", "Rf", "SIR"):
+            value = np.atleast_1d(np.asarray(getattr(self, name), dtype=float))
+            object.__setattr__(self, name, value)
+        if self.remote_SIR is None and np.any(self.SIR != 1.0):
+            raise ValueError("SIR has no influence without remote_SIR")
+
+    @property
+    def shape(self) -> tuple:
+        return len(self.m), len(self.Rf), len(self.SIR)
+
+    def __len__(self):
+        return int(np.prod(self.shape))
+
+    def impedances(self, start: int = 0, stop: int = None) -> np.ndarray:
+        """
+        Method to return the apparent impedances of a part of the grid.
+
+        Parameters
+        ----------
+        start : int, optional
+            Flat index of the first fault. The default is 0.
+        stop : int, optional
+            Flat index after the last fault. The default is None resulting in
+            the end of the grid.
+
+        Returns
+        -------
+        np.ndarray
+            Complex impedances in the (m, Rf, SIR) order of the grid.
+
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        i, j, k = np.unravel_index(np.arange(start, stop), self.shape)
+        m, Rf = self.m[i], self.Rf[j]
+        if self.remote_SIR is None:
+            return m * self.ZL + Rf
+
+        Zs = self.SIR[k] * self.ZL
+        Zr = self.remote_SIR * self.ZL
+        infeed = (Zs + m * self.ZL) / (Zr + (1 - m) * self.ZL)
+        return m * self.ZL + Rf * (1 + infeed)
+
+    def chunks(self, size: int = CHUNK_FAULTS) -> Iterator[tuple[int, np.ndarray]]:
+        """Generator of (start, impedances) for chunks of the grid"""
+        for start in range(0, len(self), size):
+            yield start, self.impedances(start, start + size)
+
+    def evaluate(self, zones: Iterable, size: int = CHUNK_FAULTS) -> "SweepResult":
+        """
+        Method to find the zone detecting each fault of the grid.
+
+        Parameters
+        ----------
+        zones : Iterable
+            Iterable of shapely polygons in order of priority e.g. the zones
+            of a plot (ComplexPlot.zones).
+        size : int, optional
+            Number of faults classified at a time. The default is 65536.
+
+        Returns
+        -------
+        SweepResult
+            The first zone containing each fault.
+
+        """
+        zones = list(zones)
+        zone = np.empty(len(self), dtype=np.intp)
+        for start, Z in self.chunks(size):
+            zone[start : start + len(Z)] = classify(Z, zones).zone
+        return SweepResult(self, zone.reshape(self.shape), len(zones))
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    """
+    A class with the result of a fault sweep.
+
+    Attributes
+    ----------
+    sweep : FaultSweep
+        The evaluated grid.
+    zone : np.ndarray
+        Index of the first zone containing each fault or -1 if no zone
+        operates. Has the shape of the grid.
+    n_zones : int
+        Number of zones.
+    """
+
+    sweep: FaultSweep
+    zone: np.ndarray
+    n_zones: int
+
+    @property
+    def operates(self) -> np.ndarray:
+        """Mask of the faults detected by any zone"""
+        return self.zone >= 0
+
+    def reach(self, zone: int = None) -> np.ndarray:
+        """
+        Method to return the longest distance detected for each combination
+        of fault resistance and SIR.
+
+        Parameters
+        ----------
+        zone : int, optional
+            Index of the zone. The default is None resulting in any zone.
+
+        Returns
+        -------
+        np.ndarray
+            Distance in pu with the shape (len(Rf), len(SIR)). nan if no
+            fault is detected.
+
+        """
+        detected = self.operates if zone is None else self.zone == zone
+        m = np.where(detected, self.sweep.m[:, None, None], -np.inf).max(axis=0)
+        return np.where(np.isfinite(m), m, np.nan)
+
+    def raster(
+        self, mode: str = "heatmap", zone: int = None, bins: int = 400
+    ) -> tuple[np.ndarray, tuple]:
+        """
+        Method to rasterize the faults in the RX plane.
+
+        The grid is processed in chunks. The first pass finds the extent of
+        the impedances and the second pass bins them.
+
+        Parameters
+        ----------
+        mode : str, optional
+            "heatmap" for the fraction of the faults in each pixel detected by
+            the zone. "scatter" for the first zone detecting any fault in each
+            pixel, where n_zones means that no zone operates.
+            The default is "heatmap".
+        zone : int, optional
+            Index of the zone for the heatmap. The default is None resulting
+            in any zone.
+        bins : int, optional
+            Number of pixels along each axis. The default is 400.
+
+        Returns
+        -------
+        tuple
+            Tuple (image, extent) with the image of the shape (bins, bins) as
+            a masked array and the extent as (xmin, xmax, ymin, ymax). The
+            rows are the bins along the vertical axis (reactance) and the
+            columns the bins along the horizontal axis (resistance), as
+            drawn by imshow with origin="lower".
+
+        """
+        if mode not in ("heatmap", "scatter"):
+            raise ValueError(f"Unknown mode {mode!r}. Use 'heatmap' or 'scatter'.")
+
+        xmin = ymin = np.inf
+        xmax = ymax = -np.inf
+        for _, Z in self.sweep.chunks():
+            xmin, xmax = min(xmin, Z.real.min()), max(xmax, Z.real.max())
+            ymin, ymax = min(ymin, Z.imag.min()), max(ymax, Z.imag.max())
+        # Avoid a zero size extent for grids with a single impedance
+        dx, dy = max(xmax - xmin, 1e-9), max(ymax - ymin, 1e-9)
+
+        first = self.zone.ravel()
+        total = np.zeros(bins * bins)
+        if mode == "heatmap":
+            hits = np.zeros(bins * bins)
+        else:
+            image = np.full(bins * bins, self.n_zones + 1)
+
+        for start, Z in self.sweep.chunks():
+            ix = np.minimum(((Z.real - xmin) / dx * bins).astype(np.intp), bins - 1)
+            iy = np.minimum(((Z.imag - ymin) / dy * bins).astype(np.intp), bins - 1)
+            pixel = iy * bins + ix
+            z = first[start : start + len(Z)]
+            total += np.bincount(pixel, minlength=bins * bins)
+            if mode == "heatmap":
+                detected = z >= 0 if zone is None else z == zone
+                hits += np.bincount(pixel, weights=detected, minlength=bins * bins)
+            else:
+                np.minimum.at(image, pixel, np.where(z < 0, self.n_zones, z))
+
+        empty = (total == 0).reshape(bins, bins)
+        if mode == "heatmap":
+            with np.errstate(invalid="ignore"):
+                image = hits / total
+        image = np.ma.masked_array(image.reshape(bins, bins), mask=empty)
+        return image, (xmin, xmin + dx, ymin, ymin + dy)
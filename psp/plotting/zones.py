@@ -0,0 +1,335 @@
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Iterable
+import numpy as np
+from psp.plotting.edges import Edges
+from psp.plotting.status import StatusMatrix
+
+CHUNK_SAMPLES = 65536  # Samples classified at a time (multiple of 8)
+STRTREE_ZONES = 64  # Use an STRtree to find the candidate zones above this
+
+
+@dataclass(frozen=True)
+class ZoneClassification:
+    """
+    A class with the zone membership of every sample of a trajectory.
+
+    Attributes
+    ----------
+    membership : StatusMatrix
+        Bit-packed membership with a channel for each zone. The channel ids
+        are the zone names and the time is the time of the samples.
+    zone : np.ndarray
+        Index of the first zone containing each sample or -1 for samples
+        outside all zones.
+    """
+
+    membership: StatusMatrix
+    zone: np.ndarray
+
+    @property
+    def names(self) -> list:
+        return self.membership.status_channel_ids
+
+    @property
+    def time(self) -> np.ndarray:
+        return self.membership.time
+
+    @cached_property
+    def edges(self) -> Edges:
+        """Index of the samples where the trajectory enters and leaves each zone"""
+        return self.membership.edges()
+
+    def inside(self, i: int) -> np.ndarray:
+        """Method to return a mask of the samples inside zone i"""
+        return self.membership.channel(i).astype(bool)
+
+    def intervals(self, i: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Method to return the entry and exit times of zone i.
+
+        Parameters
+        ----------
+        i : int
+            Index of the zone.
+
+        Returns
+        -------
+        tuple
+            Tuple (entry, exit) with the time of the first sample inside and
+            the first sample outside the zone for each visit. The exit time is
+            nan if the trajectory ends inside the zone.
+
+        """
+        rising, falling = self.edges.channel(i)
+        time = np.asarray(self.time, dtype=float)
+        exit = np.full(len(falling), np.nan)
+        left = falling < len(time)
+        exit[left] = time[falling[left]]
+        return time[rising], exit
+
+
+def classify(
+    Z: Iterable, zones: Iterable, t: Iterable = None, names: list = None
+) -> ZoneClassification:
+    """
+    Function to find the zones containing each sample of a trajectory.
+
+    The zones are prepared and the trajectory is classified in chunks. For
+    each chunk only the zones whose bounding box overlaps the chunk are
+    tested (found with an STRtree when there are many zones), and only the
+    samples within the bounding box of a zone are passed to
+    shapely.contains_xy.
+
+    Parameters
+    ----------
+    Z : Iterable
+        Complex samples of the trajectory e.g. impedances.
+    zones : Iterable
+        Iterable of shapely polygons.
+    t : Iterable, optional
+        Time of each sample. The default is None resulting in the sample
+        index.
+    names : list, optional
+        Name of each zone. The default is None resulting in "Zone <number>".
+
+    Returns
+    -------
+    ZoneClassification
+        Membership of each sample. Samples on the boundary of a zone are
+        outside the zone.
+
+    """
+    import shapely
+
+    Z = np.asarray(Z, dtype=complex).ravel()
+    x, y = np.ascontiguousarray(Z.real), np.ascontiguousarray(Z.imag)
+    zones = np.array(list(zones), dtype=object)
+    n_zones, n_samples = len(zones), len(Z)
+    if names is None:
+        names = [f"Zone {i + 1}" for i in range(n_zones)]
+
+    shapely.prepare(zones)
+    bounds = shapely.bounds(zones).reshape(n_zones, 4)
+    tree = shapely.STRtree(zones) if n_zones > STRTREE_ZONES else None
+
+    packed = np.zeros((n_zones, -(-n_samples // 8)), dtype=np.uint8)
+    zone = np.full(n_samples, -1, dtype=np.intp)
+
+    for start in range(0, n_samples, CHUNK_SAMPLES):
+        cx = x[start : start + CHUNK_SAMPLES]
+        cy = y[start : start + CHUNK_SAMPLES]
+        cz = zone[start : start + CHUNK_SAMPLES]
+        box = (
+            np.fmin.reduce(cx),
+            np.fmin.reduce(cy),
+            np.fmax.reduce(cx),
+            np.fmax.reduce(cy),
+        )
+        if np.isnan(box).any():
+            # All samples of the chunk are nan
+            continue
+
+        if tree is not None:
+            candidates = np.sort(tree.query(shapely.box(*box)))
+        else:
+            candidates = np.flatnonzero(
+                (bounds[:, 0] <= box[2])
+                & (bounds[:, 2] >= box[0])
+                & (bounds[:, 1] <= box[3])
+                & (bounds[:, 3] >= box[1])
+            )
+
+        for i in candidates:
+            xmin, ymin, xmax, ymax = bounds[i]
+            idx = np.flatnonzero(
+                (cx >= xmin) & (cx <= xmax) & (cy >= ymin) & (cy <= ymax)
+            )
+            if idx.size == 0:
+                continue
+            inside = np.zeros(len(cx), dtype=bool)
+            inside[idx] = shapely.contains_xy(zones[i], cx[idx], cy[idx])
+            packed[i, start // 8 : start // 8 + -(-len(cx) // 8)] = np.packbits(inside)
+            cz[inside & (cz < 0)] = i
+
+    membership = StatusMatrix(packed, n_samples, names, t)
+    return ZoneClassification(membership, zone)
+
+
+@dataclass(frozen=True)
+class Overlaps:
+    """
+    A class with the overlapping pairs of zones of a ZoneRegistry.
+
+    Attributes
+    ----------
+    first, second : np.ndarray
+        Index of the two zones of each pair with first < second.
+    area : np.ndarray
+        Area of the overlap (Ohm^2).
+    ratio : np.ndarray
+        Area of the overlap relative to the area of the smaller zone.
+    geometry : np.ndarray
+        The overlap regions as shapely geometries.
+    """
+
+    first: np.ndarray
+    second: np.ndarray
+    area: np.ndarray
+    ratio: np.ndarray
+    geometry: np.ndarray
+
+    def __len__(self):
+        return len(self.first)
+
+    def take(self, mask) -> "Overlaps":
+        """Method to return a subset of the pairs"""
+        return Overlaps(
+            self.first[mask],
+            self.second[mask],
+            self.area[mask],
+            self.ratio[mask],
+            self.geometry[mask],
+        )
+
+
+class ZoneRegistry:
+    """
+    A class to keep the zones of many relays and find the zones of different
+    relays that overlap.
+
+    The zones are indexed in an STRtree and only the pairs with intersecting
+    bounding boxes are intersected. The overlaps are cached, so adding zones
+    only intersects the new zones with the existing ones.
+
+    Attributes
+    ----------
+    zones : list
+        The zones as shapely polygons.
+    relays : list
+        Name of the relay of each zone.
+    names : list
+        Name of each zone.
+    """
+
+    def __init__(self):
+        self.zones = []
+        self.relays = []
+        self.names = []
+        self._tree = None
+        self._pairs = Overlaps(
+            *[np.empty(0, dtype=t) for t in (np.intp, np.intp, float, float, object)]
+        )
+        self._n_computed = 0
+
+    def __len__(self):
+        return len(self.zones)
+
+    def add(self, relay: str, zones: Iterable, names: list = None) -> np.ndarray:
+        """
+        Method to add the zones of a relay.
+
+        Parameters
+        ----------
+        relay : str
+            Name of the relay.
+        zones : Iterable
+            Iterable of shapely polygons.
+        names : list, optional
+            Name of each zone. The default is None resulting in
+            "<relay> Zone <number>".
+
+        Returns
+        -------
+        np.ndarray
+            Index of the added zones in the registry.
+
+        """
+        zones = [zones] if hasattr(zones, "exterior") else list(zones)
+        if names is None:
+            names = [f"{relay} Zone {i + 1}" for i in range(len(zones))]
+        start = len(self.zones)
+        self.zones.extend(zones)
+        self.relays.extend([relay] * len(zones))
+        self.names.extend(names)
+        self._tree = None
+        return np.arange(start, len(self.zones))
+
+    @property
+    def tree(self):
+        """STRtree of all zones"""
+        import shapely
+
+        if self._tree is None:
+            self._tree = shapely.STRtree(self.zones)
+        return self._tree
+
+    def _update(self):
+        """Method to intersect the zones added since the last update"""
+        import shapely
+
+        if self._n_computed == len(self.zones):
+            return
+
+        zones = np.array(self.zones, dtype=object)
+        new = zones[self._n_computed :]
+        shapely.prepare(zones)
+
+        # Pairs of a new zone and a zone added before it
+        query, tree = self.tree.query(new, predicate="intersects")
+        query += self._n_computed
+        keep = tree < query
+        second, first = query[keep], tree[keep]
+
+        geometry = shapely.intersection(zones[first], zones[second])
+        area = shapely.area(geometry)
+        smaller = np.minimum(shapely.area(zones[first]), shapely.area(zones[second]))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ratio = area / smaller
+
+        # Zones which only touch have no overlap
+        keep = area > 0
+        pairs = Overlaps(first, second, area, ratio, geometry).take(keep)
+        self._pairs = Overlaps(
+            *[
+                np.concatenate((old, added))
+                for old, added in zip(vars(self._pairs).values(), vars(pairs).values())
+            ]
+        )
+        self._n_computed = len(self.zones)
+
+    def overlaps(
+        self, min_area: float = 0.0, same_relay: bool = False, relay: str = None
+    ) -> Overlaps:
+        """
+        Method to return the overlapping pairs of zones.
+
+        Parameters
+        ----------
+        min_area : float, optional
+            Only return overlaps with an area above this value.
+            The default is 0.0.
+        same_relay : bool, optional
+            Include overlaps between zones of the same relay. The default is
+            False.
+        relay : str, optional
+            Only return the overlaps with the zones of this relay. The default
+            is None resulting in all relays.
+
+        Returns
+        -------
+        Overlaps
+            The overlapping pairs sorted by the index of the zones.
+
+        """
+        self._update()
+        pairs = self._pairs
+        relays = np.array(self.relays, dtype=object)
+        mask = pairs.area > min_area
+        if not same_relay:
+            mask &= relays[pairs.first] != relays[pairs.second]
+        if relay is not None:
+            mask &= (relays[pairs.first] == relay) | (relays[pairs.second] == relay)
+
+        pairs = pairs.take(mask)
+        return pairs.take(np.lexsort((pairs.second, pairs.first)))
@@ -0,0 +1,4 @@
+import os
+
+# No windows are opened by the tests
+os.environ.setdefault("MPLBACKEND", "Agg")
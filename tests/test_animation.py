@@ -0,0 +1,71 @@
+import copy
+import shutil
+import numpy as np
+import pytest
+
+shapely = pytest.importorskip("shapely")
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def plot():
+    from psp.plotting import RXplot
+
+    plot = RXplot("Animation", headless=True)
+    plot.add_zone(shapely.box(0, 0, 2, 2))
+    return plot
+
+
+@pytest.fixture
+def Z():
+    return np.linspace(10 + 10j, 1 + 1j, 40)
+
+
+def state(plot) -> tuple:
+    return (
+        copy.deepcopy(vars(plot.extent)),
+        list(plot.ax.ops),
+        plot.ax._cursor,
+        plot.scene._flushed,
+        len(plot._ax.collections) + len(plot._ax.lines),
+    )
+
+
+def assert_state_equal(a: tuple, b: tuple):
+    extent_a, *rest_a = a
+    extent_b, *rest_b = b
+    assert extent_a.keys() == extent_b.keys()
+    for key in extent_a:
+        np.testing.assert_array_equal(extent_a[key], extent_b[key])
+    assert rest_a == rest_b
+
+
+def test_gif_does_not_change_the_plot(plot, Z, tmp_path):
+    reference = copy.deepcopy(plot)
+    before = state(plot)
+    files = plot.save_animation(tmp_path / "a.gif", Z, frames=5, workers=1)
+    assert files == [str(tmp_path / "a.gif")]
+    with Image.open(files[0]) as gif:
+        assert gif.n_frames == 5
+    assert_state_equal(state(plot), before)
+    # The limits of the plot do not include the trajectory
+    assert plot.to_bytes() == reference.to_bytes()
+
+
+def test_image_sequence(plot, Z, tmp_path):
+    files = plot.save_animation(
+        str(tmp_path / "f_{:02d}.png"), Z, frames=4, workers=1
+    )
+    assert files == [str(tmp_path / f"f_{i:02d}.png") for i in range(4)]
+    with Image.open(files[0]) as first, Image.open(files[-1]) as last:
+        assert first.size == last.size
+        assert np.any(np.asarray(first) != np.asarray(last))
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is not installed")
+def test_mp4(plot, Z, tmp_path):
+    before = state(plot)
+    files = plot.save_animation(tmp_path / "a.mp4", Z, frames=5, workers=1)
+    assert files == [str(tmp_path / "a.mp4")]
+    assert (tmp_path / "a.mp4").stat().st_size > 0
+    assert_state_equal(state(plot), before)
@@ -0,0 +1,47 @@
+import numpy as np
+from psp.plotting.artists import TextLayer
+from psp.plotting.figure import create_figure
+
+
+def test_text_layer_extent():
+    fig = create_figure(figsize=(4, 4), headless=True)
+    ax = fig.add_subplot(111)
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+    x, y, texts = [0.1, 0.9, np.nan], [0.5, 0.2, 0.5], ["left", "right", "nan"]
+    layer = TextLayer(x, y, texts, fontsize=12)
+    ax.add_artist(layer)
+    fig.canvas.draw()
+
+    expected = [ax.text(*p, s, fontsize=12) for p, s in zip(zip(x, y), texts[:2])]
+    renderer = fig.canvas.get_renderer()
+    union = [t.get_window_extent(renderer) for t in expected]
+    extent = layer.get_window_extent(renderer)
+    assert extent.x0 == min(b.x0 for b in union)
+    assert extent.x1 == max(b.x1 for b in union)
+    assert extent.y1 == max(b.y1 for b in union)
+    assert layer.get_tightbbox(renderer).bounds == extent.bounds
+
+    layer.set_visible(False)
+    assert layer.get_window_extent(renderer).width == 0
+
+
+def test_text_layer_tight_bbox():
+    from io import BytesIO
+    from PIL import Image
+
+    sizes = []
+    for cls in ("layer", "text"):
+        fig = create_figure(figsize=(4, 4), headless=True)
+        ax = fig.add_subplot(111)
+        ax.set_xlim(0, 1)
+        # A label far outside the axes has to be inside the saved image
+        if cls == "layer":
+            ax.add_artist(TextLayer([2.5], [0.5], ["outside"]))
+        else:
+            ax.text(2.5, 0.5, "outside")
+        buffer = BytesIO()
+        fig.savefig(buffer, format="png", bbox_inches="tight")
+        sizes.append(Image.open(buffer).size)
+    assert sizes[0] == sizes[1]
+    assert sizes[0][0] > 400
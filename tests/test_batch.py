@@ -0,0 +1,34 @@
+import os
+from psp.plotting.batch import PlotJob, render_batch
+from psp.plotting.derived_plot import RXplot
+
+
+def crash(*args, headless=True, **kwargs):
+    os._exit(1)  # A worker dying e.g. from a segfault in a C extension
+
+
+def test_render_batch():
+    jobs = [
+        PlotJob(RXplot, args=(f"plot {i}",)).call("add_point", 1 + 1j)
+        for i in range(3)
+    ]
+    jobs.append(PlotJob(RXplot, args=("fails",)).call("no_such_method"))
+    results = sorted(render_batch(jobs, max_workers=2), key=lambda r: r.index)
+
+    assert [r.ok for r in results] == [True, True, True, False]
+    assert all(r.data.startswith(b"\x89PNG") for r in results[:3])
+    assert "no_such_method" in results[3].error
+
+
+def test_render_batch_worker_dies():
+    jobs = [PlotJob(RXplot, args=("first",)), PlotJob(crash, name="crash")]
+    jobs += [PlotJob(RXplot, args=(f"plot {i}",)) for i in range(4)]
+    results = sorted(
+        render_batch(jobs, max_workers=1, chunksize=1), key=lambda r: r.index
+    )
+
+    assert [r.index for r in results] == list(range(len(jobs)))
+    assert results[0].ok
+    assert not results[1].ok and "BrokenProcessPool" in results[1].error
+    # The jobs after the crash are rendered in a new pool
+    assert results[-1].ok
@@ -0,0 +1,45 @@
+from types import SimpleNamespace
+import numpy as np
+from psp.plotting.binary import count_binary
+
+
+def record(status):
+    return SimpleNamespace(status=status)
+
+
+def test_count_binary():
+    status = [[0, 0, 0, 0], [1, 1, 1, 1], [0, 1, 1, 0], [1, 0, 0, 0]]
+    assert count_binary(record(status)) == (4, 2, 1, 1)
+    assert count_binary(record(np.array(status, dtype=bool))) == (4, 2, 1, 1)
+
+
+def test_count_binary_empty():
+    assert count_binary(record([])) == (0, 0, 0, 0)
+    assert count_binary(record(np.zeros((0, 10)))) == (0, 0, 0, 0)
+
+
+def test_binary_plot_window():
+    from psp.plotting.binary import binary_plot
+    from psp.plotting.figure import create_figure
+    from psp.plotting.status import StatusMatrix
+
+    rng = np.random.default_rng(0)
+    status = np.cumsum(rng.random((12, 500)) < 0.05, axis=1) % 2
+    ids = [f"S{i}" for i in range(12)]
+    time = np.arange(500) / 1000
+    plain = SimpleNamespace(
+        status=status.tolist(), status_channel_ids=ids, time=time, trigger_time=0.1
+    )
+    matrix = StatusMatrix.from_array(status, ids, time, 0.1)
+
+    paths = []
+    for rec in (plain, matrix):
+        ax = create_figure(headless=True).add_subplot(111)
+        collection = binary_plot(ax, rec, window=(0.0031, 0.2507))
+        paths.append([p.vertices for p in collection.get_paths()])
+    assert len(paths[0]) == len(paths[1]) > 0
+    for a, b in zip(*paths):
+        np.testing.assert_array_equal(a, b)
+    # The intervals are clipped to the window
+    vertices = np.concatenate(paths[0])
+    assert vertices[:, 0].min() >= 0.0031 and vertices[:, 0].max() <= 0.2507
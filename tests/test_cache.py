@@ -0,0 +1,97 @@
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from psp.plotting.cache import RenderCache
+from psp.plotting.figure import FigureExport
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = RenderCache(tmp_path / "cache")
+    FigureExport.render_cache = cache
+    yield cache
+    FigureExport.render_cache = None
+
+
+def rx_plot(values, **kwargs):
+    from psp.plotting import RXplot
+
+    plot = RXplot("RX", headless=True)
+    plot.add_plot([0, 1, 2], values, **kwargs)
+    plot.add_phasor(1 + 1j, name="Z")
+    return plot
+
+
+def binary_plot(ids):
+    from psp.plotting import BinaryPlot
+
+    record = SimpleNamespace(
+        status=[[0, 1, 1, 0], [1, 1, 0, 0]],
+        status_channel_ids=ids,
+        time=np.arange(4.0),
+        trigger_time=0.0,
+    )
+    plot = BinaryPlot("Binary", headless=True)
+    plot.add_binary(record)
+    return plot
+
+
+def test_hit_and_miss(cache):
+    data = rx_plot([0, 1, 2]).to_bytes()
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert rx_plot([0, 1, 2]).to_bytes() == data
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    rx_plot([0, 1, 3]).to_bytes()
+    rx_plot([0, 1, 2], color="red").to_bytes()
+    rx_plot([0, 1, 2]).to_bytes(dpi=50)
+    rx_plot([0, 1, 2]).to_bytes(format="svg")
+    assert (cache.hits, cache.misses) == (1, 5)
+    assert cache.hit_rate == pytest.approx(1 / 6)
+
+
+def test_key_of_the_axes_state(cache):
+    # The channel ids are only on the categorical y-axis
+    a, b = binary_plot(["S1", "S2"]), binary_plot(["S3", "S4"])
+    assert cache.key(a, "png") != cache.key(b, "png")
+    assert cache.key(a, "png") == cache.key(binary_plot(["S1", "S2"]), "png")
+    assert a.to_bytes() != b.to_bytes()
+
+    a, b = rx_plot([0, 1, 2]), rx_plot([0, 1, 2])
+    b._ax.set_xticks([0, 1], ["zero", "one"])
+    assert cache.key(a, "png") != cache.key(b, "png")
+
+
+def test_key_of_callables(cache):
+    from matplotlib.ticker import FuncFormatter
+
+    # The labels of a formatter are part of the key
+    a, b = rx_plot([0, 1, 2]), rx_plot([0, 1, 2])
+    b._ax.xaxis.set_major_formatter(FuncFormatter(lambda x, pos: f"{x} Ohm"))
+    assert cache.key(b, "png") not in (None, cache.key(a, "png"))
+
+    # Lambdas with the same name can differ
+    a.ax.set_gid(lambda: 1)
+    assert cache.key(a, "png") is None
+
+
+def test_unhashable_plot_is_not_cached(cache):
+    plot = rx_plot([0, 1, 2])
+    plot.ax.set_gid(object())  # Every object() has the same content
+    assert cache.key(plot, "png") is None
+    assert plot.to_bytes()[:4] == b"\x89PNG"
+    assert (cache.hits, cache.misses) == (0, 0)
+    assert not list(cache.directory.iterdir())
+
+
+def test_eviction(tmp_path):
+    cache = RenderCache(tmp_path, max_bytes=250)
+    for i in range(5):
+        cache.put(f"key{i}", bytes(100))
+    assert sum(f.stat().st_size for f in tmp_path.iterdir()) <= 250
+    assert cache.get("key4") == bytes(100)
+    assert cache.get("key0") is None
+
+    cache.clear()
+    assert not list(tmp_path.iterdir())
+    assert (cache.hits, cache.misses) == (0, 0)
@@ -0,0 +1,122 @@
+import numpy as np
+import pytest
+from psp.plotting.comtrade import Comtrade
+
+RATE = 1000.0
+N_SAMPLES = 40
+ANALOG = ["IA", "VA"]
+STATUS = [f"S{i}" for i in range(18)]  # Two 16 bit status words
+
+
+def write_cfg(path, file_type):
+    lines = [
+        "STATION,DEVICE,1999",
+        f"{len(ANALOG) + len(STATUS)},{len(ANALOG)}A,{len(STATUS)}D",
+        "1,IA,A,,A,0.5,1.0,0,-32767,32767,1,1,P",
+        "2,VA,A,,kV,2.0,0.0,0,-32767,32767,1,1,P",
+        *[f"{i + 1},{name},,,0" for i, name in enumerate(STATUS)],
+        "50",
+        "1",
+        f"{RATE:g},{N_SAMPLES}",
+        "01/02/2020,10:00:00.000000",
+        "01/02/2020,10:00:00.012500",
+        file_type,
+        "1",
+    ]
+    path.write_text("\n".join(lines) + "\n")
+
+
+@pytest.fixture
+def signals():
+    rng = np.random.default_rng(0)
+    analog = rng.integers(-1000, 1000, (N_SAMPLES, len(ANALOG)))
+    status = rng.integers(0, 2, (N_SAMPLES, len(STATUS)))
+    return analog, status
+
+
+@pytest.fixture(params=["BINARY", "ASCII"])
+def record(request, tmp_path, signals):
+    analog, status = signals
+    cfg = tmp_path / "record.cfg"
+    write_cfg(cfg, request.param)
+    samples = np.arange(1, N_SAMPLES + 1)
+    timestamps = np.arange(N_SAMPLES) * 1000
+
+    if request.param == "BINARY":
+        words = np.zeros((N_SAMPLES, 2), dtype=np.uint16)
+        for i in range(len(STATUS)):
+            words[:, i // 16] |= (status[:, i] << (i % 16)).astype(np.uint16)
+        data = np.zeros(N_SAMPLES, Comtrade(cfg, tmp_path / "none.dat").dtype)
+        data["sample"] = samples
+        data["timestamp"] = timestamps
+        data["analog"] = analog
+        data["status"] = words
+        data.tofile(tmp_path / "record.dat")
+    else:
+        table = np.column_stack((samples, timestamps, analog, status))
+        np.savetxt(tmp_path / "record.dat", table, fmt="%d", delimiter=",")
+
+    with Comtrade(cfg) as record:
+        yield record
+
+
+def test_cfg(record):
+    assert record.station_name == "STATION"
+    assert record.rec_dev_id == "DEVICE"
+    assert record.analog_channel_ids == ANALOG
+    assert record.analog_units == ["A", "kV"]
+    assert record.status_channel_ids == STATUS
+    assert record.frequency == 50
+    assert record.n_samples == N_SAMPLES
+    assert record.trigger_time == pytest.approx(0.0125)
+
+
+def test_time(record):
+    np.testing.assert_allclose(record.time, np.arange(N_SAMPLES) / RATE)
+    assert record.window_slice((0.0105, 0.020)) == slice(11, 21)
+    np.testing.assert_allclose(record.get_time((0.0105, 0.020)), record.time[11:21])
+    assert record.window_slice((1.0, 2.0)) == slice(N_SAMPLES, N_SAMPLES)
+
+
+def test_analog(record, signals):
+    analog, _ = signals
+    expected = analog * [0.5, 2.0] + [1.0, 0.0]
+    np.testing.assert_allclose(record.get_analog("IA"), expected[:, 0])
+    np.testing.assert_allclose(record.get_analog(1, raw=True), analog[:, 1])
+    np.testing.assert_allclose(
+        record.get_analog("VA", window=(0.005, 0.009)), expected[5:10, 1]
+    )
+    np.testing.assert_allclose(record.get_analogs(), expected)
+    np.testing.assert_allclose(
+        record.get_analogs(["VA", "IA"], slice(3, 7)), expected[3:7, ::-1]
+    )
+
+
+def test_status(record, signals):
+    _, status = signals
+    matrix = record.get_status()
+    assert matrix.status_channel_ids == STATUS
+    np.testing.assert_array_equal(matrix.status, status.T)
+
+    matrix = record.get_status(["S17", 2], window=(0.010, 0.019))
+    assert matrix.status_channel_ids == ["S17", "S2"]
+    np.testing.assert_array_equal(matrix.status, status[10:20, [17, 2]].T)
+    np.testing.assert_allclose(matrix.time, record.time[10:20])
+    assert matrix.trigger_time == pytest.approx(0.0125)
+
+
+def test_add_analog(record, signals):
+    from psp.plotting import TimeSeriesPlot
+
+    analog, _ = signals
+    plot = TimeSeriesPlot("Analog", headless=True)
+    plot.add_analog(record, "VA", window=(-0.0125, -0.0035))
+    plot.add_analog(record, 0, envelope=True)
+    plot.to_bytes()
+    artists = [*plot._ax.lines, *plot._ax.collections]
+    assert {artist.get_label() for artist in artists} == {"VA", "IA"}
+    (line,) = [artist for artist in artists if artist.get_label() == "VA"]
+    x, y = line.get_segments()[0].T
+    np.testing.assert_allclose(x, np.arange(10) / RATE - 0.0125)
+    np.testing.assert_allclose(y, analog[:10, 1] * 2.0)
+    plot.close()
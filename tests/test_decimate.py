@@ -0,0 +1,64 @@
+import numpy as np
+from psp.plotting.decimate import rdp
+
+
+def max_deviation(x, y, idx):
+    """Largest distance between the curve and the decimated curve"""
+    deviation = 0.0
+    for a, b in zip(idx[:-1], idx[1:]):
+        dx, dy = x[b] - x[a], y[b] - y[a]
+        px, py = x[a:b] - x[a], y[a:b] - y[a]
+        length2 = dx * dx + dy * dy
+        t = np.clip((px * dx + py * dy) / length2, 0, 1) if length2 else 0
+        d = np.hypot(px - t * dx, py - t * dy)
+        deviation = max(deviation, d.max())
+    return deviation
+
+
+def test_rdp():
+    t = np.linspace(0, 10, 5000)
+    x, y = t, np.sin(t)
+    idx = rdp(x, y, 1e-3)
+    assert idx[0] == 0 and idx[-1] == len(t) - 1
+    assert np.all(np.diff(idx) > 0)
+    assert len(idx) < 200
+    assert max_deviation(x, y, idx) <= 1e-3
+
+
+def test_rdp_keep():
+    x = np.linspace(0, 1, 100)
+    idx = rdp(x, 2 * x, 0.1, keep=[17, 50])
+    np.testing.assert_array_equal(idx, [0, 17, 50, 99])
+
+
+def test_rdp_nan_gaps():
+    t = np.linspace(0, 10, 2000)
+    x, y = t.copy(), np.sin(t)
+    y[500:520] = np.nan
+    x[1500] = np.nan
+    idx = rdp(x, y, 1e-3)
+
+    # The gaps remain in the decimated curve
+    finite = np.isfinite(x) & np.isfinite(y)
+    assert {499, 500, 519, 520, 1499, 1500, 1501} <= set(idx)
+    # Each run of finite points is decimated within the tolerance
+    for start, stop in [(0, 500), (520, 1500), (1501, 2000)]:
+        run = idx[(idx >= start) & (idx < stop)] - start
+        assert finite[start:stop].all()
+        assert max_deviation(x[start:stop], y[start:stop], run) <= 1e-3
+    assert len(idx) < 250
+
+
+def test_rdp_reversing_trajectory():
+    # A fault trajectory going out along a line and coming back halfway
+    Z = np.concatenate(
+        (np.linspace(0, 1 + 1j, 101), np.linspace(1 + 1j, 0.5 + 0.5j, 101)[1:])
+    )
+    idx = rdp(Z.real, Z.imag, 0.01)
+    np.testing.assert_array_equal(idx, [0, 100, 200])
+    assert max_deviation(Z.real, Z.imag, idx) <= 0.01
+
+    # The same with enough segments for the vectorized refinement
+    Z = np.tile(Z, 40)
+    idx = rdp(Z.real, Z.imag, 0.01)
+    assert max_deviation(Z.real, Z.imag, idx) <= 0.01
@@ -0,0 +1,24 @@
+import pytest
+from psp.plotting.diff_plot import DiffBiasPlot
+
+
+class BiasPlot(DiffBiasPlot):
+    def _layout(self):
+        self.ax.grid(True)
+
+
+def test_diff_bias_plot():
+    plot = BiasPlot("Bias", headless=True)
+    plot.add_plot([0, 1, 2], [0.2, 0.4, 1.2], color="red", label="Bias")
+    plot.add_point(1 + 0.5j, marker="x")
+    plot.add_textbox(1, 0.5, "Trip")
+    assert len(plot.scene) == 3
+    assert plot._get_xmax() == pytest.approx(2.2)
+
+    plot.to_bytes()
+    ax = plot._ax
+    artists = [*ax.lines, *ax.collections]
+    assert "Bias" in [artist.get_label() for artist in artists]
+    assert len(artists) == 2
+    assert len(ax.artists) == 1  # The TextLayer of the textbox
+    plot.close()
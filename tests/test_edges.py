@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from psp.plotting.edges import find_edges
+
+
+def reference_edges(signal):
+    """Intervals where a signal is high, found sample by sample"""
+    intervals = []
+    start = None
+    for i, value in enumerate(signal):
+        if value and start is None:
+            start = i
+        elif not value and start is not None:
+            intervals.append((start, i))
+            start = None
+    if start is not None:
+        intervals.append((start, len(signal)))
+    return intervals
+
+
+@pytest.fixture
+def status():
+    rng = np.random.default_rng(0)
+    status = rng.random((20, 300)) < 0.1
+    status = np.cumsum(status, axis=1) % 2  # Runs of high and low samples
+    status[0] = 0
+    status[1] = 1
+    status[2, -1] = 1
+    return status
+
+
+def test_find_edges(status):
+    edges = find_edges(status)
+    assert edges.n_channels == 20
+    assert edges.n_samples == 300
+    for i, signal in enumerate(status):
+        rising, falling = edges.channel(i)
+        assert list(zip(rising, falling)) == reference_edges(signal)
+    assert edges.constant_zero[0] and edges.constant_one[1]
+    assert edges.changed[2:].all()
+    first = [r[0][0] if len(r := reference_edges(s)) else -1 for s in status]
+    np.testing.assert_array_equal(edges.first_rising(), first)
+
+
+def test_find_edges_nonzero_is_high():
+    edges = find_edges([[0, 2, -1, 0, 0.5]])
+    np.testing.assert_array_equal(edges.rising, [1, 4])
+    np.testing.assert_array_equal(edges.falling, [3, 5])
+
+
+def test_find_edges_shape():
+    assert find_edges([]).n_channels == 0
+    with pytest.raises(ValueError):
+        find_edges([0, 1, 0])
+
+
+def test_take(status):
+    edges = find_edges(status).take([5, 0, 5])
+    for i, channel in enumerate([5, 0, 5]):
+        rising, falling = edges.channel(i)
+        assert list(zip(rising, falling)) == reference_edges(status[channel])
+
+
+@pytest.mark.parametrize("start, stop", [(0, 300), (17, 123), (150, 151), (80, 80)])
+def test_clip(status, start, stop):
+    edges = find_edges(status).clip(start, stop)
+    assert edges.n_samples == stop - start
+    for i, signal in enumerate(status):
+        rising, falling = edges.channel(i)
+        assert list(zip(rising, falling)) == reference_edges(signal[start:stop])
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from psp.plotting.envelope import PYRAMID_FACTOR, EnvelopePyramid
+
+
+@pytest.fixture
+def signal():
+    rng = np.random.default_rng(3)
+    x = np.arange(200_000) / 10_000
+    y = np.sin(2 * np.pi * 50 * x) + 0.01 * rng.standard_normal(x.size)
+    # Single-sample spikes, which must be visible at every zoom level
+    spikes = rng.choice(x.size, 20, replace=False)
+    y[spikes] = rng.choice([-5.0, 5.0], 20) * rng.uniform(1, 2, 20)
+    y[1000:1100] = np.nan
+    return x, y
+
+
+def test_pyramid_levels_keep_the_peaks(signal):
+    pyramid = EnvelopePyramid(*signal)
+    assert len(pyramid.levels) > 3
+    for level, (mins, maxs) in enumerate(pyramid.levels):
+        size = PYRAMID_FACTOR**level
+        assert len(mins) == -(-len(pyramid.y) // size)
+        assert np.nanmin(mins) == np.nanmin(pyramid.y)
+        assert np.nanmax(maxs) == np.nanmax(pyramid.y)
+
+
+@pytest.mark.parametrize("n", [100, 1000, 5000])
+@pytest.mark.parametrize("window", [(0, 20), (3.3, 7.9), (10, 10.4)])
+def test_query_keeps_the_peaks(signal, n, window):
+    x, y = signal
+    pyramid = EnvelopePyramid(x, y)
+    qx, qy = pyramid.query(*window, n)
+
+    visible = (x >= window[0]) & (x <= window[1])
+    assert np.nanmax(qy) >= np.nanmax(y[visible])
+    assert np.nanmin(qy) <= np.nanmin(y[visible])
+    # Two points for each block, with less than factor blocks per pixel
+    # unless the coarsest level is reached
+    blocks = max(PYRAMID_FACTOR * n, len(pyramid.levels[-1][0]))
+    assert len(qx) <= 2 * blocks + 4
+    assert np.all(np.diff(qx) >= 0)
+
+
+def test_query_returns_the_samples(signal):
+    x, y = signal
+    pyramid = EnvelopePyramid(x, y)
+    # 1000 samples and 300 pixels: less than factor samples per pixel
+    qx, qy = pyramid.query(x[5000], x[5999], 300)
+    np.testing.assert_array_equal(qx, x[4999:6001])
+    np.testing.assert_array_equal(qy, y[4999:6001])
+
+    # factor samples per pixel use the next level
+    qx, qy = pyramid.query(x[5000], x[5999], 1000 // PYRAMID_FACTOR - 1)
+    assert len(qx) < 1000
+
+
+def test_add_waveform_requeries_on_zoom(signal):
+    from psp.plotting import TimeSeriesPlot
+
+    x, y = signal
+    plot = TimeSeriesPlot("Waveform", headless=True)
+    line = plot.add_waveform(x, y)
+    width = plot._pixel_width()
+    points = len(line.get_xdata())
+    assert points <= 2 * PYRAMID_FACTOR * width + 2 * PYRAMID_FACTOR
+    assert np.nanmax(line.get_ydata()) == np.nanmax(y)
+
+    plot._ax.set_xlim(1, 2)
+    zoomed = len(line.get_xdata())
+    assert zoomed != points
+    assert np.nanmax(line.get_ydata()) >= np.nanmax(y[(x >= 1) & (x <= 2)])
+
+    # Close enough the samples are drawn
+    plot._ax.set_xlim(1, 1.01)
+    np.testing.assert_array_equal(line.get_xdata(), x[9999:10102])
+    plot.to_bytes()
+
+
+def test_add_waveform_empty():
+    from psp.plotting import TimeSeriesPlot
+
+    plot = TimeSeriesPlot("Empty", headless=True)
+    assert plot.add_waveform([], []) is None
+    assert plot.waveforms == []
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from psp.plotting.extent import MAX_SKETCHES, Extent
+
+
+def rank(values: np.ndarray, estimate: float) -> float:
+    """Fraction of the values below an estimated percentile"""
+    return np.count_nonzero(values <= estimate) / values.size
+
+
+@pytest.fixture
+def chunks():
+    rng = np.random.default_rng(2)
+    chunks = []
+    for i in range(3 * MAX_SKETCHES):
+        n = rng.integers(1, 3000)
+        x = rng.standard_normal(n) * (1 + i % 7)
+        y = rng.standard_cauchy(n)
+        if i % 5 == 0:
+            x[rng.integers(0, n, n // 10 + 1)] = np.nan
+        chunks.append((x, y))
+    return chunks
+
+
+def test_extent_empty():
+    extent = Extent()
+    assert extent.absmax() == 0.0
+    assert extent.absmax("x", 99) == 0.0
+    extent.update([], [])
+    assert extent.count == 0
+
+
+def test_extent_absmax(chunks):
+    extent = Extent()
+    xabs = yabs = 0.0
+    for x, y in chunks:
+        extent.update(x, y)
+        xabs = max(xabs, np.nanmax(np.abs(x)))
+        yabs = max(yabs, np.max(np.abs(y)))
+        assert extent.absmax("x") == xabs
+        assert extent.absmax("y") == yabs
+        assert extent.absmax() == max(xabs, yabs)
+        assert len(extent._sketches) <= MAX_SKETCHES
+
+    X = np.concatenate([c[0] for c in chunks])
+    Y = np.concatenate([c[1] for c in chunks])
+    assert extent.count == X.size
+    assert (extent.xmin, extent.xmax) == (np.nanmin(X), np.nanmax(X))
+    assert (extent.ymin, extent.ymax) == (Y.min(), Y.max())
+
+
+@pytest.mark.parametrize("percentile", [50, 90, 99, 99.9])
+def test_extent_percentile(chunks, percentile):
+    extent = Extent()
+    for x, y in chunks:
+        extent.update(x, y)
+    # The sketches were merged
+    assert len(extent._sketches) < len(chunks)
+
+    X = np.abs(np.concatenate([c[0] for c in chunks]))
+    Y = np.abs(np.concatenate([c[1] for c in chunks]))
+    X = X[~np.isnan(X)]
+    for axis, values in (("x", X), ("y", Y)):
+        estimate = extent.absmax(axis, percentile)
+        tolerance = 0.02 if percentile < 99 else 0.002
+        assert rank(values, estimate) == pytest.approx(percentile / 100, abs=tolerance)
+    assert extent.absmax("xy", percentile) == max(
+        extent.absmax("x", percentile), extent.absmax("y", percentile)
+    )
+
+
+def test_extent_small_chunks_are_exact():
+    extent = Extent()
+    x = np.arange(1, 41, dtype=float)
+    extent.update(x, -x)
+    extent.update(np.nan, np.nan)
+    assert extent.absmax(percentile=100) == 40
+    assert extent.absmax("x", 50) == np.percentile(x, 50, method="inverted_cdf")
+    assert extent.absmax() == 40
+
+
+def test_plot_limits_follow_the_data():
+    from psp.plotting import RXplot
+
+    plot = RXplot("Extent", headless=True)
+    plot.add_phasor(3 - 4j)
+    plot.add_plot([0, -7, np.nan], [1, 2, 5])
+    plot.add_point(2 + 6j)
+    # The maximum of the absolute coordinates like the former coordinates list
+    assert plot._get_rmax() == pytest.approx(1.1 * 7)
+    assert plot._get_xmax() == pytest.approx(1.1 * 7)
+    assert plot._get_ymax() == pytest.approx(1.1 * 6)
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+from psp.plotting.fakeax import FakeAx, loads, replay
+from psp.plotting.figure import create_figure
+
+
+def fake_ax():
+    return FakeAx(create_figure(headless=True).add_subplot(111))
+
+
+def test_coalesce_title_loc():
+    ax = fake_ax()
+    ax.set_title("a", loc="left")
+    ax.set_title("b", loc="right")
+    ax.set_title("c")
+    ax.set_title("d", loc="left")
+    assert [op.args[0] for op in ax.ops] == ["b", "c", "d"]
+
+    ax.overwrite()
+    axes = ax.axes
+    assert axes.get_title("left") == "d"
+    assert axes.get_title("right") == "b"
+    assert axes.get_title() == "c"
+
+
+def test_coalesce_same_arguments_only():
+    ax = fake_ax()
+    ax.set_xlabel("a", fontsize=20)
+    ax.set_xlabel("b")
+    ax.set_xlabel("c")
+    assert [op.args[0] for op in ax.ops] == ["a", "c"]
+    ax.overwrite()
+    assert ax.axes.get_xlabel() == "c"
+    assert ax.axes.xaxis.label.get_fontsize() == 20
+
+    # Applied ops are not changed
+    ax.set_xlabel("d")
+    assert [op.args[0] for op in ax.ops] == ["a", "c", "d"]
+
+
+def test_coalesce_limits():
+    ax = fake_ax()
+    ax.set_xlim(left=1)
+    ax.set_xlim(0, 5)
+    ax.set_xlim([0, 10])
+    ax.set_ylim(bottom=2)
+    assert [op.name for op in ax.ops] == ["set_xlim", "set_ylim"]
+    np.testing.assert_array_equal(ax.ops[0].args[0], [0, 10])
+
+
+def test_dumps_loads_replay():
+    ax = fake_ax()
+    ax.plot(np.arange(5), np.arange(5.0) ** 2, "--", color="red", label="a")
+    ax.scatter(np.array([1, 2]), np.array([3, 4]), s=np.float32(20))
+    ax.set_title("Title", loc="left")
+    ax.set_xlim(np.int64(0), 10)
+    ax.grid(True)
+    ax.legend()
+
+    ops = loads(ax.dumps())
+    assert [op.name for op in ops] == [op.name for op in ax.ops]
+    assert isinstance(ops[0].args[0], np.ndarray)
+    assert ops[0].args[0].dtype == np.arange(5).dtype
+    np.testing.assert_array_equal(ops[0].args[1], np.arange(5.0) ** 2)
+    assert ops[0].kwargs == {"color": "red", "label": "a"}
+    assert loads(ax.dumps(start=3)) == ops[3:]
+
+    ax.overwrite()
+    other = create_figure(headless=True).add_subplot(111)
+    replay(other, ops)
+    for axes in (ax.axes, other):
+        (line,) = axes.lines
+        np.testing.assert_array_equal(line.get_ydata(), [0, 1, 4, 9, 16])
+        assert line.get_linestyle() == "--"
+        assert axes.get_title("left") == "Title"
+        assert axes.get_xlim() == (0, 10)
+        assert len(axes.collections) == 1
+        assert axes.get_legend() is not None
+
+
+def test_dumps_complex_and_unsupported():
+    ax = fake_ax()
+    ax.annotate("z", xy=(1, 2), xytext=(3, 4))
+    ax.text(0, 0, "x", gid=1 + 2j)
+    ops = loads(ax.dumps())
+    assert ops[0].kwargs["xy"] == [1, 2]  # JSON has no tuples
+    assert ops[1].kwargs["gid"] == 1 + 2j
+
+    ax.add_artist(object())
+    with pytest.raises(TypeError):
+        ax.dumps()
+
+
+def test_overwrite_applies_ops_once():
+    ax = fake_ax()
+    ax.plot([0, 1], [0, 1])
+    ax.overwrite()
+    ax.overwrite()
+    ax.plot([0, 1], [1, 0])
+    ax.overwrite()
+    assert len(ax.axes.lines) == 2
@@ -0,0 +1,51 @@
+import matplotlib.pyplot as plt
+import pytest
+from psp.plotting import RXplot
+from psp.plotting.combine import CombineFigure
+
+
+@pytest.fixture
+def combined():
+    figure = CombineFigure(1, 2, headless=True)
+    plots = []
+    for i in range(2):
+        plot = RXplot(f"Plot {i}", ax=figure.add_axis())
+        plot.add_phasor(1 + 1j * i, name="U")
+        figure.attach(plot)
+        plots.append(plot)
+    return figure, plots
+
+
+def test_close_sub_plot_keeps_the_shared_figure(combined):
+    figure, plots = combined
+    plots[0].close()
+    assert figure.fig.axes == figure.axes
+    assert figure.to_bytes()
+
+    with figure:
+        pass
+    assert figure.fig.axes == []
+
+
+def test_close_own_figure():
+    plot = RXplot("Own", headless=True)
+    plot.close()
+    assert plot.fig.axes == []
+
+    plot = RXplot("Pyplot")
+    assert plt.fignum_exists(plot.fig.number)
+    plot.close()
+    assert not plt.fignum_exists(plot.fig.number)
+
+
+def test_show_renders_the_attached_plots(combined, monkeypatch):
+    figure, plots = combined
+    shown = []
+    monkeypatch.setattr(plt, "show", lambda *args, **kwargs: shown.append(True))
+
+    figure.show()
+    assert shown == [True]
+    for plot in plots:
+        assert plot.ax._cursor == len(plot.ax.ops)
+        assert len(plot._ax.collections) > 0
+        assert plot._ax.get_title() == plot.title
@@ -0,0 +1,44 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parents[1]
+# Budget for importing psp.plotting. Without matplotlib, shapely and numpy
+# it takes a few milliseconds, while matplotlib.pyplot alone takes several
+# hundred.
+IMPORT_BUDGET = 0.15  # seconds
+
+SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import psp.plotting
+duration = time.perf_counter() - start
+{access}
+print(json.dumps({{"duration": duration, "modules": sorted(sys.modules)}}))
+"""
+
+
+def run(access: str = "") -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", SCRIPT.format(access=access)],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=ROOT,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def test_import_is_lazy():
+    result = run()
+    modules = set(result["modules"])
+    assert "matplotlib.pyplot" not in modules
+    assert "matplotlib" not in modules
+    assert "shapely" not in modules
+    assert result["duration"] < IMPORT_BUDGET
+
+
+def test_plot_class_is_loaded_on_access():
+    result = run("psp.plotting.RXplot")
+    assert "psp.plotting.derived_plot" in result["modules"]
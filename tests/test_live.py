@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+from psp.plotting.live import RingBuffer, replay
+
+
+def test_ring_buffer_wrap_around():
+    buffer = RingBuffer(5, dtype=float)
+    assert len(buffer) == 0 and buffer.view().size == 0
+
+    stream = []
+    for values in ([1, 2], [3], [4, 5, 6, 7], [], [8, 9, 10, 11, 12, 13, 14], [15]):
+        buffer.extend(values)
+        stream += values
+        np.testing.assert_array_equal(buffer.view(), stream[-5:])
+        assert len(buffer) == min(len(stream), 5)
+    assert buffer.count == 15
+
+
+def test_ring_buffer_view_is_not_a_copy():
+    buffer = RingBuffer(4)
+    buffer.extend(np.arange(7) * 1j)
+    view = buffer.view()
+    assert np.shares_memory(view, buffer._data)
+    np.testing.assert_array_equal(view, [3j, 4j, 5j, 6j])
+    buffer.extend(7j)
+    np.testing.assert_array_equal(buffer.view(), [4j, 5j, 6j, 7j])
+
+
+def test_replay():
+    times = np.arange(0, 1, 0.001)
+    values = np.arange(len(times))
+    frames = list(replay(times, values, fps=10, realtime=False))
+    # The first frame has the sample at t = 0 and the last frame at t = 1
+    assert len(frames) == 11
+    assert [t for t, _ in frames] == pytest.approx(np.arange(11) / 10)
+    np.testing.assert_array_equal(frames[0][1], [0])
+    np.testing.assert_array_equal(np.concatenate([v for _, v in frames]), values)
+    assert list(replay([], [])) == []
+
+
+def red_pixels(canvas) -> int:
+    rgba = np.asarray(canvas.buffer_rgba())
+    return np.count_nonzero(
+        (rgba[..., 0] > 200) & (rgba[..., 1] < 50) & (rgba[..., 2] < 50)
+    )
+
+
+@pytest.fixture
+def live():
+    from psp.plotting import RXplot
+    from psp.plotting.live import LivePlot
+
+    plot = RXplot("Live", headless=True)
+    live = LivePlot(plot, rmax=10)
+    live.add_phasors(3, names=["A", "B", "C"], colors="k")
+    live.add_trajectory("Z", tail=4, color="red", linewidth=3)
+    yield live
+    live.close()
+
+
+def test_live_plot_update(live):
+    canvas = live.plot.fig.canvas
+    assert live._background is None
+
+    live.update(phasors=[1, 1j, -1], trajectories={"Z": [1 + 1j, 2 + 2j]})
+    # The background is captured by the first full draw
+    assert live._background is not None
+    assert live.frames == 1
+    # The limits include rmax
+    assert live.plot._ax.get_xlim()[1] >= 10
+    np.testing.assert_allclose(live._quiver.U, [1, 0, -1])
+    np.testing.assert_allclose(live._quiver.V, [0, 1, 0])
+    np.testing.assert_allclose(live._labels.x, [1, 0, -1])
+    _, line, marker = live._trajectories["Z"]
+    np.testing.assert_allclose(line.get_xydata(), [[1, 1], [2, 2]])
+    np.testing.assert_allclose(marker.get_xydata(), [[2, 2]])
+    drawn = red_pixels(canvas)
+    assert drawn > 0
+
+    background = live._background
+    for i in range(3, 8):
+        live.update(phasors=[i, 1j, -1], trajectories={"Z": complex(i, i)})
+    assert live.frames == 6
+    assert live._background is background
+    np.testing.assert_allclose(live._quiver.U, [7, 0, -1])
+    # Only the tail of 4 samples is drawn
+    np.testing.assert_allclose(line.get_xdata(), [4, 5, 6, 7])
+    np.testing.assert_allclose(marker.get_xdata(), [7])
+    assert live.fps > 0
+
+    # The background has the static content only e.g. the legend entry
+    canvas.restore_region(background)
+    assert red_pixels(canvas) < drawn
+
+
+def test_live_plot_draw_event_refreshes_the_background(live):
+    canvas = live.plot.fig.canvas
+    live.update(phasors=[1, 1j, -1], trajectories={"Z": [1 + 1j]})
+    background = live._background
+
+    # A full draw e.g. after a resize stores a new background and draws the
+    # live artists on top of it
+    live.plot.fig.set_size_inches(6, 6)
+    canvas.draw()
+    assert live._background is not background
+    assert red_pixels(canvas) > 0
+    live.update(trajectories={"Z": [2 + 2j]})
+    assert live.frames == 2
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from psp.plotting.phasor import dft, loop_impedances, stream_phasors
+
+N = 20  # Samples per cycle
+
+
+def reference_dft(x, half_cycle=False):
+    """Fundamental phasor of each window from an FFT of the window"""
+    W = N // 2 if half_cycle else N
+    phasors = []
+    for k in range(len(x) - W + 1):
+        if half_cycle:
+            # Bin 1 of a full cycle with only the first half of the samples
+            window = np.concatenate((x[k : k + W], np.zeros(N - W)))
+        else:
+            window = x[k : k + W]
+        X = np.fft.fft(window, axis=0)[1]
+        # The reference of the phasors is the absolute sample index
+        phasors.append(X * np.exp(-2j * np.pi * k / N) * np.sqrt(2) / W)
+    return np.array(phasors)
+
+
+@pytest.fixture
+def signal():
+    rng = np.random.default_rng(0)
+    n = np.arange(200)
+    x = 100 * np.cos(2 * np.pi * n / N + 0.3)
+    x += 20 * np.cos(2 * np.pi * 3 * n / N) + 5 * np.exp(-n / 50)
+    return x + rng.standard_normal(len(n))
+
+
+@pytest.mark.parametrize("half_cycle", [False, True])
+def test_dft_matches_fft(signal, half_cycle):
+    np.testing.assert_allclose(
+        dft(signal, N, half_cycle), reference_dft(signal, half_cycle), atol=1e-9
+    )
+
+
+def test_dft_steady_state():
+    n = np.arange(100)
+    x = np.column_stack(
+        [np.sqrt(2) * 10 * np.cos(2 * np.pi * n / N + a) for a in (0, -2.1, 2.1)]
+    )
+    phasors = dft(x, N)
+    assert phasors.shape == (100 - N + 1, 3)
+    expected = 10 * np.exp(1j * np.array([0, -2.1, 2.1]))
+    np.testing.assert_allclose(phasors, np.broadcast_to(expected, phasors.shape))
+    assert dft(x[: N - 1], N).shape == (0, 3)
+    with pytest.raises(ValueError):
+        dft(x, 15, half_cycle=True)
+
+
+def test_stream_phasors(signal):
+    chunks = np.array_split(signal, [7, 8, 50, 121])
+    stream = np.concatenate(list(stream_phasors(chunks, N, step=3)))
+    np.testing.assert_allclose(stream, dft(signal, N)[::3], atol=1e-9)
+
+
+def test_loop_impedances():
+    I = np.array([[1, 2j, -1 - 1j]])
+    Z = np.array([2 + 5j, 1 + 4j, 3 + 6j])
+    V = I * Z
+    np.testing.assert_allclose(loop_impedances(V, I)[0, :3], Z)
+    k0 = 0.5
+    residual = I.sum()
+    np.testing.assert_allclose(
+        loop_impedances(V, I, k0)[0, :3], V[0] / (I[0] + k0 * residual)
+    )
+    np.testing.assert_allclose(
+        loop_impedances(V, I)[0, 3], (V[0, 0] - V[0, 1]) / (I[0, 0] - I[0, 1])
+    )
@@ -0,0 +1,130 @@
+import numpy as np
+import pytest
+from psp.plotting.figure import create_figure
+from psp.plotting.plotfunc import (
+    arrow,
+    fortescue,
+    inverse_fortescue,
+    line_to_phase,
+    phase_to_line,
+)
+from psp.plotting.scene import Scene
+
+
+@pytest.fixture
+def ax():
+    return create_figure(headless=True).add_subplot(111)
+
+
+def test_arrow_single_quiver(ax):
+    x = np.linspace(0, 10, 101)
+    quiver = arrow(ax, x, np.zeros_like(x), n=4, color="r")
+    assert list(ax.collections) == [quiver]
+    np.testing.assert_allclose(quiver.get_offsets(), [[2, 0], [4, 0], [6, 0], [8, 0]])
+    np.testing.assert_allclose(quiver.U, 1)
+    np.testing.assert_allclose(quiver.V, 0)
+
+
+def test_arrow_equal_arc_length(ax):
+    # Unevenly sampled, so the arrows are not at equally spaced indices
+    t = np.linspace(0, 1, 50) ** 3 * 2 * np.pi
+    quiver = arrow(ax, np.cos(t), np.sin(t), n=7)
+    angle = np.unwrap(np.angle(quiver.get_offsets() @ [1, 1j]))
+    np.testing.assert_allclose(np.diff(angle), 2 * np.pi / 8, rtol=0.01)
+    # Tangent to the circle
+    direction = np.angle(quiver.U + 1j * quiver.V)
+    np.testing.assert_allclose(np.cos(direction - angle - np.pi / 2), 1, atol=1e-2)
+
+
+def test_arrow_nan_gaps(ax):
+    x = np.array([0, 1, 2, 3, 4, np.nan, 6, 7, 8, 9, 10])
+    quiver = arrow(ax, x, np.zeros_like(x), n=3)
+    # The arc length is 8 with the gap left out
+    np.testing.assert_allclose(quiver.get_offsets(), [[2, 0], [6, 0], [8, 0]])
+    assert np.all(np.isfinite(quiver.U)) and np.all(np.isfinite(quiver.V))
+
+    y = np.where(np.arange(11) % 4 == 1, np.nan, np.arange(11.0))
+    quiver = arrow(ax, np.arange(11.0), y, n=5)
+    assert np.all(np.isfinite(quiver.get_offsets()))
+
+
+def test_arrow_degenerate(ax):
+    assert arrow(ax, [1], [1]) is None
+    assert arrow(ax, [1, 1, 1], [2, 2, 2]) is None
+    assert arrow(ax, [np.nan, np.nan], [0, 1]) is None
+    assert len(ax.collections) == 0
+
+
+def test_arrow_on_scene():
+    scene = Scene()
+    x = np.linspace(0, 10, 101)
+    arrow(scene, x, x, n=3)
+    (primitive,) = scene.primitives
+    assert primitive.kind == "quiver"
+    assert len(primitive.data[0]) == 3
+
+
+A = np.exp(2j * np.pi / 3)
+
+
+@pytest.fixture
+def phases():
+    rng = np.random.default_rng(4)
+    return rng.standard_normal((50, 3)) + 1j * rng.standard_normal((50, 3))
+
+
+def scalar_fortescue(xA, xB, xC):
+    return (
+        (xA + xB + xC) / 3,
+        (xA + A * xB + A**2 * xC) / 3,
+        (xA + A**2 * xB + A * xC) / 3,
+    )
+
+
+def test_fortescue_round_trip(phases):
+    sequence = fortescue(phases)
+    assert sequence.shape == phases.shape
+    np.testing.assert_allclose(inverse_fortescue(sequence), phases)
+    np.testing.assert_allclose(fortescue(inverse_fortescue(phases)), phases)
+
+
+def test_fortescue_forms(phases):
+    expected = np.array([scalar_fortescue(*x) for x in phases])
+    np.testing.assert_allclose(fortescue(phases), expected)
+    np.testing.assert_allclose(np.column_stack(fortescue(*phases.T)), expected)
+    for x, e in zip(phases[:3], expected):
+        np.testing.assert_allclose(fortescue(*x), e)
+        np.testing.assert_allclose(inverse_fortescue(*e), x)
+    np.testing.assert_allclose(np.column_stack(inverse_fortescue(*expected.T)), phases)
+
+    # A balanced positive sequence system
+    x0, x1, x2 = fortescue(1, A**2, A)
+    np.testing.assert_allclose([x0, x1, x2], [0, 1, 0], atol=1e-12)
+
+
+def test_phase_to_line_round_trip(phases):
+    lines = phase_to_line(phases)
+    assert lines.shape == phases.shape
+    np.testing.assert_allclose(lines.sum(axis=1), 0, atol=1e-12)
+    # Up to the zero sequence, which the line quantities do not contain
+    zero = phases.mean(axis=1, keepdims=True)
+    np.testing.assert_allclose(line_to_phase(lines), phases - zero)
+    np.testing.assert_allclose(phase_to_line(line_to_phase(lines)), lines)
+
+
+def test_phase_to_line_forms(phases):
+    expected = np.array([(a - b, b - c, c - a) for a, b, c in phases])
+    np.testing.assert_allclose(phase_to_line(phases), expected)
+    np.testing.assert_allclose(np.column_stack(phase_to_line(*phases.T)), expected)
+    np.testing.assert_allclose(phase_to_line(*phases[0]), expected[0])
+
+    np.testing.assert_allclose(
+        np.column_stack(line_to_phase(*expected.T)), line_to_phase(expected)
+    )
+    np.testing.assert_allclose(line_to_phase(*expected[0]), line_to_phase(expected)[0])
+
+
+def test_three_phase_shape():
+    for function in (fortescue, inverse_fortescue, phase_to_line, line_to_phase):
+        with pytest.raises(ValueError):
+            function(np.ones((5, 2)))
@@ -0,0 +1,142 @@
+import numpy as np
+import pytest
+from psp.plotting.pq_plot import P, Q, map_PQ, transfer_PQ, zone_samples
+
+shapely = pytest.importorskip("shapely")
+
+
+@pytest.fixture
+def zone():
+    # A zone with a vertex close to the origin, where the mapping changes fast
+    return shapely.Polygon([(0.05, 0.05), (10, 0.05), (10, 10), (0.05, 10)])
+
+
+def test_map_pq_scalar_formula(zone):
+    (z,) = zone_samples([zone], n=50)
+    Un = 110e3
+    (S,) = map_PQ([z], Un)
+    expected = [abs(Un) ** 2 / np.conj(zi) / 1e6 for zi in z]
+    np.testing.assert_allclose(S, expected)
+    np.testing.assert_allclose(
+        S.real, [P(Un, (zi.real, zi.imag)) / 1e6 for zi in z], rtol=1e-12
+    )
+    np.testing.assert_allclose(
+        S.imag, [Q(Un, (zi.real, zi.imag)) / 1e6 for zi in z], rtol=1e-12
+    )
+
+
+def test_zone_samples_refinement(zone):
+    rel_tol = 0.02
+    (z,) = zone_samples([zone], n=100, rel_tol=rel_tol)
+
+    # The vertices are kept
+    for x, y in zone.exterior.coords:
+        assert np.any(np.isclose(z, complex(x, y)))
+    # The step is below rel_tol of the distance to the origin
+    step = np.abs(np.diff(z))
+    radius = np.minimum(np.abs(z[:-1]), np.abs(z[1:]))
+    assert np.all(step <= rel_tol * radius * (1 + 1e-9))
+    # Densified close to the origin, where 100 equally spaced samples have
+    # a step of 0.4
+    coarse = zone_samples([zone], n=100, rel_tol=np.inf)[0]
+    assert np.count_nonzero(np.abs(coarse) < 1) < 15
+    assert np.count_nonzero(np.abs(z) < 1) > 200
+
+
+def test_zone_samples_origin():
+    zone = shapely.Polygon([(0, 0), (10, 0), (10, 10)])
+    (z,) = zone_samples([zone], n=100)
+    assert np.all(z != 0)
+    assert np.any(np.isclose(z, 10)) and np.any(np.isclose(z, 10 + 10j))
+
+
+def test_zone_samples_several_zones(zone):
+    other = shapely.box(2, 2, 4, 4)
+    samples = zone_samples([zone, other], n=100)
+    assert len(samples) == 2
+    np.testing.assert_allclose(samples[1], zone_samples([other], n=100)[0])
+    assert zone_samples([]) == []
+
+
+def test_transfer_pq_voltage_array(zone):
+    Un = np.array([100e3, 110e3, 120e3])
+    P_, Q_ = transfer_PQ(zone, Un, n=100)
+    assert P_.shape == Q_.shape and P_.shape[0] == 3
+    for i, u in enumerate(Un):
+        p, q = transfer_PQ(zone, u, n=100)
+        assert p.shape == (P_.shape[1],)
+        np.testing.assert_allclose(P_[i], p)
+        np.testing.assert_allclose(Q_[i], q)
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Zones sampled and mapped by PQPlot"""
+    from psp.plotting import derived_plot
+
+    calls = {"sampled": [], "mapped": []}
+
+    def sample(zones, *args):
+        calls["sampled"].extend(zones)
+        return zone_samples(zones, *args)
+
+    def map_(samples, Un):
+        calls["mapped"].append((len(samples), tuple(np.atleast_1d(Un))))
+        return map_PQ(samples, Un)
+
+    monkeypatch.setattr(derived_plot, "zone_samples", sample)
+    monkeypatch.setattr(derived_plot, "map_PQ", map_)
+    return calls
+
+
+def test_pq_plot_cache(zone, calls):
+    from psp.plotting import PQPlot
+
+    zones = [zone, shapely.box(2, 2, 4, 4)]
+    plot = PQPlot("PQ", headless=True, n=100)
+    first = plot.add_zones(zones, 110e3, relay="A")
+    assert calls == {"sampled": zones, "mapped": [(2, (110e3,))]}
+    segments = first.get_segments()
+    assert len(segments) == 2
+
+    # The same polygons and voltage are neither sampled nor mapped again
+    second = plot.add_zones(zones, 110e3, relay="B")
+    assert calls == {"sampled": zones, "mapped": [(2, (110e3,))]}
+    for a, b in zip(segments, second.get_segments()):
+        np.testing.assert_array_equal(a, b)
+
+    # Only the new voltage is mapped, with the cached samples
+    plot.set_voltage([110e3, 220e3])
+    assert calls == {"sampled": zones, "mapped": [(2, (110e3,)), (2, (110e3, 220e3))]}
+    for collection in (first, second):
+        new = collection.get_segments()
+        assert len(new) == 4
+        np.testing.assert_allclose(new[1], 4 * new[0])
+        np.testing.assert_allclose(new[0], segments[0])
+    assert plot.relays["A"][1].tolist() == [110e3, 220e3]
+
+    # A voltage mapped before is taken from the cache
+    n = len(calls["mapped"])
+    plot.set_voltage(220e3, relay="A")
+    assert len(calls["mapped"]) == n
+    np.testing.assert_allclose(first.get_segments()[0], 4 * segments[0])
+    assert len(second.get_segments()) == 4
+
+
+def test_pq_plot_autoscale(zone):
+    from psp.plotting import PQPlot
+
+    plot = PQPlot("PQ", headless=True, n=100)
+    plot.add_zones(zone, 110e3)
+    plot._render()
+    xlim = plot._ax.get_xlim()
+
+    vertices = np.array([complex(x, y) for x, y in zone.exterior.coords])
+    S = map_PQ([vertices], 220e3)[0]
+    plot.set_voltage(220e3)
+    plot.autoscale()
+    plot.ax.overwrite()
+    # The limits follow the mapped vertices at the new voltage
+    np.testing.assert_allclose(plot._ax.get_xlim()[1], 4 * xlim[1])
+    assert plot._ax.get_xlim()[1] >= 1.1 * np.abs(np.r_[S.real, S.imag]).max() - 1e-9
+    plot.to_bytes()
@@ -0,0 +1,123 @@
+import matplotlib
+import numpy as np
+import pytest
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
+from psp.plotting.figure import create_figure
+from psp.plotting.scene import Scene, _parse_fmt
+
+
+@pytest.mark.parametrize(
+    "fmt, expected",
+    [
+        ("--k", {"linestyle": "--", "marker": "None", "color": "k"}),
+        ("C1o", {"linestyle": "None", "marker": "o", "color": "C1"}),
+        ("ro-", {"linestyle": "-", "marker": "o", "color": "r"}),
+        ("-.", {"linestyle": "-.", "marker": "None"}),
+        ("1", {"linestyle": "None", "marker": "1"}),
+        ("red", {"color": "red"}),
+        ("0.5", {"color": "0.5"}),
+    ],
+)
+def test_parse_fmt(fmt, expected):
+    assert _parse_fmt(fmt) == expected
+
+
+@pytest.mark.parametrize("fmt", ["--:", "rk", "q"])
+def test_parse_fmt_invalid(fmt):
+    with pytest.raises(ValueError):
+        _parse_fmt(fmt)
+
+
+def line_colors(ax):
+    colors = [to_rgba(line.get_color()) for line in ax.lines]
+    for collection in ax.collections:
+        colors += [tuple(c) for c in collection.get_colors()]
+    return colors
+
+
+def test_color_cycle():
+    with matplotlib.rc_context({"axes.prop_cycle": matplotlib.cycler(color="rgb")}):
+        scene = Scene()
+        scene.plot([0, 1], [0, 1])
+        scene.plot([0, 1], [1, 2], "--")
+        ax = create_figure(headless=True).add_subplot(111)
+        scene.flush(ax)
+        # The cycle continues on the next flush
+        scene.plot([0, 1], [2, 3], marker="o")
+        scene.flush(ax)
+        # Another axes starts with the first color
+        other = create_figure(headless=True).add_subplot(111)
+        scene.render(other)
+
+    rgb = [to_rgba(c) for c in "rgb"]
+    assert sorted(line_colors(ax)) == sorted(rgb)
+    assert sorted(line_colors(other)) == sorted(rgb)
+    assert [to_rgba(line.get_color()) for line in ax.lines] == [rgb[2]]
+
+
+def test_merge_unlabelled_only():
+    scene = Scene()
+    for i in range(3):
+        scene.plot([0, 1], [i, i + 1], color="k")
+    scene.plot([0, 1], [0, 2], color="r", label="Trace")
+    scene.plot([0, 1], [1, 3], color="r", label="Trace")
+    scene.plot([0, 1], [2, 4], color="r", label="_hidden")
+    scene.plot([0, 1], [3, 5], color="b", label="_hidden")
+    ax = create_figure(headless=True).add_subplot(111)
+    artists = scene.render(ax)
+
+    # Lines without a legend entry are merged and each label has its own
+    # artist and legend entry
+    assert len(artists) == 4
+    assert sorted(len(a.get_segments()) for a in artists) == [1, 1, 2, 3]
+    handles, labels = ax.get_legend_handles_labels()
+    assert labels == ["Trace", "Trace"]
+
+
+def test_quiver_before_uncolored_lines():
+    scene = Scene()
+    scene.quiver(0, 0, 1, 1, color="r")
+    scene.plot([0, 1], [0, 2])
+    scene.lines([[(0, 0), (1, 1)]])
+    scene.quiver([0, 1], [0, 0], [1, 1], [1, 2], color=["g", "b"])
+    scene.plot([0, 1], [1, 3], "--")
+    ax = create_figure(headless=True).add_subplot(111)
+    scene.render(ax)
+
+    # Each line without a color takes the next color of the cycle
+    lines = [c for c in ax.collections if isinstance(c, LineCollection)]
+    colors = [tuple(c) for lc in lines for c in lc.get_colors()]
+    assert sorted(colors) == sorted(to_rgba(f"C{i}") for i in range(3))
+
+
+def test_color_cycle_is_shared_with_the_axes():
+    scene = Scene()
+    scene.plot([0, 1], [0, 1])
+    ax = create_figure(headless=True).add_subplot(111)
+    scene.flush(ax)
+    (line,) = ax.plot([0, 1], [1, 2])
+    scene.plot([0, 1], [2, 3])
+    scene.flush(ax)
+
+    assert to_rgba(line.get_color()) == to_rgba("C1")
+    assert sorted(line_colors(ax)) == sorted(to_rgba(f"C{i}") for i in range(3))
+
+
+@pytest.mark.parametrize("order", ["phasor", "trajectories", "zone"])
+def test_quiver_and_uncolored_primitives_render(order):
+    shapely = pytest.importorskip("shapely")
+    from psp.plotting import RXplot
+
+    plot = RXplot("Mixed", headless=True)
+    if order == "phasor":
+        plot.add_phasor(1 + 1j, name="U", color="r")
+        plot.add_plot([0, 1], [0, 2])
+    elif order == "trajectories":
+        Z = np.linspace(1, 2 + 2j, 50)
+        plot.add_trajectory(Z)
+        plot.add_trajectory(Z * 1j)
+    else:
+        plot.add_phasor(1 + 1j, name="U", color="r")
+        plot.add_zone(shapely.box(0, 0, 2, 2))
+    assert plot.to_bytes()
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from psp.plotting.edges import find_edges
+from psp.plotting.status import StatusMatrix
+
+
+def random_status(n_channels, n_samples, seed=0):
+    rng = np.random.default_rng(seed)
+    status = np.cumsum(rng.random((n_channels, n_samples)) < 0.05, axis=1) % 2
+    status[:, -1] |= rng.random(n_channels) < 0.5  # High at the end
+    status[0] = 0
+    if n_channels > 1:
+        status[1] = 1
+    return status.astype(np.uint8)
+
+
+@pytest.mark.parametrize("n_samples", [1, 7, 8, 9, 64, 301])
+def test_edges_match_find_edges(n_samples):
+    status = random_status(130, n_samples)
+    edges = StatusMatrix.from_array(status).edges()
+    expected = find_edges(status)
+    np.testing.assert_array_equal(edges.offsets, expected.offsets)
+    np.testing.assert_array_equal(edges.rising, expected.rising)
+    np.testing.assert_array_equal(edges.falling, expected.falling)
+    assert edges.n_samples == expected.n_samples
+
+
+def test_round_trip():
+    status = random_status(70, 301)
+    matrix = StatusMatrix.from_array(status)
+    assert matrix.packed.shape == (70, 38)
+    np.testing.assert_array_equal(matrix.status, status)
+    np.testing.assert_array_equal(matrix.channel(5), status[5])
+    # A sequence of lists is converted one channel at a time
+    np.testing.assert_array_equal(
+        StatusMatrix.from_array(status.tolist()).packed, matrix.packed
+    )
+
+
+def test_any_all():
+    status = random_status(20, 301)
+    matrix = StatusMatrix.from_array(status)
+    np.testing.assert_array_equal(matrix.any(), status.any(axis=1))
+    np.testing.assert_array_equal(matrix.all(), status.all(axis=1))
+
+
+def test_take():
+    status = random_status(10, 50)
+    matrix = StatusMatrix.from_array(status).take([3, 1])
+    assert matrix.status_channel_ids == ["3", "1"]
+    np.testing.assert_array_equal(matrix.status, status[[3, 1]])
+
+
+@pytest.mark.parametrize("start, stop", [(0, 301), (3, 5), (8, 16), (13, 290), (9, 9)])
+def test_edges_window(start, stop):
+    status = random_status(130, 301)
+    edges = StatusMatrix.from_array(status).edges(start, stop)
+    expected = find_edges(status[:, start:stop])
+    np.testing.assert_array_equal(edges.offsets, expected.offsets)
+    np.testing.assert_array_equal(edges.rising, expected.rising)
+    np.testing.assert_array_equal(edges.falling, expected.falling)
+    assert edges.n_samples == expected.n_samples
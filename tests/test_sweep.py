@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from psp.plotting.sweep import FaultSweep
+
+shapely = pytest.importorskip("shapely")
+
+
+def test_impedances():
+    sweep = FaultSweep(2 + 10j, m=[0.2, 0.8], Rf=[0, 5], SIR=[0.5, 2], remote_SIR=1)
+    assert sweep.shape == (2, 2, 2) and len(sweep) == 8
+    Z = sweep.impedances().reshape(sweep.shape)
+    m, Rf, SIR = 0.8, 5, 2
+    infeed = (SIR + m) / (1 + 1 - m)
+    assert Z[1, 1, 1] == pytest.approx(m * (2 + 10j) + Rf * (1 + infeed))
+    np.testing.assert_allclose(
+        np.concatenate([Z for _, Z in sweep.chunks(3)]), Z.ravel()
+    )
+
+
+def test_sir_requires_remote_source():
+    assert len(FaultSweep(1j, m=[0.5], Rf=[0, 1])) == 2
+    with pytest.raises(ValueError, match="remote_SIR"):
+        FaultSweep(1j, m=[0.5], Rf=[0, 1], SIR=[0.5, 2])
+
+
+def test_add_reach():
+    from matplotlib.image import AxesImage
+    from psp.plotting import RXplot
+
+    zone = shapely.box(-1, 0, 3, 8)
+    result = FaultSweep(1 + 10j, m=np.linspace(0, 1, 20), Rf=[0, 1, 2]).evaluate(
+        [zone]
+    )
+    plot = RXplot("Reach", headless=True)
+    image = plot.add_reach(result, bins=50, cmap="viridis")
+    assert isinstance(image, AxesImage)
+    assert image.get_array().shape == (50, 50)
+    assert image.get_clim() == (0, 1)
+    plot.to_bytes()
+    assert list(plot._ax.images) == [image]
+    plot.close()
+
+
+def test_raster_orientation():
+    # Vertical lines at R = 0 and R = 5 from X = 0 to X = 10
+    sweep = FaultSweep(10j, m=np.linspace(0, 1, 50), Rf=[0, 5])
+    result = sweep.evaluate([shapely.box(-1, -1, 1, 11)])
+    image, extent = result.raster(bins=10)
+    assert extent == pytest.approx((0, 5, 0, 10))
+    # The rows are the bins of the reactance and the columns of the resistance
+    assert not image.mask[:, [0, -1]].any()
+    assert image.mask[:, 1:-1].all()
+    np.testing.assert_array_equal(image[:, 0], 1)
+    np.testing.assert_array_equal(image[:, -1], 0)
@@ -0,0 +1,191 @@
+import numpy as np
+import pytest
+from psp.plotting.zones import classify
+
+shapely = pytest.importorskip("shapely")
+
+
+@pytest.fixture
+def zones():
+    return [shapely.box(0, 0, 2, 2), shapely.box(1, 1, 4, 4)]
+
+
+def test_classify(zones):
+    Z = np.array([-1, 0.5 + 0.5j, 1.5 + 1.5j, 3 + 3j, 5, np.nan, 0.5 + 0.5j])
+    result = classify(Z, zones, t=np.arange(7) * 0.1)
+    np.testing.assert_array_equal(result.zone, [-1, 0, 0, 1, -1, -1, 0])
+    np.testing.assert_array_equal(result.inside(1), [0, 0, 1, 1, 0, 0, 0])
+    entry, exit = result.intervals(0)
+    np.testing.assert_allclose(entry, [0.1, 0.6])
+    np.testing.assert_allclose(exit, [0.3, np.nan])
+
+
+def test_classify_empty(zones):
+    result = classify([], zones)
+    assert result.zone.shape == (0,)
+    assert result.names == ["Zone 1", "Zone 2"]
+    assert result.intervals(0)[0].size == 0
+
+
+def test_add_zone_trajectory_empty(zones):
+    from psp.plotting import RXplot
+
+    plot = RXplot("Empty", headless=True)
+    for zone in zones:
+        plot.add_zone(zone)
+    n = len(plot.scene)
+    result = plot.add_zone_trajectory([])
+    assert result.zone.size == 0
+    assert len(plot.scene) == n
+    plot.to_bytes()
+    plot.close()
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{}, {"linewidths": 3}, {"linestyles": "--", "capstyle": "round"}]
+)
+def test_add_zone_trajectory(zones, kwargs):
+    from matplotlib.collections import LineCollection
+    from psp.plotting import RXplot
+
+    plot = RXplot("Trajectory", headless=True)
+    Z = np.linspace(-1, 5, 61) * (1 + 1j)
+    result = plot.add_zone_trajectory(Z, zones=zones, colors=["red", "blue"], **kwargs)
+    plot.to_bytes()
+
+    (collection,) = [
+        c for c in plot._ax.collections if isinstance(c, LineCollection)
+    ]
+    # A line for each run of samples in the same zone
+    runs = 1 + np.count_nonzero(np.diff(result.zone))
+    assert len(collection.get_segments()) == runs == 4
+    if "linewidths" in kwargs:
+        assert collection.get_linewidths()[0] == 3
+    if "capstyle" in kwargs:
+        assert collection.get_capstyle() == "round"
+    plot.close()
+
+
+def brute_force(registry, same_relay=False):
+    """Overlaps of every pair of zones with a pairwise shapely loop"""
+    pairs = {}
+    for i, a in enumerate(registry.zones):
+        for j, b in enumerate(registry.zones[i + 1 :], i + 1):
+            if not same_relay and registry.relays[i] == registry.relays[j]:
+                continue
+            area = a.intersection(b).area
+            if area > 0:
+                pairs[i, j] = (area, area / min(a.area, b.area))
+    return pairs
+
+
+@pytest.fixture
+def registry():
+    from psp.plotting.zones import ZoneRegistry
+
+    rng = np.random.default_rng(1)
+    registry = ZoneRegistry()
+    for relay in range(6):
+        x, y = rng.uniform(0, 10, 2)
+        zones = [
+            shapely.box(x, y, x + size, y + size) for size in rng.uniform(1, 4, 3)
+        ]
+        registry.add(f"R{relay}", zones)
+    return registry
+
+
+def test_overlaps_brute_force(registry):
+    for same_relay in (False, True):
+        overlaps = registry.overlaps(same_relay=same_relay)
+        expected = brute_force(registry, same_relay)
+        assert list(zip(overlaps.first, overlaps.second)) == sorted(expected)
+        np.testing.assert_allclose(
+            np.column_stack((overlaps.area, overlaps.ratio)),
+            [expected[pair] for pair in sorted(expected)],
+        )
+        assert np.all(overlaps.ratio <= 1 + 1e-12)
+
+
+def test_overlaps_filters(registry):
+    overlaps = registry.overlaps()
+    assert len(overlaps) > 0
+    relays = np.array(registry.relays)
+
+    large = registry.overlaps(min_area=2.0)
+    assert np.all(large.area > 2.0)
+    assert len(large) == np.count_nonzero(overlaps.area > 2.0)
+
+    r0 = registry.overlaps(relay="R0")
+    assert np.all((relays[r0.first] == "R0") | (relays[r0.second] == "R0"))
+    assert len(r0) == np.count_nonzero(
+        (relays[overlaps.first] == "R0") | (relays[overlaps.second] == "R0")
+    )
+
+    same = registry.overlaps(same_relay=True)
+    assert np.all(relays[overlaps.first] != relays[overlaps.second])
+    # The nested zones of each relay overlap
+    assert np.any(relays[same.first] == relays[same.second])
+
+
+def test_overlaps_touching_zones():
+    from psp.plotting.zones import ZoneRegistry
+
+    registry = ZoneRegistry()
+    registry.add("A", shapely.box(0, 0, 1, 1))
+    registry.add("B", [shapely.box(1, 0, 2, 1), shapely.box(1, 1, 2, 2)])
+    registry.add("C", shapely.box(0.5, 0.5, 1.5, 1.5))
+    overlaps = registry.overlaps()
+    # A and B only share an edge or a corner
+    assert list(zip(overlaps.first, overlaps.second)) == [(0, 3), (1, 3), (2, 3)]
+    np.testing.assert_allclose(overlaps.area, 0.25)
+    np.testing.assert_allclose(overlaps.ratio, 0.25)
+
+
+def test_overlaps_incremental(registry, monkeypatch):
+    calls = []
+    intersection = shapely.intersection
+
+    def spy(a, b, *args, **kwargs):
+        calls.append((np.array([z.wkb for z in a]), np.array([z.wkb for z in b])))
+        return intersection(a, b, *args, **kwargs)
+
+    before = registry.overlaps(same_relay=True)
+    geometry = dict(zip(zip(before.first, before.second), before.geometry))
+    n = len(registry)
+
+    monkeypatch.setattr(shapely, "intersection", spy)
+    index = registry.add("New", [shapely.box(2, 2, 9, 9)])
+    np.testing.assert_array_equal(index, [n])
+    after = registry.overlaps(same_relay=True)
+
+    # Only the pairs with the new zone are intersected
+    assert len(calls) == 1
+    second = calls[0][1]
+    assert len(second) > 0 and np.all(second == registry.zones[n].wkb)
+    # The cached pairs are reused
+    for pair, g in zip(zip(after.first, after.second), after.geometry):
+        if pair[1] < n:
+            assert g is geometry[pair]
+    assert set(geometry) <= set(zip(after.first, after.second))
+    assert set(zip(after.first, after.second)) == set(brute_force(registry, True))
+
+    # Without new zones nothing is intersected
+    registry.overlaps()
+    assert len(calls) == 1
+
+
+def test_add_overlaps(registry):
+    from psp.plotting import RXplot
+
+    overlaps = registry.overlaps()
+    plot = RXplot("Overlaps", headless=True)
+    collection = plot.add_overlaps(overlaps)
+    assert len(collection.get_paths()) == len(overlaps)
+    xy = np.concatenate([p.vertices for p in collection.get_paths()])
+    bounds = np.array([g.bounds for g in overlaps.geometry])
+    assert plot.extent.absmax() >= np.abs(bounds).max() - 1e-9
+    assert xy.min() >= bounds[:, :2].min() - 1e-9
+    plot.to_bytes()
+
+    empty = plot.add_overlaps(registry.overlaps(min_area=1e9))
+    assert len(empty.get_paths()) == 0